@@ -0,0 +1,31 @@
+"""
+Custom utilities for bulk database operations
+"""
+from typing import Iterable
+
+from django.utils.timezone import now
+
+
+def timestamps() -> dict:
+    """Return the timestamps that BaseModel.save would otherwise set,
+    since bulk operations bypass it.
+    """
+    timestamp = now()
+    return {'created': timestamp, 'modified': timestamp}
+
+
+def add_to_window(model, instances: Iterable, window, batch_size: int) -> None:
+    """Link the model instances to the window via the model's windows
+    through table, skipping existing links.
+    """
+    through = model.windows.through
+    instance_field = f'{model._meta.model_name}_id'
+
+    through.objects.bulk_create(
+        [
+            through(**{instance_field: instance.id}, window_id=window.id)
+            for instance in instances
+        ],
+        batch_size=batch_size,
+        ignore_conflicts=True
+    )
@@ -1,8 +1,12 @@
-from typing import List
+from typing import Dict, List
 
 import pandas as pd
 from pandas import DataFrame
 
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from core.utils.bulk import add_to_window, timestamps
 from schedule.models import Window
 from staff.models import Assessor
 from exam.models import Student, Module, Exam, ExamStyle
@@ -10,6 +14,12 @@ from exam.models import Student, Module, Exam, ExamStyle
 
 Email = str
 
+EXAM_STYLES = {
+    'STANDARD': ExamStyle.STANDARD,
+    'ALTERNATIVE': ExamStyle.ALTERNATIVE,
+    'STS': ExamStyle.STANDARD
+}
+
 
 class SheetProcessor:
     """Reads a CSV file and saves the contained information into the
@@ -18,8 +28,13 @@ class SheetProcessor:
     It is assumed that the CSV file conforms to all expectations stated
     in the validation class <>. Do not use the SheetProcessor before the
     CSV file has been properly validated.
+
+    All entities are written in bulk, such that the number of queries
+    does not depend on the number of rows in the CSV file.
     """
 
+    batch_size = 1000
+
     def __init__(self, window: Window, file_path: str):
         """
         :param window: a Window instance
@@ -36,73 +51,157 @@ class SheetProcessor:
         data = pd.read_csv(self.path, sep=',')
         module_info = data[['shortCode', 'module']]
 
-        self._save_assessors(data.assessor.unique())
-        self._save_students(data.student.unique())
-        self._save_modules(module_info.drop_duplicates('shortCode', keep='first'))
-        self._save_exams(data)
+        with transaction.atomic():
+            assessors = self._save_assessors(data.assessor.unique())
+            students = self._save_students(data.student.unique())
+            modules = self._save_modules(
+                module_info.drop_duplicates('shortCode', keep='first')
+            )
+            self._save_exams(data, assessors, students, modules)
 
-    def _save_assessors(self, emails: List[Email]) -> None:
+    def _save_assessors(self, emails: List[Email]) -> Dict[Email, Assessor]:
         """Save a list of unique email identifiers to the database, each as
-        an Assessor instance.
+        an Assessor instance, and link them to the window.
 
         :param emails: list of unique emails
+        :return: dict of all assessors in the list, keyed by email
         """
-        for email in emails:
-            assessor, _ = Assessor.objects.get_or_create(
-                organization=self.organization,
-                email=email
-            )
-            assessor.windows.add(self.window)
-
-    def _save_students(self, emails: List[Email]) -> None:
+        assessors = self._get_or_create_by_email(Assessor, emails)
+        add_to_window(
+            Assessor,
+            assessors.values(),
+            self.window,
+            self.batch_size
+        )
+        return assessors
+
+    def _save_students(self, emails: List[Email]) -> Dict[Email, Student]:
         """Save a list of unique email identifiers to the database, each as
         a Student instance.
 
         :param emails: list of unique emails
+        :return: dict of all students in the list, keyed by email
         """
-        for email in emails:
-            Student.objects.get_or_create(
-                organization=self.organization,
-                email=email
-            )
+        return self._get_or_create_by_email(Student, emails)
 
-    def _save_modules(self, modules: DataFrame) -> None:
+    def _save_modules(self, modules: DataFrame) -> Dict[str, Module]:
         """Save a collection of unique module identifiers and names to the
-        database, each as a Module instance.
+        database, each as a Module instance, and link them to the window.
+
+        Modules of the organization that already exist with the same
+        identifier and name are reused.
 
         :param modules: DataFrame with [unique identifier, name] of modules
+        :return: dict of all modules in the collection, keyed by identifier
         """
-        for _, (short_code, name) in modules.iterrows():
-            module, _ = Module.objects.get_or_create(
+        existing = {
+            (module.code, module.name): module
+            for module in Module.objects.filter(
                 organization=self.organization,
-                code=short_code,
-                name=name
+                code__in=modules.shortCode.tolist()
             )
-            module.windows.add(self.window)
-
-    def _save_exams(self, data: DataFrame) -> None:
-        """Save Exam instances based on the CSV data
+        }
+
+        created = Module.objects.bulk_create(
+            [
+                Module(
+                    organization=self.organization,
+                    code=short_code,
+                    name=name,
+                    **timestamps()
+                )
+                for short_code, name in modules.itertuples(index=False)
+                if (short_code, name) not in existing
+            ],
+            batch_size=self.batch_size
+        )
+        created = {module.code: module for module in created}
+
+        modules = {
+            short_code: existing.get((short_code, name)) or created[short_code]
+            for short_code, name in modules.itertuples(index=False)
+        }
+        add_to_window(Module, modules.values(), self.window, self.batch_size)
+        return modules
+
+    def _save_exams(
+            self,
+            data: DataFrame,
+            assessors: Dict[Email, Assessor],
+            students: Dict[Email, Student],
+            modules: Dict[str, Module],
+    ) -> None:
+        """Save Exam instances based on the CSV data.
+
+        Rows with an unknown assessment style, repeated rows of the same
+        exam and exams that already exist in the window are skipped.
 
         :param data: a DataFrame containing exam information
         """
-        for _, row in data.iterrows():
-            assessor = Assessor.objects.get(email=row['assessor'])
-            student = Student.objects.get(email=row['student'])
-            module = Module.objects.get(code=row['shortCode'])
-            style = {
-                'STANDARD': ExamStyle.STANDARD,
-                'ALTERNATIVE': ExamStyle.ALTERNATIVE,
-                'STS': ExamStyle.STANDARD
-            }.get(row['assessmentStyle'])
-
-            if style is None:
-                continue
-
-            Exam.objects.get_or_create(
-                code=row['assessmentId'],
-                window=self.window,
-                assessor=assessor,
-                student=student,
-                module=module,
-                style=style
+        data = data.assign(
+            assessmentId=data.assessmentId.astype(str),
+            assessmentStyle=data.assessmentStyle.map(EXAM_STYLES),
+        ).dropna(
+            subset=['assessmentStyle']
+        ).drop_duplicates('assessmentId', keep='first')
+
+        existing_codes = set(
+            Exam.objects
+            .filter(window=self.window, code__in=data.assessmentId.tolist())
+            .values_list('code', flat=True)
+        )
+
+        Exam.objects.bulk_create(
+            [
+                Exam(
+                    code=row.assessmentId,
+                    window=self.window,
+                    assessor=assessors[row.assessor],
+                    student=students[row.student],
+                    module=modules[row.shortCode],
+                    style=row.assessmentStyle,
+                    **timestamps()
+                )
+                for row in data.itertuples(index=False)
+                if row.assessmentId not in existing_codes
+            ],
+            batch_size=self.batch_size
+        )
+
+    def _get_or_create_by_email(self, model, emails: List[Email]) -> dict:
+        """Create instances of the model for all emails that do not exist
+        yet and return all instances with the given emails, keyed by email.
+
+        Emails are unique across organizations, so a ValidationError is
+        raised if any of them belongs to another organization.
+        """
+        model.objects.bulk_create(
+            [
+                model(
+                    organization=self.organization,
+                    email=email,
+                    **timestamps()
+                )
+                for email in emails
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=True
+        )
+
+        instances = {
+            instance.email: instance
+            for instance in model.objects.filter(
+                organization=self.organization,
+                email__in=list(emails)
             )
+        }
+
+        foreign_emails = set(emails) - set(instances)
+
+        if foreign_emails:
+            raise ValidationError(
+                {'foreign_emails': sorted(foreign_emails)},
+                code='foreign_emails'
+            )
+
+        return instances
@@ -0,0 +1,142 @@
+import pytest
+
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+
+from exam.models import Exam, Module, Student
+from staff.models import Assessor
+from user.models import Organization
+
+
+pytestmark = pytest.mark.acceptance
+
+
+@pytest.mark.django_db
+class TestSheetProcessing:
+    def test_sheet_content_is_saved_to_database(
+            self,
+            authenticated_client,
+            create_window,
+            create_sheet
+    ):
+        # GIVEN a window instance
+        window = create_window()
+
+        # WHEN the same valid planning sheet is uploaded twice
+        for _ in range(2):
+            response = authenticated_client.post(
+                path=reverse('sheet_upload', args=['myPlanningSheet.csv']),
+                data={
+                    'csv': create_sheet('valid_planning_sheet.csv'),
+                    'window': window.id
+                },
+                format='multipart'
+            )
+            assert response.status_code == HTTP_200_OK
+
+        # THEN each exam, student, assessor and module is saved exactly
+        # once, and assessors and modules are linked to the window
+        exams = Exam.objects.filter(window=window)
+        assert exams.count() == 11
+        assert exams.filter(style='alternative').count() == 2
+
+        assert Student.objects.count() == 7
+        assert Assessor.objects.filter(windows=window).count() == 4
+        assert Module.objects.filter(windows=window).count() == 6
+
+        exam = exams.get(code='test003')
+        assert exam.student.email == 'STUDENT551@code.berlin'
+        assert exam.assessor.email == 'ASSESSOR056@code.berlin'
+        assert exam.module.code == 'ID_02'
+
+    def test_repeated_exam_is_saved_once(
+            self,
+            authenticated_client,
+            create_window,
+            create_sheet
+    ):
+        # GIVEN a window instance
+        window = create_window()
+
+        # WHEN a planning sheet that lists an exam twice is uploaded
+        response = authenticated_client.post(
+            path=reverse('sheet_upload', args=['myPlanningSheet.csv']),
+            data={
+                'csv': create_sheet('planning_sheet_with_repeated_exam.csv'),
+                'window': window.id
+            },
+            format='multipart'
+        )
+
+        # THEN the exam is saved only once
+        assert response.status_code == HTTP_200_OK
+
+        exams = Exam.objects.filter(window=window)
+        assert exams.count() == 11
+        assert exams.filter(code='test003').count() == 1
+
+    def test_module_with_other_name_is_not_reused(
+            self,
+            authenticated_client,
+            create_window,
+            create_sheet
+    ):
+        # GIVEN a window instance and a module of the organization with
+        # the code of a module in the planning sheet, but another name
+        window = create_window()
+        other_module = Module.objects.create(
+            organization=window.assessment_phase.organization,
+            code='ID_01',
+            name='Old Image Composition'
+        )
+
+        # WHEN the planning sheet is uploaded
+        response = authenticated_client.post(
+            path=reverse('sheet_upload', args=['myPlanningSheet.csv']),
+            data={
+                'csv': create_sheet('valid_planning_sheet.csv'),
+                'window': window.id
+            },
+            format='multipart'
+        )
+
+        # THEN the exams of the module are linked to a new module with
+        # the name given in the sheet
+        assert response.status_code == HTTP_200_OK
+
+        module = Exam.objects.get(window=window, code='test001').module
+        assert module != other_module
+        assert module.name == 'Image Composition'
+
+    def test_emails_of_other_organization_are_rejected(
+            self,
+            authenticated_client,
+            create_window,
+            create_sheet
+    ):
+        # GIVEN a window instance and a student of another organization
+        # who also appears in the planning sheet
+        window = create_window()
+        Student.objects.create(
+            organization=Organization.objects.create(name='Other'),
+            email='STUDENT551@code.berlin'
+        )
+
+        # WHEN the planning sheet is uploaded
+        response = authenticated_client.post(
+            path=reverse('sheet_upload', args=['myPlanningSheet.csv']),
+            data={
+                'csv': create_sheet('valid_planning_sheet.csv'),
+                'window': window.id
+            },
+            format='multipart'
+        )
+
+        # THEN the sheet is rejected with the foreign email in the error
+        # response, and nothing is saved
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            'foreign_emails': ['STUDENT551@code.berlin']
+        }
+        assert not Exam.objects.filter(window=window).exists()
+        assert not window.planning_sheets.exists()
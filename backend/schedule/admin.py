@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
+from .scheduling.jobs import enqueue
 from .models import (
     AssessmentPhase,
     Window,
@@ -8,6 +9,7 @@ from .models import (
     BlockTemplate,
     Block,
     Schedule,
+    SchedulingJob,
 )
 from exam.models import Exam
 from input.admin import PlanningSheetInline
@@ -72,6 +74,18 @@ class WindowAdmin(admin.ModelAdmin):
         BlockTemplateInline,
         AssessorInline
     ]
+    actions = ['schedule_with_profiling']
+
+    @admin.action(description='Schedule with profiling')
+    def schedule_with_profiling(self, request, queryset):
+        """Queue profiled scheduling jobs for the selected windows."""
+        for window in queryset:
+            enqueue(window, profile=True)
+
+        self.message_user(
+            request,
+            f'Queued profiled scheduling of {queryset.count()} window(s).'
+        )
 
 
 @admin.register(AssessmentPhase)
@@ -90,9 +104,24 @@ class BlockTemplateAdmin(admin.ModelAdmin):
 @admin.register(Schedule)
 class ScheduleAdmin(admin.ModelAdmin):
     list_display = ['id', 'window', 'phase']
-    readonly_fields = ['penalty']
+    readonly_fields = ['penalty', 'run_stats', 'profile']
     inlines = [BlockInline]
 
     @staticmethod
     def phase(obj):
         return str(obj.window.assessment_phase)
+
+
+@admin.register(SchedulingJob)
+class SchedulingJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'window',
+        'status',
+        'profile',
+        'created',
+        'started',
+        'finished'
+    ]
+    list_filter = ['status']
+    readonly_fields = ['errors', 'profile_file', 'started', 'finished']
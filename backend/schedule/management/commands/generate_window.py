@@ -0,0 +1,145 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from schedule.models import PhaseCategory, Semester
+from schedule.scheduling.generators import WindowGenerator, WindowSpec
+
+
+class Command(BaseCommand):
+    help = 'Create a synthetic window with students, staff, block slots ' \
+           'and exams for load testing.'
+
+    def add_arguments(self, parser):
+        defaults = WindowSpec()
+
+        parser.add_argument(
+            '--students',
+            type=int,
+            default=defaults.num_students,
+            help='Number of students.'
+        )
+        parser.add_argument(
+            '--modules',
+            type=int,
+            default=defaults.num_modules,
+            help='Number of modules.'
+        )
+        parser.add_argument(
+            '--assessors',
+            type=int,
+            default=defaults.num_assessors,
+            help='Number of assessors, who assess the modules in turn.'
+        )
+        parser.add_argument(
+            '--helpers',
+            type=int,
+            default=defaults.num_helpers,
+            help='Number of helpers.'
+        )
+        parser.add_argument(
+            '--slots',
+            type=int,
+            default=defaults.num_slots,
+            help='Number of block slots.'
+        )
+        parser.add_argument(
+            '--slots-per-day',
+            type=int,
+            default=defaults.slots_per_day,
+            help='Number of block slots per weekday.'
+        )
+        parser.add_argument(
+            '--exams-per-student',
+            type=int,
+            default=defaults.exams_per_student,
+            help='Number of exams each student takes.'
+        )
+        parser.add_argument(
+            '--availability',
+            type=float,
+            default=defaults.availability,
+            help='Share of block slots each staff member is available in.'
+        )
+        parser.add_argument(
+            '--alternative-share',
+            type=float,
+            default=defaults.alternative_share,
+            help='Share of exams taken in the alternative style.'
+        )
+        parser.add_argument(
+            '--block-length',
+            type=int,
+            default=defaults.block_length,
+            help='Block length in minutes.'
+        )
+        parser.add_argument(
+            '--start-date',
+            type=date.fromisoformat,
+            help='First day of the window (YYYY-MM-DD). '
+                 'Defaults to next Monday.'
+        )
+        parser.add_argument(
+            '--year',
+            type=int,
+            help='Year of the assessment phase. Defaults to this year.'
+        )
+        parser.add_argument(
+            '--semester',
+            choices=Semester.values,
+            default=defaults.semester,
+            help='Semester of the assessment phase.'
+        )
+        parser.add_argument(
+            '--category',
+            choices=PhaseCategory.values,
+            default=defaults.category,
+            help='Category of the assessment phase.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            help='Seed of the random generator.'
+        )
+        parser.add_argument(
+            '--csv',
+            help='Write the exams as a planning sheet to this path.'
+        )
+        parser.add_argument(
+            '--without-exams',
+            action='store_true',
+            help='Do not save students, modules and exams, so that they '
+                 'can be uploaded with the planning sheet instead.'
+        )
+
+    def handle(self, *args, **options):
+        spec = WindowSpec(
+            num_students=options['students'],
+            num_modules=options['modules'],
+            num_assessors=options['assessors'],
+            num_helpers=options['helpers'],
+            num_slots=options['slots'],
+            slots_per_day=options['slots_per_day'],
+            exams_per_student=options['exams_per_student'],
+            availability=options['availability'],
+            alternative_share=options['alternative_share'],
+            block_length=options['block_length'],
+            start_date=options['start_date'],
+            year=options['year'],
+            semester=options['semester'],
+            category=options['category'],
+        )
+
+        try:
+            generator = WindowGenerator(spec, seed=options['seed'])
+        except ValueError as error:
+            raise CommandError(error)
+
+        window = generator.generate(with_exams=not options['without_exams'])
+        self.stdout.write(
+            f'Created window {window.id} with {len(generator.exams)} exams'
+        )
+
+        if options['csv']:
+            generator.write_planning_sheet(options['csv'])
+            self.stdout.write(f'Wrote planning sheet to {options["csv"]}')
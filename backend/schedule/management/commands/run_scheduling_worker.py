@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from schedule.scheduling.jobs import JobRunner
+
+
+class Command(BaseCommand):
+    help = 'Execute queued scheduling jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit as soon as the queue is empty.'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait before checking an empty queue again.'
+        )
+
+    def handle(self, *args, **options):
+        runner = JobRunner()
+
+        while True:
+            job = runner.run_next()
+
+            if job is not None:
+                print(f'Finished {job}')
+                continue
+
+            if options['once']:
+                break
+
+            time.sleep(options['poll_interval'])
@@ -0,0 +1,30 @@
+# Generated by Django 4.0.4 on 2026-10-18 15:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0019_auto_20220608_1723'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchedulingJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(editable=False)),
+                ('modified', models.DateTimeField(blank=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=32)),
+                ('errors', models.JSONField(blank=True, null=True)),
+                ('started', models.DateTimeField(blank=True, null=True)),
+                ('finished', models.DateTimeField(blank=True, null=True)),
+                ('window', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduling_jobs', to='schedule.window')),
+            ],
+            options={
+                'ordering': ['-created'],
+            },
+        ),
+    ]
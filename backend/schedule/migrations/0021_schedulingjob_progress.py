@@ -0,0 +1,18 @@
+# Generated by Django 4.0.4 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0020_schedulingjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulingjob',
+            name='progress',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
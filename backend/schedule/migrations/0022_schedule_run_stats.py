@@ -0,0 +1,18 @@
+# Generated by Django 4.0.4 on 2026-10-18 16:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0021_schedulingjob_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedule',
+            name='run_stats',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.4 on 2026-10-18 16:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0022_schedule_run_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedule',
+            name='profile',
+            field=models.FileField(blank=True, null=True, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='schedulingjob',
+            name='profile',
+            field=models.BooleanField(default=False),
+        ),
+    ]
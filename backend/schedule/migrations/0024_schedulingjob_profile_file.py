@@ -0,0 +1,18 @@
+# Generated by Django 4.0.4 on 2026-10-18 16:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0023_schedule_profile_schedulingjob_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedulingjob',
+            name='profile_file',
+            field=models.FileField(blank=True, null=True, upload_to=''),
+        ),
+    ]
@@ -142,6 +142,51 @@ class Schedule(BaseModel):
         on_delete=models.CASCADE
     )
     penalty = models.PositiveIntegerField(null=True, blank=True)
+    run_stats = models.JSONField(null=True, blank=True)
+    profile = models.FileField(null=True, blank=True)
+
+
+class SchedulingJobStatus(models.TextChoices):
+    QUEUED = 'queued', 'Queued'
+    RUNNING = 'running', 'Running'
+    DONE = 'done', 'Done'
+    FAILED = 'failed', 'Failed'
+
+
+class SchedulingJob(BaseModel):
+    """A request to schedule a window, which is executed asynchronously
+    by a worker process rather than within an HTTP request.
+    """
+
+    window = models.ForeignKey(
+        'schedule.Window',
+        related_name='scheduling_jobs',
+        on_delete=models.CASCADE
+    )
+    status = models.CharField(
+        max_length=32,
+        choices=SchedulingJobStatus.choices,
+        default=SchedulingJobStatus.QUEUED
+    )
+    errors = models.JSONField(null=True, blank=True)
+    progress = models.JSONField(null=True, blank=True)
+    profile = models.BooleanField(default=False)
+    profile_file = models.FileField(null=True, blank=True)
+    started = models.DateTimeField(null=True, blank=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created']
+
+    def __str__(self):
+        return f"<Scheduling of {self.window}: {self.status}>"
+
+    @property
+    def is_pending(self) -> bool:
+        return self.status in (
+            SchedulingJobStatus.QUEUED,
+            SchedulingJobStatus.RUNNING
+        )
 
 
 class Block(BaseModel):
@@ -1,3 +1,3 @@
 from .schedulers import Scheduler
 from .evaluators import ValidationError
-from .algorithms import UnfeasibleInputError
+from .algorithms import SearchBudgetExhaustedError, UnfeasibleInputError
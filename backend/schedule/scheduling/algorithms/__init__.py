@@ -2,5 +2,14 @@
 Implementations of planning algorithms to solve the exam scheduling
 problem.
 """
-from .base import BaseAlgorithm, UnfeasibleInputError
-from .tabu_search import TabuSearch
+from .base import (
+    BaseAlgorithm,
+    SearchBudgetExhaustedError,
+    UnfeasibleInputError,
+)
+from .tabu_search import (
+    TabuSearch,
+    ParallelTabuSearch,
+    SearchBudget,
+    SearchTelemetry,
+)
@@ -3,24 +3,172 @@ Implementation of back-tracking algorithm for construction of
 initial solutions.
 """
 
-from copy import deepcopy
-from typing import Tuple, Dict, List
-
-from staff.models import Assessor
-
-from .base import BaseAlgorithm, UnfeasibleInputError
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .base import (
+    BaseAlgorithm,
+    SearchBudgetExhaustedError,
+    UnfeasibleInputError,
+)
 from ..input_collectors import AvailInfo, AssessorWorkload
 from ..schedule import Schedule, BlockSchedule
 from ..types import SlotId
 
 
+def _bits(mask: int) -> Iterator[int]:
+    """Yield the indices of all set bits of the mask."""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def _popcount(mask: int) -> int:
+    """Return the number of set bits of the mask."""
+    return bin(mask).count('1')
+
+
+class SearchState:
+    """Bitset representation of the back-tracking search state.
+
+    Slots and assessors are identified by their index. Bit j of
+    slot_assessors[i] is set if assessor j can still be scheduled in
+    slot i, and bit i of assessor_slots[j] is set vice versa. Bit i of
+    open_slots is set if slot i still has an unassigned helper.
+
+    Instead of copying the state at every step, all changes are
+    recorded on a trail, so that they can be undone on backtracking.
+    """
+
+    def __init__(
+            self,
+            staff_avails: Dict[SlotId, AvailInfo],
+            assessor_workload: AssessorWorkload
+    ):
+        self.slot_ids = list(staff_avails)
+        self.assessors = [
+            assessor
+            for assessor, workload in assessor_workload.items()
+            if sum(workload.values())
+        ]
+        assessor_index = {
+            assessor: i for i, assessor in enumerate(self.assessors)
+        }
+
+        self.remaining = [
+            sum(assessor_workload[assessor].values())
+            for assessor in self.assessors
+        ]
+        self.helpers = [
+            staff_avails[slot].helper_count for slot in self.slot_ids
+        ]
+        self.slot_assessors = [0] * len(self.slot_ids)
+        self.assessor_slots = [0] * len(self.assessors)
+
+        for i, slot in enumerate(self.slot_ids):
+            for assessor in staff_avails[slot].assessors:
+                j = assessor_index.get(assessor)
+
+                if j is not None:
+                    self.slot_assessors[i] |= 1 << j
+                    self.assessor_slots[j] |= 1 << i
+
+        self.open_slots = sum(
+            1 << i for i, count in enumerate(self.helpers) if count > 0
+        )
+        self.blocks_to_schedule = sum(self.remaining)
+        self.trail = []
+
+    def assign(self, slot: int, assessor: int) -> None:
+        """Schedule a block of the assessor in the slot.
+
+        If the assessor has no blocks left to schedule afterwards, remove
+        her from all slots.
+        """
+        self._set(
+            self.slot_assessors,
+            slot,
+            self.slot_assessors[slot] & ~(1 << assessor)
+        )
+        self._set(
+            self.assessor_slots,
+            assessor,
+            self.assessor_slots[assessor] & ~(1 << slot)
+        )
+        self._set(self.helpers, slot, self.helpers[slot] - 1)
+        self._set(self.remaining, assessor, self.remaining[assessor] - 1)
+        self._set(
+            self.__dict__,
+            'blocks_to_schedule',
+            self.blocks_to_schedule - 1
+        )
+
+        if not self.helpers[slot]:
+            self._set(
+                self.__dict__,
+                'open_slots',
+                self.open_slots & ~(1 << slot)
+            )
+
+        if not self.remaining[assessor]:
+            for other_slot in _bits(self.assessor_slots[assessor]):
+                self._set(
+                    self.slot_assessors,
+                    other_slot,
+                    self.slot_assessors[other_slot] & ~(1 << assessor)
+                )
+            self._set(self.assessor_slots, assessor, 0)
+
+    def mark(self) -> int:
+        """Return a trail position that undo can return to."""
+        return len(self.trail)
+
+    def undo(self, mark: int) -> None:
+        """Revert all changes made since the trail position was marked."""
+        while len(self.trail) > mark:
+            container, key, value = self.trail.pop()
+            container[key] = value
+
+    def is_consistent(self) -> bool:
+        """Return False if the remaining blocks can no longer be scheduled.
+
+        This is the case if any assessor has fewer open slots available
+        than blocks left to schedule, or if all open slots combined
+        cannot take the remaining blocks.
+        """
+        capacity = sum(
+            min(self.helpers[slot], _popcount(self.slot_assessors[slot]))
+            for slot in _bits(self.open_slots)
+        )
+        if capacity < self.blocks_to_schedule:
+            return False
+
+        return all(
+            _popcount(slots & self.open_slots) >= remaining
+            for slots, remaining in zip(self.assessor_slots, self.remaining)
+        )
+
+    def candidate_slots(self) -> List[int]:
+        """Return the open slots in which any assessor can be scheduled."""
+        return [
+            slot
+            for slot in _bits(self.open_slots)
+            if self.slot_assessors[slot]
+        ]
+
+    def _set(self, container, key, value) -> None:
+        self.trail.append((container, key, container[key]))
+        container[key] = value
+
+
 class SchedulingHeuristics:
     """Provides heuristic scores of scheduling difficulty to rank
     elements of the scheduling process.
     """
 
     @staticmethod
-    def slot_ease_score(slot: Tuple[SlotId, AvailInfo]) -> Tuple[int, int]:
+    def slot_ease_score(state: SearchState, slot: int) -> Tuple[int, int]:
         """Return the ease score for a given slot in the shape
         of a (assessor count, helper count) tuple.
 
@@ -28,15 +176,10 @@ class SchedulingHeuristics:
         values indicating a higher potential for conflict-less
         scheduling.
         """
-        _, avails = slot
-        return avails.assessor_count, avails.helper_count
+        return _popcount(state.slot_assessors[slot]), state.helpers[slot]
 
     @staticmethod
-    def assessor_ease_score(
-            assessor: Assessor,
-            staff_avails: Dict[SlotId, AvailInfo],
-            assessor_workload: AssessorWorkload
-    ) -> int:
+    def assessor_ease_score(state: SearchState, assessor: int) -> int:
         """Return the assessor's availability surplus.
 
         The availability surplus is defined as the number of the
@@ -46,164 +189,113 @@ class SchedulingHeuristics:
         The higher the availability surplus, the easier it is
         - heuristically - to schedule the assessor.
         """
-        available_slots = sum(
-            [
-                1
-                for info in staff_avails.values()
-                if assessor in info.assessors and info.helper_count
-            ]
+        available_slots = _popcount(
+            state.assessor_slots[assessor] & state.open_slots
         )
-        blocks_to_schedule = assessor_workload[assessor]['remaining_workload']
+        return available_slots - state.remaining[assessor]
 
-        return available_slots - blocks_to_schedule
+
+@dataclass
+class _Frame:
+    """A decision point of the search: the slot to be filled and the
+    assessors that have not been tried for it yet.
+    """
+    slot: int
+    assessors: List[int]
+    mark: int
+    assessor: Optional[int] = None
 
 
 class BackTracking(BaseAlgorithm):
     """A depth-first back-tracking search guided by heuristics to find
     a feasible assessor-slot assignment (ignoring concrete exams).
+
+    The search always fills the most difficult slot next and tries its
+    assessors from the most to the least difficult one. Branches in
+    which any assessor cannot be scheduled anymore are pruned early.
+    The search is iterative, so it is not limited by the recursion depth.
+
+    If the search takes more than MAX_STEPS steps, it gives up and
+    raises a SearchBudgetExhaustedError, since the input may well be
+    feasible.
     """
+
+    MAX_STEPS = 1_000_000
+
     def __init__(self, data, heuristics=None):
         super().__init__(data)
         self.heuristics = heuristics or SchedulingHeuristics()
 
     def run(self) -> Tuple[Schedule, None]:
-        assessor_workload = self.data.assessor_workload
-        for assessor in assessor_workload:
-            assessor_workload[assessor]['remaining_workload'] = \
-                assessor_workload.remaining_blocks_of(assessor)
-
-        schedule = self.back_track(
-            Schedule(),
+        state = SearchState(
             self.data.staff_avails,
-            assessor_workload
+            self.data.assessor_workload
         )
-        return schedule, None
-
-    def back_track(
-            self,
-            schedule: Schedule,
-            staff_avails: Dict[SlotId, AvailInfo],
-            assessor_workload: AssessorWorkload
-    ):
-        if schedule.total_blocks_scheduled == self.data.total_num_blocks:
-            return schedule
-
-        schedule = deepcopy(schedule)
-        staff_avails = deepcopy(staff_avails)
-        assessor_workload = deepcopy(assessor_workload)
-
-        slots = self._get_ranked_slots(staff_avails)
+        path = self._search(state)
 
-        if not slots:
-            # This path has lead to a dead end!
-            return None
+        if path is None:
+            raise UnfeasibleInputError
 
-        for slot in slots:
-            available_assessors = staff_avails[slot].assessors
-            ranked_assessors = self._get_ranked_assessors(
-                available_assessors,
-                staff_avails,
-                assessor_workload
-            )
-            for assessor in ranked_assessors:
-                schedule[slot] += [BlockSchedule(assessor)]
+        schedule = Schedule()
+        for slot, assessor in path:
+            schedule[state.slot_ids[slot]] += [
+                BlockSchedule(state.assessors[assessor])
+            ]
 
-                self._update_avails(
-                    staff_avails,
-                    slot,
-                    assessor
-                )
-                self._update_workload(
-                    assessor_workload,
-                    staff_avails,
-                    assessor
-                )
+        return schedule, None
 
-                solution = self.back_track(
-                    schedule,
-                    staff_avails,
-                    assessor_workload
-                )
+    def _search(self, state: SearchState) -> Optional[List[Tuple[int, int]]]:
+        """Return the (slot, assessor) index pairs of a feasible
+        assignment, or None if there is none.
 
-                if solution is None:
-                    continue
+        Raise a SearchBudgetExhaustedError if neither is found within
+        the step limit.
+        """
+        stack: List[_Frame] = []
 
-                return solution
+        for _ in range(self.MAX_STEPS):
+            if not state.blocks_to_schedule:
+                return [(frame.slot, frame.assessor) for frame in stack]
 
-            raise UnfeasibleInputError
+            if state.is_consistent():
+                frame = self._branch(state)
 
-    def _get_ranked_slots(
-            self,
-            avails: Dict[SlotId, AvailInfo]
-    ) -> List[SlotId]:
-        """Return a list of slot ids, ranked according to the (heuristic)
-        scheduling difficulty.
+                if frame is not None:
+                    stack.append(frame)
 
-        This ranking depends on the current state of the scheduling
-        process, i.e., the current assessor workloads and availabilities.
-        """
-        non_empty_avails = [
-            (slot, info)
-            for slot, info in avails.items()
-            if info.assessor_count and info.helper_count
-        ]
-        non_empty_avails.sort(key=self.heuristics.slot_ease_score)
-        return [slot for slot, info in non_empty_avails]
+            while stack and not stack[-1].assessors:
+                state.undo(stack.pop().mark)
 
-    def _get_ranked_assessors(
-            self,
-            assessors: List[Assessor],
-            staff_avails: Dict[SlotId, AvailInfo],
-            assessor_workload: AssessorWorkload
-    ) -> List[Assessor]:
-        """Return a list of assessors, ranked according to the (heuristic)
-        scheduling difficulty.
+            if not stack:
+                return None
 
-        This ranking depends on the current state of the scheduling
-        process, i.e., the current assessor workloads and availabilities.
-        """
-        def assessor_ease(assessor):
-            return self.heuristics.assessor_ease_score(
-                assessor,
-                staff_avails,
-                assessor_workload
-            )
-        return sorted(assessors, key=assessor_ease)
+            frame = stack[-1]
+            state.undo(frame.mark)
+            frame.assessor = frame.assessors.pop(0)
+            state.assign(frame.slot, frame.assessor)
 
-    def _update_workload(
-            self,
-            assessor_workload: AssessorWorkload,
-            staff_avails: Dict[SlotId, AvailInfo],
-            assessor: Assessor,
-    ) -> None:
-        """Reduce the assessor's workload by one.
+        raise SearchBudgetExhaustedError(
+            f'No assignment was found within {self.MAX_STEPS} steps'
+        )
 
-        If no more blocks are pending for this assessor, remove her from
-        the staff availabilities altogether.
+    def _branch(self, state: SearchState) -> Optional[_Frame]:
+        """Return a decision point for the most difficult candidate slot,
+        or None if there is no candidate slot left.
         """
-        assessor_workload[assessor]['remaining_workload'] -= 1
-
-        if not assessor_workload[assessor]['remaining_workload']:
-            self._remove_assessor_from_all_avails(staff_avails, assessor)
+        slots = state.candidate_slots()
 
-    @staticmethod
-    def _remove_assessor_from_all_avails(
-            staff_avails: Dict[SlotId, AvailInfo],
-            assessor: Assessor
-    ) -> None:
-        """Remove the assessor from all the staff avail assessor lists."""
-        for slot, avail_info in staff_avails.items():
-            if assessor in avail_info.assessors:
-                staff_avails[slot].remove(assessor)
+        if not slots:
+            return None
 
-    @staticmethod
-    def _update_avails(
-            staff_avails: Dict[SlotId, AvailInfo],
-            slot: SlotId,
-            assessor: Assessor
-    ) -> None:
-        """Remove assessor from the block's avails list and decrement both
-        the assessor and helper counters.
-        """
-        staff_avails[slot].remove(assessor)
-        staff_avails[slot].helper_count -= 1
+        slot = min(
+            slots,
+            key=lambda _slot: self.heuristics.slot_ease_score(state, _slot)
+        )
+        assessors = sorted(
+            _bits(state.slot_assessors[slot]),
+            key=lambda _assessor: self.heuristics.assessor_ease_score(
+                state,
+                _assessor
+            )
+        )
+        return _Frame(slot=slot, assessors=assessors, mark=state.mark())
@@ -2,12 +2,15 @@
 Abstract base class for algorithm implementations.
 """
 from abc import ABC, abstractmethod
-from copy import deepcopy
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from staff.models import Assessor
 
 from ..input_collectors import InputData
 from ..evaluators import Evaluator
 from ..schedule import Schedule
+from ..types import SlotId
 
 
 class BaseAlgorithm(ABC):
@@ -18,7 +21,7 @@ class BaseAlgorithm(ABC):
             data: InputData,
             evaluator: Optional[Evaluator] = None
     ):
-        self.data = deepcopy(data)
+        self.data = data.copy()
         self.evaluator = evaluator
 
     @abstractmethod
@@ -31,8 +34,31 @@ class BaseAlgorithm(ABC):
         pass
 
 
+@dataclass
+class InfeasibilityCut:
+    """A group of assessors that together need more blocks than their
+    available slots can take.
+    """
+    assessors: List[Assessor]
+    slots: List[SlotId]
+    blocks_needed: int
+    blocks_possible: int
+
+
 class UnfeasibleInputError(BaseException):
     """Raised by back-tracking algorithm if the staff availabilities
     and workloads do not allow for a valid schedule.
+
+    If the algorithm can tell why, the error carries the infeasibility
+    cut.
+    """
+
+    def __init__(self, cut: Optional[InfeasibilityCut] = None):
+        super().__init__(cut)
+        self.cut = cut
+
+
+class SearchBudgetExhaustedError(Exception):
+    """Raised by back-tracking algorithm if it reaches its step limit
+    before it can tell whether the input allows for a valid schedule.
     """
-    pass
@@ -0,0 +1,252 @@
+"""
+Exact assessor-slot assignment as a maximum flow problem.
+"""
+from collections import deque
+import random
+from typing import List, Tuple
+
+from .base import BaseAlgorithm, InfeasibilityCut, UnfeasibleInputError
+from ..schedule import Schedule, BlockSchedule
+
+
+class FlowNetwork:
+    """A directed graph with integer edge capacities on which Dinic's
+    algorithm computes maximum flows.
+
+    Edges are stored in flat lists. Each edge is directly followed by
+    its reverse edge, so that edge ^ 1 is the reverse of edge.
+    """
+
+    def __init__(self, num_nodes: int):
+        self.edges = [[] for _ in range(num_nodes)]
+        self.heads = []
+        self.capacities = []
+
+    def add_edge(self, tail: int, head: int, capacity: int) -> int:
+        """Add an edge and its reverse edge with zero capacity to the
+        network and return the edge.
+        """
+        edge = len(self.heads)
+
+        self.edges[tail].append(edge)
+        self.heads.append(head)
+        self.capacities.append(capacity)
+
+        self.edges[head].append(edge + 1)
+        self.heads.append(tail)
+        self.capacities.append(0)
+
+        return edge
+
+    def max_flow(self, source: int, sink: int) -> int:
+        """Push the maximum flow from source to sink and return its value.
+
+        Afterwards, the capacities are the residual capacities.
+        """
+        flow = 0
+
+        while True:
+            levels = self._levels(source)
+
+            if levels[sink] < 0:
+                return flow
+
+            next_edges = [0] * len(self.edges)
+
+            while True:
+                pushed = self._augment(source, sink, levels, next_edges)
+
+                if not pushed:
+                    break
+
+                flow += pushed
+
+    def reachable_from(self, source: int) -> List[bool]:
+        """Return for every node whether the source reaches it in the
+        residual network.
+        """
+        return [level >= 0 for level in self._levels(source)]
+
+    def _levels(self, source: int) -> List[int]:
+        """Return the breadth-first distance of every node from the source
+        in the residual network, or -1 for unreachable nodes.
+        """
+        levels = [-1] * len(self.edges)
+        levels[source] = 0
+        queue = deque([source])
+
+        while queue:
+            node = queue.popleft()
+
+            for edge in self.edges[node]:
+                head = self.heads[edge]
+
+                if self.capacities[edge] > 0 and levels[head] < 0:
+                    levels[head] = levels[node] + 1
+                    queue.append(head)
+
+        return levels
+
+    def _augment(
+            self,
+            source: int,
+            sink: int,
+            levels: List[int],
+            next_edges: List[int]
+    ) -> int:
+        """Push flow along one source-sink path of the level graph and
+        return the amount pushed, or 0 if there is no such path left.
+
+        The path is searched iteratively, skipping edges that have
+        already led to dead ends.
+        """
+        path = []
+        node = source
+
+        while node != sink:
+            edges = self.edges[node]
+
+            while next_edges[node] < len(edges):
+                edge = edges[next_edges[node]]
+                head = self.heads[edge]
+
+                if self.capacities[edge] > 0 \
+                        and levels[head] == levels[node] + 1:
+                    break
+
+                next_edges[node] += 1
+            else:
+                if not path:
+                    return 0
+
+                levels[node] = -1
+                edge = path.pop()
+                node = self.heads[edge ^ 1]
+                next_edges[node] += 1
+                continue
+
+            path.append(edge)
+            node = head
+
+        pushed = min(self.capacities[edge] for edge in path)
+
+        for edge in path:
+            self.capacities[edge] -= pushed
+            self.capacities[edge ^ 1] += pushed
+
+        return pushed
+
+
+class FlowSlotAssigner(BaseAlgorithm):
+    """Assigns assessors to slots by solving a maximum flow problem.
+
+    The network consists of a source, an assessor node per assessor, a
+    slot node per slot and a sink. The source feeds each assessor with
+    her number of blocks, each assessor can pass one block to every slot
+    she is available in, and each slot passes on at most as many blocks
+    as it has helpers. A feasible assignment exists iff the maximum
+    flow saturates all assessors.
+
+    Unlike back-tracking, this takes polynomial time in any case. The
+    edges are added in random order, so that repeated runs yield
+    different assignments.
+    """
+
+    SOURCE = 0
+    SINK = 1
+
+    def run(self) -> Tuple[Schedule, None]:
+        assessors = [
+            assessor
+            for assessor in self.data.assessor_workload
+            if self.data.assessor_workload.remaining_blocks_of(assessor)
+        ]
+        slots = list(self.data.staff_avails)
+
+        assessor_nodes = {
+            assessor: 2 + i for i, assessor in enumerate(assessors)
+        }
+        slot_nodes = {
+            slot: 2 + len(assessors) + i for i, slot in enumerate(slots)
+        }
+        network = FlowNetwork(2 + len(assessors) + len(slots))
+
+        for assessor in assessors:
+            network.add_edge(
+                self.SOURCE,
+                assessor_nodes[assessor],
+                self.data.assessor_workload.remaining_blocks_of(assessor)
+            )
+
+        block_edges = []
+        for slot in random.sample(slots, len(slots)):
+            avails = self.data.staff_avails[slot]
+
+            for assessor in avails.assessors:
+                if assessor in assessor_nodes:
+                    edge = network.add_edge(
+                        assessor_nodes[assessor],
+                        slot_nodes[slot],
+                        1
+                    )
+                    block_edges.append((edge, assessor, slot))
+
+            network.add_edge(slot_nodes[slot], self.SINK, avails.helper_count)
+
+        blocks_needed = sum(
+            self.data.assessor_workload.remaining_blocks_of(assessor)
+            for assessor in assessors
+        )
+
+        if network.max_flow(self.SOURCE, self.SINK) < blocks_needed:
+            raise UnfeasibleInputError(
+                self._cut(network, assessors, assessor_nodes)
+            )
+
+        schedule = Schedule()
+        for edge, assessor, slot in block_edges:
+            if not network.capacities[edge]:
+                schedule[slot] += [BlockSchedule(assessor)]
+
+        return schedule, None
+
+    def _cut(
+            self,
+            network: FlowNetwork,
+            assessors: list,
+            assessor_nodes: dict
+    ) -> InfeasibilityCut:
+        """Return the assessors on the source side of the minimum cut.
+
+        These assessors together need more blocks than the flow could
+        route to their available slots.
+        """
+        reachable = network.reachable_from(self.SOURCE)
+        cut_assessors = [
+            assessor
+            for assessor in assessors
+            if reachable[assessor_nodes[assessor]]
+        ]
+        cut_assessor_set = set(cut_assessors)
+        cut_slots = [
+            slot
+            for slot, avails in self.data.staff_avails.items()
+            if not cut_assessor_set.isdisjoint(avails.assessors)
+        ]
+
+        blocks_needed = sum(
+            self.data.assessor_workload.remaining_blocks_of(assessor)
+            for assessor in cut_assessors
+        )
+        blocks_missing = sum(
+            network.capacities[edge]
+            for edge in network.edges[self.SOURCE]
+            if reachable[network.heads[edge]]
+        )
+
+        return InfeasibilityCut(
+            assessors=cut_assessors,
+            slots=cut_slots,
+            blocks_needed=blocks_needed,
+            blocks_possible=blocks_needed - blocks_missing,
+        )
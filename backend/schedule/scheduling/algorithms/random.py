@@ -6,14 +6,13 @@ from datetime import timedelta
 import random
 from typing import List, Tuple
 
-from django.db.models import Q, QuerySet
-
 from staff.models import Assessor
 from schedule.models import BlockTemplate
 from exam.models import Exam, Module
 
 from .back_tracking import BackTracking
-from .base import BaseAlgorithm
+from .base import BaseAlgorithm, SearchBudgetExhaustedError
+from .flow import FlowSlotAssigner
 from ..schedule import Schedule, BlockSchedule, ExamSchedule, TimeFrame
 
 
@@ -24,21 +23,32 @@ class RandomAssignment(BaseAlgorithm):
         super().__init__(data)
         self.slot_assigner = slot_assigner or BackTracking(data)
 
+        self.remaining_exams = {
+            key: list(exams)
+            for key, exams in self.data.exams_by_assessor_and_length.items()
+        }
+
     def run(self) -> Tuple[Schedule, None]:
         """Using a back-tracking result for assessor-slot assignment,
         randomly assign concrete exams with conforming assessor and
         exam time.
 
+        If the back-tracking search exhausts its budget, the assessor-slot
+        assignment is found by solving a maximum flow problem instead.
+
         Return the resulting schedule, which is not guaranteed to be
         free of first-order conflicts.
         """
-        schedule, _ = self.slot_assigner.run()
+        try:
+            schedule, _ = self.slot_assigner.run()
+        except SearchBudgetExhaustedError:
+            schedule, _ = FlowSlotAssigner(self.data).run()
 
         for slot, blocks in schedule.items():
             for block in blocks:
                 template = self._get_random_template_for(block.assessor)
 
-                block.start_time = self.data.block_slots.get(id=slot).start_time
+                block.start_time = self.data.slots_by_id[slot].start_time
                 block.exam_start_times = template.exam_start_times
                 block.exam_length = template.exam_length
 
@@ -70,27 +80,28 @@ class RandomAssignment(BaseAlgorithm):
         ]
 
         exam_length = random.choice(length_options)
-        return self.data.block_templates.get(exam_length=exam_length)
+        return self.data.templates_by_length[exam_length]
 
     def _get_compatible_exams(
             self,
             assessor: Assessor,
             template: BlockTemplate
-    ) -> QuerySet:
-        """Return a queryset of exams that are executed by the assessor
-        and conform with the template's exam length.
+    ) -> List[Exam]:
+        """Return a list of remaining exams that are executed by the
+        assessor and conform with the template's exam length.
         """
-        return self.data.exams \
-            .filter(assessor=assessor) \
-            .filter(self._fitting_length_query(template.exam_length))
+        return self.remaining_exams.get(
+            (assessor.id, template.exam_length),
+            []
+        )
 
     def _assign_compatible_exams(
             self,
             block: BlockSchedule,
-            exam_candidates: QuerySet,
+            exam_candidates: List[Exam],
             template: BlockTemplate
     ) -> None:
-        """From the queryset of exam candidates, pseudo-randomly assign
+        """From the list of exam candidates, pseudo-randomly assign
         exams to to the block and delete scheduled exams from the total list of
         exams.
 
@@ -159,18 +170,8 @@ class RandomAssignment(BaseAlgorithm):
         counter = Counter([exam.module for exam in exam_candidates])
         return [module for module, count in counter.most_common()]
 
-    @staticmethod
-    def _fitting_length_query(length: int):
-        """Complex Django query to filter for exams that have
-        the given length.
-        """
-        return (
-                (Q(style='alternative') & Q(module__alternative_length=length))
-                | (Q(style='standard') & Q(module__standard_length=length))
-        )
-
     def _update_exams(self, exam: Exam) -> None:
-        """Remove the exam from the queryset of exams s.t. it is no longer
-        considered in the scheduling process.
+        """Remove the exam from the list of remaining exams s.t. it is no
+        longer considered in the scheduling process.
         """
-        self.data.exams = self.data.exams.exclude(id=exam.id)
+        self.remaining_exams[(exam.assessor_id, exam.length)].remove(exam)
@@ -1,23 +1,29 @@
 """
 Implementation of the Tabu Search (TS) meta heuristic.
 """
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from collections import deque, UserList, defaultdict
-from copy import deepcopy
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
 import math
+from multiprocessing import Manager
+import os
 from pprint import pprint
+from queue import Queue
 import random
 from timeit import default_timer
-from typing import List, Tuple, Optional
-from uuid import uuid4
+from typing import Callable, Iterable, List, Tuple, Optional
 
 from django.conf import settings
 
 from .base import BaseAlgorithm
 from .random import RandomAssignment
 from ..schedule import Schedule, BlockSchedule, ExamSchedule, TimeFrame
+from ..input_collectors import InputData
 from ..types import SlotId
 from ..evaluators import Evaluator
 
@@ -35,16 +41,8 @@ class Actions:
         """Swap the given blocks and return a modified
         copy of the schedule.
         """
-        schedule = deepcopy(schedule)
-        schedule._key = uuid4()
-
-        first, second = self._pop_blocks(schedule, block_indeces)
-        self._swap_start_times(first, second)
-
-        for block in [first, second]:
-            self._update_exams_of(block)
-
-        self._add_updated_blocks(schedule, first, second, block_indeces)
+        schedule = schedule.copy()
+        BlockSwapMove(block_indeces, actions=self).apply(schedule)
         return schedule
 
     def swap_exams(
@@ -55,14 +53,8 @@ class Actions:
         """Swap the given exams and return a modified
         copy of the schedule.
         """
-        schedule = deepcopy(schedule)
-
-        # Needed to make schedules hashable for function call caching
-        schedule._key = uuid4()
-
-        first, second = self._get_exams(schedule, exam_indices)
-        self._swap_attributes(first, second)
-
+        schedule = schedule.copy()
+        ExamSwapMove(exam_indices, actions=self).apply(schedule)
         return schedule
 
     @staticmethod
@@ -132,6 +124,203 @@ class Actions:
         first.block, second.block = second.block, first.block
 
 
+class Move(ABC):
+    """Describes a single step through the search space without
+    copying the schedule it refers to.
+
+    A move can be scored against a schedule, applied to it in place and
+    undone again. Since the move only holds indices, it can also be
+    applied to any copy of the schedule it was created for.
+    """
+
+    def __init__(self, actions: Optional[Actions] = None):
+        self.actions = actions or Actions()
+
+    def apply(self, schedule: Schedule) -> None:
+        """Modify the schedule in place according to the move."""
+        self._execute(schedule)
+
+    def undo(self, schedule: Schedule) -> None:
+        """Revert the modification of a previous call to self.apply."""
+        self._revert(schedule)
+
+    @abstractmethod
+    def penalty(
+            self,
+            schedule: Schedule,
+            penalty: int,
+            evaluator: Evaluator
+    ) -> int:
+        """Return the penalty the schedule would have after applying
+        the move, given the schedule's current penalty.
+
+        The schedule is left unchanged.
+        """
+        pass
+
+    @abstractmethod
+    def _execute(self, schedule: Schedule) -> None:
+        pass
+
+    @staticmethod
+    def _update_conflicts(schedule: Schedule, students) -> None:
+        """Evaluate the given students' conflicts again, if the schedule
+        has a conflict index.
+        """
+        if schedule.conflict_index is not None:
+            schedule.conflict_index.update(schedule, students)
+
+    @abstractmethod
+    def _revert(self, schedule: Schedule) -> None:
+        pass
+
+
+class ExamSwapMove(Move):
+    """Swaps two exams of a schedule, given as
+    (slot_id, block_position, exam_position) indices.
+    """
+
+    def __init__(
+            self,
+            exam_indices: List[Tuple[SlotId, int, int]],
+            actions: Optional[Actions] = None
+    ):
+        super().__init__(actions)
+        self.exam_indices = exam_indices
+
+    def penalty(
+            self,
+            schedule: Schedule,
+            penalty: int,
+            evaluator: Evaluator
+    ) -> int:
+        """Return the cached penalty of the resulting schedule or evaluate
+        the swap and cache its penalty.
+        """
+        fingerprint = self.fingerprint(schedule)
+        new_penalty = evaluator.cache.get(fingerprint)
+
+        if new_penalty is None:
+            first, second = self.actions._get_exams(
+                schedule,
+                self.exam_indices
+            )
+            new_penalty = evaluator.penalty_after_exam_swap(
+                schedule,
+                penalty,
+                first,
+                second
+            )
+            evaluator.cache.put(fingerprint, new_penalty)
+
+        return new_penalty
+
+    def fingerprint(self, schedule: Schedule) -> int:
+        """Return the fingerprint the schedule would have after applying
+        the move, leaving the schedule unchanged.
+        """
+        first, second = self.actions._get_exams(schedule, self.exam_indices)
+        return schedule.index.hash_after_exam_swap(
+            first.exam_code,
+            second.exam_code
+        )
+
+    def _execute(self, schedule: Schedule) -> None:
+        # The index must be built before the swap, if it does not exist yet
+        index = schedule.index
+
+        first, second = self.actions._get_exams(schedule, self.exam_indices)
+        self.actions._swap_attributes(first, second)
+        index.swap_exam_positions(first.exam_code, second.exam_code)
+        self._update_conflicts(schedule, {first.student, second.student})
+
+    def _revert(self, schedule: Schedule) -> None:
+        # Swapping the same exams again restores the original state
+        self._execute(schedule)
+
+
+class BlockSwapMove(Move):
+    """Swaps two blocks of a schedule, given as
+    (slot_id, block_position) indices.
+    """
+
+    def __init__(
+            self,
+            block_indices: List[Tuple[SlotId, int]],
+            actions: Optional[Actions] = None
+    ):
+        super().__init__(actions)
+        self.block_indices = block_indices
+
+    def penalty(
+            self,
+            schedule: Schedule,
+            penalty: int,
+            evaluator: Evaluator
+    ) -> int:
+        """Evaluate the swap on the schedule's conflict index."""
+        (slot_id_1, first_id), (slot_id_2, second_id) = self.block_indices
+
+        return evaluator.penalty_after_block_swap(
+            schedule,
+            penalty,
+            schedule[slot_id_1][first_id],
+            schedule[slot_id_2][second_id]
+        )
+
+    def _execute(self, schedule: Schedule) -> None:
+        first, second = self.actions._pop_blocks(schedule, self.block_indices)
+        self._swap(first, second)
+        self.actions._add_updated_blocks(
+            schedule,
+            first,
+            second,
+            self.block_indices
+        )
+        self._update_index(schedule)
+
+    def _revert(self, schedule: Schedule) -> None:
+        """Take the blocks from the end of their new slots and put them
+        back to their original positions.
+        """
+        (slot_id_1, first_id), (slot_id_2, second_id) = self.block_indices
+
+        first = schedule[slot_id_2].pop()
+        second = schedule[slot_id_1].pop()
+        self._swap(first, second)
+
+        schedule[slot_id_2].insert(second_id, second)
+        schedule[slot_id_1].insert(first_id, first)
+        self._update_index(schedule)
+
+    def _update_index(self, schedule: Schedule) -> None:
+        """Record the new block and exam positions in both slots.
+
+        The positions of all other blocks in these slots may have
+        changed as well, so the conflicts of all their students are
+        updated.
+        """
+        (slot_id_1, _), (slot_id_2, _) = self.block_indices
+        slots = {slot_id_1, slot_id_2}
+        schedule.index.update_slots(schedule, slots)
+
+        self._update_conflicts(
+            schedule,
+            {
+                exam.student
+                for slot in slots
+                for block in schedule[slot]
+                for exam in block.exams
+            }
+        )
+
+    def _swap(self, first: BlockSchedule, second: BlockSchedule) -> None:
+        self.actions._swap_start_times(first, second)
+
+        for block in [first, second]:
+            self.actions._update_exams_of(block)
+
+
 class Neighborhood(ABC, UserList):
     """Defines the neighborhood structure that underlies the search
     problem.
@@ -159,8 +348,9 @@ class Neighborhood(ABC, UserList):
 
     @abstractmethod
     def _set_neighbors(self) -> None:
-        """Set the self.data attribute with all neighbors of the schedule
-        that shall be considered in the next search iteration.
+        """Set the self.data attribute with the moves leading to all
+        neighbors of the schedule that shall be considered in the next
+        search iteration.
         """
         pass
 
@@ -174,24 +364,21 @@ class ExamNeighborhood(Neighborhood):
 
     def _set_neighbors(self) -> None:
         exam_to_swap = self._exam_to_swap()
-        exam_to_swap_index = self._get_index_of(exam_to_swap)
+        index = self.schedule.index
+        exam_to_swap_index = index.exam_positions[exam_to_swap.exam_code]
 
-        for slot, blocks in self.schedule.items():
-            for i, block in enumerate(blocks):
-                if not self._compatible_lengths(block, exam_to_swap):
-                    continue
+        candidates = index.exam_groups[index.group_key(exam_to_swap)]
 
-                for j, exam in enumerate(block.exams):
-                    if self._swappable(exam, exam_to_swap):
+        for exam_code in candidates:
+            slot, i, j = index.exam_positions[exam_code]
+            exam = self.schedule[slot][i].exams[j]
 
-                        exam_indices = [exam_to_swap_index, (slot, i, j)]
-                        neighbor = self.actions.swap_exams(
-                            self.schedule,
-                            exam_indices
-                        )
+            if self._swappable(exam, exam_to_swap):
+                exam_indices = [exam_to_swap_index, (slot, i, j)]
+                move = ExamSwapMove(exam_indices, self.actions)
 
-                        neighbor.swapped_exam = exam
-                        self.data.append(neighbor)
+                move.swapped_exam = exam
+                self.data.append(move)
 
     def _exam_to_swap(self) -> ExamSchedule:
         """Return the exam that is to be swapped to get the schedule's
@@ -202,25 +389,18 @@ class ExamNeighborhood(Neighborhood):
         """
         mc_student = self.evaluator.most_conflicted_student(self.schedule)
 
-        conflicts = self.evaluator.conflicts(self.schedule)
-        category = self._most_severe_category(conflicts, mc_student)
-        mc_exams = conflicts[mc_student][category]
+        conflicts = self.evaluator.conflicts_of(self.schedule, mc_student)
+        category = self._most_severe_category(conflicts)
+        mc_exams = conflicts[category]
 
         return random.choice(random.choice(mc_exams).exams)
 
     @staticmethod
-    def _most_severe_category(conflicts, student):
+    def _most_severe_category(conflicts):
         """Return the most severe degree of conflict that the student
         is involved in.
         """
-        return min(conflicts[student].keys())
-
-    @staticmethod
-    def _compatible_lengths(block: BlockSchedule, exam: ExamSchedule) -> bool:
-        """Return True if the block's exam length is the same as the
-        exam's length.
-        """
-        return block.exam_length == exam.time_frame.length(as_int=True)
+        return min(conflicts.keys())
 
     @staticmethod
     def _swappable(first: ExamSchedule, second: ExamSchedule) -> bool:
@@ -234,19 +414,6 @@ class ExamNeighborhood(Neighborhood):
             and first.module == second.module
         )
 
-    def _get_index_of(self, exam_to_find: ExamSchedule) -> Tuple[int]:
-        """Return the index information to find the given exam schedule
-        within the self.schedule.
-
-        The indeces are returned as a tuple (slot_id, block_position,
-        exam_position).
-        """
-        for slot, blocks in self.schedule.items():
-            for i, block in enumerate(blocks):
-                for j, exam in enumerate(block.exams):
-                    if exam == exam_to_find:
-                        return slot, i, j
-
 
 class BlockNeighborhood(Neighborhood):
     """Defines the neighborhood of a schedule w.r.t. swapping entire blocks.
@@ -258,18 +425,26 @@ class BlockNeighborhood(Neighborhood):
 
     def _set_neighbors(self) -> None:
         block_to_swap = self.evaluator.most_conflicted_block(self.schedule)
+
+        # A schedule without any punished block has no block neighbors
+        if block_to_swap is None:
+            return
+
+        assessor_blocks = self.schedule.index.assessor_blocks[
+            block_to_swap.assessor.id
+        ]
         block_to_swap_index = self._get_index_of(block_to_swap)
 
-        for slot, blocks in self.schedule.items():
-            for i, block in enumerate(blocks):
+        for slot, positions in assessor_blocks.items():
+            for i in positions:
+                block = self.schedule[slot][i]
+
                 if self._swappable(block, block_to_swap):
                     block_indices = [block_to_swap_index, (slot, i)]
-                    neighbor = self.actions.swap_blocks(
-                        self.schedule,
-                        block_indices
-                    )
-                    neighbor.swapped_block = block
-                    self.data.append(neighbor)
+                    move = BlockSwapMove(block_indices, self.actions)
+
+                    move.swapped_block = block
+                    self.data.append(move)
 
                     if len(self.data) > self.MAX_NEIGHBORS:
                         return
@@ -280,13 +455,14 @@ class BlockNeighborhood(Neighborhood):
 
         The indeces are returned as a tuple (slot_id, block_position).
         """
-        for slot, blocks in self.schedule.items():
-            try:
-                index = blocks.index(block_to_find)
-            except ValueError:
-                pass
-            else:
-                return slot, index
+        assessor_blocks = self.schedule.index.assessor_blocks[
+            block_to_find.assessor.id
+        ]
+
+        for slot, positions in assessor_blocks.items():
+            for i in positions:
+                if self.schedule[slot][i] is block_to_find:
+                    return slot, i
 
     @staticmethod
     def _swappable(first: BlockSchedule, second: BlockSchedule) -> bool:
@@ -390,6 +566,30 @@ class TabuList:
         self.records.append(item.exam_code)
 
 
+class VisitedStates:
+    """Remembers the fingerprints of the most recently visited schedules,
+    so that the search does not cycle back to them.
+    """
+
+    def __init__(self, max_len: int):
+        self.max_len = max_len
+        self.records = deque()
+        self.fingerprints = set()
+
+    def __contains__(self, fingerprint: int):
+        return fingerprint in self.fingerprints
+
+    def add(self, fingerprint: int) -> None:
+        if fingerprint in self.fingerprints:
+            return
+
+        self.records.append(fingerprint)
+        self.fingerprints.add(fingerprint)
+
+        if len(self.records) > self.max_len:
+            self.fingerprints.remove(self.records.popleft())
+
+
 class Logger:
     def __init__(self, verbose: Optional[bool] = None):
         self.log = print if verbose else self._shut_up
@@ -419,24 +619,290 @@ class Logger:
         print("*")
 
 
+class SearchBudget:
+    """Limits a search by wall-clock time and number of iterations.
+
+    Either limit may be None, in which case it does not apply.
+    """
+
+    def __init__(
+            self,
+            max_seconds: Optional[float] = None,
+            max_iterations: Optional[int] = None
+    ):
+        self.max_seconds = max_seconds
+        self.max_iterations = max_iterations
+        self.start_time = None
+        self.iterations = 0
+
+    @classmethod
+    def from_settings(cls) -> SearchBudget:
+        return cls(
+            max_seconds=settings.SCHEDULING_TIME_LIMIT or None,
+            max_iterations=settings.SCHEDULING_MAX_ITERATIONS or None
+        )
+
+    def start(self) -> None:
+        self.start_time = default_timer()
+        self.iterations = 0
+
+    def spend(self) -> None:
+        """Count an iteration against the budget."""
+        self.iterations += 1
+
+    @property
+    def elapsed(self) -> float:
+        return default_timer() - self.start_time
+
+    def exhausted(self) -> bool:
+        if self.max_iterations is not None \
+                and self.iterations >= self.max_iterations:
+            return True
+
+        return self.max_seconds is not None \
+            and self.elapsed >= self.max_seconds
+
+
+class IncumbentPublisher:
+    """Hands the best schedule found so far to a callback, at most once
+    per interval, so that an interrupted search still leaves a usable
+    schedule behind.
+    """
+
+    def __init__(
+            self,
+            callback: Optional[Callable[[Schedule, int], None]],
+            interval: float
+    ):
+        self.callback = callback
+        self.interval = interval
+        self.published_at = default_timer()
+        self.pending = None
+
+    def offer(self, schedule: Schedule, penalty: int) -> None:
+        """Register a new incumbent to be published once due."""
+        if self.callback is not None:
+            self.pending = (schedule, penalty)
+
+    def poll(self) -> None:
+        """Publish the pending incumbent if the interval has passed."""
+        if self.pending is None:
+            return
+
+        if default_timer() - self.published_at < self.interval:
+            return
+
+        schedule, penalty = self.pending
+        self.callback(schedule.copy(), penalty)
+
+        self.published_at = default_timer()
+        self.pending = None
+
+
+@dataclass
+class SearchProgress:
+    """A snapshot of a running search."""
+    iterations: int
+    current_penalty: int
+    best_penalty: int
+    elapsed: float
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class ProgressReporter:
+    """Passes the progress of a search to a callback, at most once per
+    interval.
+    """
+
+    def __init__(
+            self,
+            callback: Optional[Callable[[SearchProgress], None]],
+            interval: float
+    ):
+        self.callback = callback
+        self.interval = interval
+        self.reported_at = None
+
+    def due(self) -> bool:
+        """Return True if a report is to be made now."""
+        if self.callback is None:
+            return False
+
+        return self.reported_at is None \
+            or default_timer() - self.reported_at >= self.interval
+
+    def report(self, progress: SearchProgress) -> None:
+        self.callback(progress)
+        self.reported_at = default_timer()
+
+
+class _Stopwatch:
+    """Adds the time spent within its context to an attribute of the
+    telemetry.
+    """
+
+    def __init__(self, telemetry: SearchTelemetry, attribute: str):
+        self.telemetry = telemetry
+        self.attribute = attribute
+        self.start = None
+
+    def __enter__(self):
+        self.start = default_timer()
+
+    def __exit__(self, *exc_info):
+        seconds = getattr(self.telemetry, self.attribute)
+        setattr(
+            self.telemetry,
+            self.attribute,
+            seconds + default_timer() - self.start
+        )
+
+
+_NOT_TIMED = nullcontext()
+
+
+@dataclass
+class SearchTelemetry:
+    """Counters collected during a search, to tune its parameters.
+
+    Neighbors are generated by the neighborhoods and evaluated when
+    their penalty is computed. Exam moves are rejected if they are tabu
+    or lead to a visited schedule, unless they meet the aspiration
+    criterion. The best penalty trace lists (elapsed seconds, penalty)
+    pairs of all improvements of the best schedule.
+
+    Counting is cheap, so it is always done. The time spent in the
+    actions, neighborhoods and evaluator is only measured if timed is
+    True.
+    """
+    iterations: int = 0
+    block_iterations: int = 0
+    neighbors_generated: int = 0
+    neighbors_evaluated: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    tabu_rejections: int = 0
+    aspiration_overrides: int = 0
+    seconds_in_actions: float = 0.0
+    seconds_in_neighborhoods: float = 0.0
+    seconds_in_evaluator: float = 0.0
+    best_penalty_trace: List[Tuple[float, int]] = field(default_factory=list)
+    timed: bool = False
+
+    def time(self, section: str):
+        """Return a context in which time is spent in the given section,
+        i.e., 'actions', 'neighborhoods' or 'evaluator'.
+        """
+        if not self.timed:
+            return _NOT_TIMED
+
+        return _Stopwatch(self, f'seconds_in_{section}')
+
+    def record_best(self, elapsed: float, penalty: int) -> None:
+        self.best_penalty_trace.append((elapsed, penalty))
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
 class TabuSearch(BaseAlgorithm):
     """Tabu search is a local meta heuristic that iteratively explores
     the solution space while keeping track of a 'tabu list'.
+
+    The search ends once it stops improving or once its budget is
+    exhausted, whichever comes first, and returns the best schedule
+    found so far. Meanwhile, improved schedules are passed to the
+    on_incumbent callback every publish_interval seconds, and the
+    search progress is passed to the on_progress callback every
+    progress_interval seconds.
+
+    Telemetry on the search is collected on every run, but only timed
+    and returned by run_with_telemetry.
     """
 
+    def __init__(
+            self,
+            data: InputData,
+            evaluator: Optional[Evaluator] = None,
+            budget: Optional[SearchBudget] = None,
+            on_incumbent: Optional[Callable[[Schedule, int], None]] = None,
+            publish_interval: Optional[float] = None,
+            on_progress: Optional[Callable[[SearchProgress], None]] = None,
+            progress_interval: Optional[float] = None
+    ):
+        super().__init__(data, evaluator)
+        self.budget = budget or SearchBudget.from_settings()
+        self.on_incumbent = on_incumbent
+        self.publish_interval = publish_interval \
+            if publish_interval is not None \
+            else settings.SCHEDULING_PUBLISH_INTERVAL
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval \
+            if progress_interval is not None \
+            else settings.SCHEDULING_PROGRESS_INTERVAL
+        self.telemetry = SearchTelemetry()
+
     def run(self, verbose=None) -> Tuple[Schedule, int]:
+        return self._run(verbose, SearchTelemetry())
+
+    def run_with_telemetry(
+            self,
+            verbose=None
+    ) -> Tuple[Schedule, int, SearchTelemetry]:
+        """Run the search like run, but also measure the time spent in
+        its parts, and return the telemetry next to the best schedule
+        and its penalty.
+        """
+        telemetry = SearchTelemetry(timed=True)
+        schedule, penalty = self._run(verbose, telemetry)
+        return schedule, penalty, telemetry
+
+    def _run(
+            self,
+            verbose: Optional[bool],
+            telemetry: SearchTelemetry
+    ) -> Tuple[Schedule, int]:
+        """Run the search, collect its telemetry and count the evaluator
+        cache hits and misses during the search.
+        """
+        self.telemetry = telemetry
+        cache_stats = self.evaluator.cache.stats()
+
+        try:
+            return self._search(verbose)
+        finally:
+            telemetry.iterations = self.budget.iterations
+            telemetry.cache_hits \
+                = self.evaluator.cache.hits - cache_stats['hits']
+            telemetry.cache_misses \
+                = self.evaluator.cache.misses - cache_stats['misses']
+
+    def _search(self, verbose: Optional[bool]) -> Tuple[Schedule, int]:
         logger = Logger(verbose=verbose)
+        telemetry = self.telemetry
         start_time = default_timer()
 
+        self.budget.start()
+        publisher = IncumbentPublisher(
+            self.on_incumbent,
+            self.publish_interval
+        )
+        reporter = ProgressReporter(self.on_progress, self.progress_interval)
+
         tabu_exams = TabuList(max_len=8)
+        visited_states = VisitedStates(max_len=100_000)
 
         # Initialize search context
         current_solution = self._get_initial_solution()
 
-        absolute_best = [
-            current_solution,
-            self.evaluator.penalty(current_solution)
-        ]
+        with telemetry.time('evaluator'):
+            absolute_best = [
+                current_solution,
+                self.evaluator.penalty(current_solution)
+            ]
+        telemetry.record_best(self.budget.elapsed, absolute_best[1])
 
         if absolute_best[1] == 0:
             logger.brag(0, start_time)
@@ -452,7 +918,13 @@ class TabuSearch(BaseAlgorithm):
                 = block_context.ranked_block_neighbors_of_previous_iteration()
 
             for potential, _ in ranked_neighbors:
-                block_neighborhood = BlockNeighborhood(potential)
+                with telemetry.time('neighborhoods'):
+                    block_neighborhood = BlockNeighborhood(
+                        potential,
+                        evaluator=self.evaluator
+                    )
+                telemetry.neighbors_generated += len(block_neighborhood)
+
                 if block_neighborhood:
                     break
                 logger.log("(Skipped solution without neighbors)")
@@ -463,21 +935,45 @@ class TabuSearch(BaseAlgorithm):
             logger.log("\n******\nNEW BLOCK SEARCH\n******")
 
             block_context.initialize_iteration()
+            telemetry.block_iterations += 1
+
+            for block_move in block_neighborhood:
+                with telemetry.time('actions'):
+                    block_neighbor = potential.copy()
+                    block_move.apply(block_neighbor)
 
-            for block_neighbor in block_neighborhood:
                 exam_context = ExamSearchContext(block_neighbor)
 
-                # Initialize exam search for the block neighbor
-                current_solution = block_neighbor
-                relative_best = [
-                    block_neighbor,
-                    self.evaluator.penalty(block_neighbor)
-                ]
+                # Initialize exam search for the block neighbor.
+                # Exam moves are applied to the current solution in place,
+                # so it must not be the same object as the relative best.
+                current_solution = block_neighbor.copy()
+
+                with telemetry.time('evaluator'):
+                    relative_best = [
+                        block_neighbor,
+                        self._penalty_of(block_neighbor)
+                    ]
+                telemetry.neighbors_evaluated += 1
 
                 if relative_best[1] == 0:
+                    telemetry.record_best(self.budget.elapsed, 0)
                     logger.brag(0, start_time)
                     return current_solution, 0
 
+                # A block swap alone may already improve on the best
+                # schedule found so far
+                if relative_best[1] < absolute_best[1]:
+                    block_context.record_improvement()
+                    absolute_best = list(relative_best)
+                    publisher.offer(*absolute_best)
+                    telemetry.record_best(
+                        self.budget.elapsed,
+                        relative_best[1]
+                    )
+
+                visited_states.add(current_solution.fingerprint)
+
                 logger.log(f"\nNEW BLOCK NEIGHBOR: {relative_best[1]}\n")
 
                 while True:
@@ -486,59 +982,304 @@ class TabuSearch(BaseAlgorithm):
                         block_context.record(best_schedule, best_penalty)
                         break
 
+                    if self.budget.exhausted():
+                        logger.log("Search budget exhausted")
+                        logger.brag(absolute_best[1], start_time)
+                        return tuple(absolute_best)
+
+                    self.budget.spend()
+                    publisher.poll()
+
+                    if reporter.due():
+                        reporter.report(
+                            SearchProgress(
+                                iterations=self.budget.iterations,
+                                current_penalty=self._penalty_of(
+                                    current_solution
+                                ),
+                                best_penalty=absolute_best[1],
+                                elapsed=self.budget.elapsed,
+                            )
+                        )
+
                     exam_context.initialize_iteration()
 
-                    scored_exam_neighbors = self._get_scored_exam_neighbors_of(
+                    scored_exam_moves = self._get_scored_exam_moves_of(
                         current_solution
                     )
 
-                    for exam_neighbor, penalty in scored_exam_neighbors:
+                    for exam_move, penalty in scored_exam_moves:
                         if penalty == 0:
+                            exam_move.apply(current_solution)
+                            telemetry.record_best(self.budget.elapsed, 0)
                             logger.brag(0, start_time)
-                            return exam_neighbor, 0
+                            return current_solution, 0
 
-                        not_tabu = exam_neighbor.swapped_exam not in tabu_exams
+                        not_tabu = exam_move.swapped_exam not in tabu_exams
+                        not_visited = exam_move.fingerprint(current_solution) \
+                            not in visited_states
                         aspiration_criterion_met = penalty < absolute_best[1]
 
-                        if not_tabu or aspiration_criterion_met:
-                            current_solution = exam_neighbor
-                            tabu_exams.add(exam_neighbor.swapped_exam)
+                        if not (not_tabu and not_visited):
+                            if not aspiration_criterion_met:
+                                telemetry.tabu_rejections += 1
+                                continue
+
+                            telemetry.aspiration_overrides += 1
+
+                        # The swapped exam schedule changes its attributes
+                        # once the move is applied
+                        tabu_exams.add(exam_move.swapped_exam)
+
+                        with telemetry.time('actions'):
+                            exam_move.apply(current_solution)
 
-                            is_relative_improvement \
-                                = penalty < relative_best[1]
+                        visited_states.add(current_solution.fingerprint)
 
-                            if is_relative_improvement:
-                                exam_context.record_improvement()
-                                relative_best = [exam_neighbor, penalty]
+                        is_relative_improvement \
+                            = penalty < relative_best[1]
 
-                                is_absolute_improvement \
-                                    = penalty < absolute_best[1]
+                        if is_relative_improvement:
+                            exam_context.record_improvement()
+                            relative_best = [
+                                current_solution.copy(),
+                                penalty
+                            ]
 
-                                if is_absolute_improvement:
-                                    block_context.record_improvement()
-                                    absolute_best = [exam_neighbor, penalty]
-                                    logger.log(f"New relative best: {penalty} ***")
-                                else:
-                                    logger.log(f"New relative best: {penalty}")
+                            is_absolute_improvement \
+                                = penalty < absolute_best[1]
 
-                            break
+                            if is_absolute_improvement:
+                                block_context.record_improvement()
+                                absolute_best = list(relative_best)
+                                publisher.offer(*absolute_best)
+                                telemetry.record_best(
+                                    self.budget.elapsed,
+                                    penalty
+                                )
+                                logger.log(f"New relative best: {penalty} ***")
+                            else:
+                                logger.log(f"New relative best: {penalty}")
+
+                        break
 
         logger.brag(absolute_best[1], start_time)
         return tuple(absolute_best)
 
-    def _get_scored_exam_neighbors_of(self, current_solution: Schedule):
-        """Return a list of [exam_neighbor, penalty] lists, sorted
-        by the penalty.
+    def _get_scored_exam_moves_of(self, current_solution: Schedule):
+        """Return a list of [exam_move, penalty] lists, sorted
+        by the penalty the current solution would have after the move.
+
+        The current solution itself is not modified.
         """
-        return sorted(
-            [
-                [neighbor, self.evaluator.penalty(neighbor)]
-                for neighbor in ExamNeighborhood(current_solution)
-            ],
-            key=lambda x: x[1]
-        )
+        current_penalty = self._penalty_of(current_solution)
+
+        with self.telemetry.time('neighborhoods'):
+            neighborhood = ExamNeighborhood(
+                current_solution,
+                evaluator=self.evaluator
+            )
+
+        with self.telemetry.time('evaluator'):
+            scored_moves = [
+                [
+                    move,
+                    move.penalty(
+                        current_solution,
+                        current_penalty,
+                        self.evaluator
+                    )
+                ]
+                for move in neighborhood
+            ]
+
+        self.telemetry.neighbors_generated += len(neighborhood)
+        self.telemetry.neighbors_evaluated += len(neighborhood)
+
+        return sorted(scored_moves, key=lambda x: x[1])
+
+    def _penalty_of(self, schedule: Schedule) -> int:
+        """Return the schedule's penalty as tracked by its conflict index."""
+        return self.evaluator.conflict_index(schedule).total_penalty
 
     def _get_initial_solution(self) -> Schedule:
         """Construct an initial solution that is the base for the search."""
         schedule, _ = RandomAssignment(self.data).run()
         return schedule
+
+
+def _run_tabu_search(
+        data: InputData,
+        evaluator: Evaluator,
+        budget: Optional[SearchBudget],
+        seed: int,
+        incumbents: Optional[Queue] = None,
+        publish_interval: Optional[float] = None,
+        reports: Optional[Queue] = None,
+        progress_interval: Optional[float] = None
+) -> Tuple[Schedule, int]:
+    """Run a single tabu search with the given random seed, and put its
+    incumbents and its progress, labeled with the seed, into the given
+    queues, if any.
+
+    Defined on module level, so that it can be executed by a process pool.
+    """
+    random.seed(seed)
+
+    on_incumbent = None
+    if incumbents is not None:
+        def on_incumbent(schedule, penalty):
+            incumbents.put((schedule, penalty))
+
+    on_progress = None
+    if reports is not None:
+        def on_progress(progress):
+            reports.put((seed, progress))
+
+    return TabuSearch(
+        data,
+        evaluator,
+        budget=budget,
+        on_incumbent=on_incumbent,
+        publish_interval=publish_interval,
+        on_progress=on_progress,
+        progress_interval=progress_interval
+    ).run(verbose=False)
+
+
+class ParallelTabuSearch(BaseAlgorithm):
+    """Runs several independent tabu searches in a pool of processes and
+    returns the best solution found by any of them.
+
+    Each search is seeded differently and thus starts from its own
+    random initial solution. Since the input data is an in-memory
+    snapshot, the processes do not need to access the database.
+
+    Each search gets the full budget. The searches put their incumbents
+    into a queue that is polled every heartbeat_interval seconds, and
+    those that improve on the incumbents of all searches are passed to
+    the on_incumbent callback, at most once per publish_interval.
+
+    Likewise, the progress of all searches is combined and passed to the
+    on_progress callback, at most once per progress_interval: the
+    iterations are summed up, and the penalties are the lowest of all
+    searches. The on_heartbeat callback is called on every poll.
+    """
+
+    def __init__(
+            self,
+            data: InputData,
+            evaluator: Optional[Evaluator] = None,
+            num_searches: Optional[int] = None,
+            seed: Optional[int] = None,
+            budget: Optional[SearchBudget] = None,
+            on_incumbent: Optional[Callable[[Schedule, int], None]] = None,
+            publish_interval: Optional[float] = None,
+            on_progress: Optional[Callable[[SearchProgress], None]] = None,
+            progress_interval: Optional[float] = None,
+            on_heartbeat: Optional[Callable[[], None]] = None,
+            heartbeat_interval: Optional[float] = None
+    ):
+        super().__init__(data, evaluator)
+        self.num_searches = num_searches \
+            or settings.SCHEDULING_PARALLEL_SEARCHES \
+            or os.cpu_count()
+        self.seed = seed
+        self.budget = budget
+        self.on_incumbent = on_incumbent
+        self.publish_interval = publish_interval \
+            if publish_interval is not None \
+            else settings.SCHEDULING_PUBLISH_INTERVAL
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval \
+            if progress_interval is not None \
+            else settings.SCHEDULING_PROGRESS_INTERVAL
+        self.on_heartbeat = on_heartbeat
+        self.heartbeat_interval = heartbeat_interval \
+            if heartbeat_interval is not None \
+            else settings.SCHEDULING_PROGRESS_INTERVAL
+
+    def run(self) -> Tuple[Schedule, int]:
+        evaluator = self.evaluator or Evaluator()
+
+        rng = random.Random(self.seed)
+        seeds = [rng.randrange(2 ** 32) for _ in range(self.num_searches)]
+
+        # Only start a manager process for the queues if they are needed
+        relay = Manager() \
+            if self.on_incumbent is not None or self.on_progress is not None \
+            else nullcontext()
+
+        max_workers = min(self.num_searches, os.cpu_count() or 1)
+        with relay as manager, \
+                ProcessPoolExecutor(max_workers=max_workers) as pool:
+            incumbents = manager.Queue() \
+                if self.on_incumbent is not None else None
+            reports = manager.Queue() \
+                if self.on_progress is not None else None
+            publisher = IncumbentPublisher(
+                self.on_incumbent,
+                self.publish_interval
+            )
+            reporter = ProgressReporter(
+                self.on_progress,
+                self.progress_interval
+            )
+
+            futures = [
+                pool.submit(
+                    _run_tabu_search,
+                    self.data,
+                    evaluator,
+                    self.budget,
+                    seed,
+                    incumbents,
+                    self.publish_interval,
+                    reports,
+                    self.progress_interval
+                )
+                for seed in seeds
+            ]
+
+            best_penalty = math.inf
+            progress_by_seed = {}
+            pending = futures
+            while pending:
+                _, pending = wait(pending, timeout=self.heartbeat_interval)
+
+                while incumbents is not None and not incumbents.empty():
+                    schedule, penalty = incumbents.get()
+
+                    if penalty < best_penalty:
+                        best_penalty = penalty
+                        publisher.offer(schedule, penalty)
+
+                publisher.poll()
+
+                while reports is not None and not reports.empty():
+                    seed, progress = reports.get()
+                    progress_by_seed[seed] = progress
+
+                if progress_by_seed and reporter.due():
+                    reporter.report(
+                        self._combine(progress_by_seed.values())
+                    )
+
+                if self.on_heartbeat is not None:
+                    self.on_heartbeat()
+
+            results = [future.result() for future in futures]
+
+        return min(results, key=lambda result: result[1])
+
+    @staticmethod
+    def _combine(reports: Iterable[SearchProgress]) -> SearchProgress:
+        """Return the progress of all searches as that of one search."""
+        reports = list(reports)
+
+        return SearchProgress(
+            iterations=sum(report.iterations for report in reports),
+            current_penalty=min(report.current_penalty for report in reports),
+            best_penalty=min(report.best_penalty for report in reports),
+            elapsed=max(report.elapsed for report in reports)
+        )
@@ -0,0 +1,14 @@
+"""
+Micro-benchmarks of the scheduling hot paths.
+
+The benchmarks run on in-memory schedules of increasing size and never
+touch the database, so they work offline with the test settings. Since
+their module names do not match the test file patterns, they are not
+part of the regular test run and must be selected explicitly:
+
+    pytest schedule/scheduling/benchmarks/bench_scheduling.py
+
+The timings are written as JSON to the file given by the
+BENCHMARK_OUTPUT environment variable, or to benchmark-results.json in
+the working directory otherwise.
+"""
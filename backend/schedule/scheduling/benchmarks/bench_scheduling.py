@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from schedule.scheduling.algorithms.tabu_search import (
+    Actions,
+    BlockNeighborhood,
+    ExamNeighborhood,
+    TabuSearch,
+)
+from schedule.scheduling.caches import EvaluationCache
+from schedule.scheduling.evaluators import BruteForce, Evaluator
+
+from schedule.scheduling.benchmarks.schedules import (
+    SIZES,
+    benchmark_input_data,
+    benchmark_schedule,
+    block_swap_indices,
+    exam_swap_indices,
+)
+
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: size.name)
+def size(request):
+    return request.param
+
+
+@pytest.fixture
+def schedule(size):
+    random.seed(0)
+    return benchmark_schedule(size)
+
+
+@pytest.fixture
+def evaluator():
+    """Return an evaluator that does not cache penalties, so that
+    repeated calls are not served from the cache.
+    """
+    return Evaluator(cache=EvaluationCache(max_entries=0))
+
+
+def test_evaluator_penalty(measure, size, schedule, evaluator):
+    measure('evaluator_penalty', size, lambda: evaluator.penalty(schedule))
+
+
+def test_brute_force_conflict_search(measure, size, schedule):
+    search = BruteForce()
+
+    measure(
+        'brute_force_run',
+        size,
+        lambda: search.run(schedule.group_by_student())
+    )
+
+
+def test_exam_swap(measure, size, schedule):
+    actions = Actions()
+    indices = exam_swap_indices(schedule)
+
+    measure('swap_exams', size, lambda: actions.swap_exams(schedule, indices))
+
+
+def test_block_swap(measure, size, schedule):
+    actions = Actions()
+    indices = block_swap_indices(schedule)
+
+    measure(
+        'swap_blocks',
+        size,
+        lambda: actions.swap_blocks(schedule, indices)
+    )
+
+
+def test_exam_neighborhood(measure, size, schedule, evaluator):
+    evaluator.conflict_index(schedule)
+
+    measure(
+        'exam_neighborhood',
+        size,
+        lambda: ExamNeighborhood(schedule, evaluator=evaluator)
+    )
+
+
+def test_block_neighborhood(measure, size, schedule, evaluator):
+    evaluator.conflict_index(schedule)
+
+    measure(
+        'block_neighborhood',
+        size,
+        lambda: BlockNeighborhood(schedule, evaluator=evaluator)
+    )
+
+
+def test_tabu_search_iteration(measure, size, schedule, evaluator):
+    search = TabuSearch(benchmark_input_data(schedule), evaluator)
+    evaluator.conflict_index(schedule)
+
+    def iteration():
+        """Score the exam neighbors and apply the best move. The move
+        is undone, so that every iteration starts from the same schedule.
+        """
+        scored_moves = search._get_scored_exam_moves_of(schedule)
+        move, _ = scored_moves[0]
+        move.apply(schedule)
+        move.undo(schedule)
+
+    measure('tabu_search_iteration', size, iteration)
@@ -0,0 +1,80 @@
+from datetime import datetime
+import json
+import os
+import platform
+from statistics import median
+import subprocess
+import timeit
+
+import pytest
+
+
+REPEAT = 5
+
+
+def _commit():
+    """Return the current git commit, or None outside of a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@pytest.fixture(scope='session')
+def benchmark_results():
+    """Collect the results of all benchmarks and write them as JSON once
+    the session is over.
+    """
+    results = []
+
+    yield results
+
+    path = os.environ.get('BENCHMARK_OUTPUT', 'benchmark-results.json')
+    with open(path, 'w') as file:
+        json.dump(
+            {
+                'created': datetime.now().isoformat(),
+                'commit': _commit(),
+                'python': platform.python_version(),
+                'results': results,
+            },
+            file,
+            indent=2
+        )
+
+
+@pytest.fixture
+def measure(benchmark_results):
+    """Return a function that times a callable and records the result.
+
+    The callable is run as often as needed to take at least 0.2 seconds,
+    and this is repeated several times. The best and the median time
+    per call are recorded.
+    """
+    def time_call(name, size, func):
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        per_call = [
+            total / number
+            for total in timer.repeat(repeat=REPEAT, number=number)
+        ]
+
+        result = {
+            'benchmark': name,
+            'size': size.name,
+            'num_students': size.num_students,
+            'exams_per_student': size.exams_per_student,
+            'exams_per_block': size.exams_per_block,
+            'calls': number * REPEAT,
+            'best': min(per_call),
+            'median': median(per_call),
+        }
+        benchmark_results.append(result)
+        return result
+
+    return time_call
@@ -0,0 +1,195 @@
+"""
+Generation of in-memory schedules and input data for the benchmarks.
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import random
+from typing import List, Tuple
+
+from exam.models import Module, Student
+from staff.models import Assessor
+
+from ..input_collectors import AssessorWorkload, InputData
+from ..schedule import Schedule, BlockSchedule, ExamSchedule, TimeFrame
+from ..types import SlotId
+
+
+EXAM_LENGTH = 30
+SLOT_HOURS = (9, 14)
+
+
+@dataclass(frozen=True)
+class ScheduleSize:
+    """The parameters of a generated benchmark schedule."""
+    name: str
+    num_students: int
+    exams_per_student: int
+    exams_per_block: int
+
+    @property
+    def num_modules(self) -> int:
+        return 2 * self.exams_per_student
+
+
+SIZES = [
+    ScheduleSize('small', num_students=50, exams_per_student=3,
+                 exams_per_block=5),
+    ScheduleSize('medium', num_students=200, exams_per_student=4,
+                 exams_per_block=6),
+    ScheduleSize('large', num_students=800, exams_per_student=5,
+                 exams_per_block=8),
+]
+
+
+def slot_start(slot: SlotId) -> datetime:
+    """Return the start time of the slot, with two slots per day."""
+    day, part = divmod(slot, len(SLOT_HOURS))
+    return datetime(2022, 1, 3, SLOT_HOURS[part]) + timedelta(days=day)
+
+
+def benchmark_schedule(size: ScheduleSize, seed: int = 0) -> Schedule:
+    """Return a schedule of the given size with random conflicts.
+
+    Each module has its own assessor and every student takes a random
+    selection of modules. The exams of a module are split into full
+    blocks, which are scheduled in distinct random slots, so that
+    every assessor has blocks to swap.
+    """
+    rng = random.Random(seed)
+
+    modules = [
+        Module(id=i + 1, code=f'M{i + 1}')
+        for i in range(size.num_modules)
+    ]
+    assessors = [
+        Assessor(id=i + 1, email=f'assessor{i + 1}@example.com')
+        for i in range(size.num_modules)
+    ]
+
+    students_by_module = defaultdict(list)
+    for i in range(size.num_students):
+        student = Student(id=i + 1, email=f'student{i + 1}@example.com')
+
+        for module in rng.sample(range(size.num_modules),
+                                 size.exams_per_student):
+            students_by_module[module].append(student)
+
+    chunks_by_module = {
+        module: [
+            students[i:i + size.exams_per_block]
+            for i in range(0, len(students), size.exams_per_block)
+        ]
+        for module, students in students_by_module.items()
+    }
+    num_slots = 2 * max(len(chunks) for chunks in chunks_by_module.values())
+
+    schedule = Schedule()
+    for module, chunks in chunks_by_module.items():
+        slots = rng.sample(range(num_slots), len(chunks))
+
+        for slot, students in zip(slots, chunks):
+            schedule[slot].append(
+                _block(slot, modules[module], assessors[module], students,
+                       size.exams_per_block)
+            )
+
+    return schedule
+
+
+def _block(
+        slot: SlotId,
+        module: Module,
+        assessor: Assessor,
+        students: List[Student],
+        exams_per_block: int
+) -> BlockSchedule:
+    """Return a block of the module's exams of the given students."""
+    start_time = slot_start(slot)
+    delta = timedelta(minutes=EXAM_LENGTH)
+
+    return BlockSchedule(
+        assessor=assessor,
+        start_time=start_time,
+        exam_start_times=[
+            i * EXAM_LENGTH for i in range(exams_per_block)
+        ],
+        exam_length=EXAM_LENGTH,
+        exams=[
+            ExamSchedule(
+                exam_code=f'{module.code}-{student.id}',
+                module=module,
+                assessor=assessor,
+                position=i,
+                student=student,
+                time_frame=TimeFrame(
+                    start_time + i * delta,
+                    start_time + (i + 1) * delta
+                )
+            )
+            for i, student in enumerate(students)
+        ]
+    )
+
+
+def exam_swap_indices(
+        schedule: Schedule
+) -> List[Tuple[SlotId, int, int]]:
+    """Return the indices of two exams of the same module in different
+    blocks, as swapped by the exam neighborhood.
+    """
+    index = schedule.index
+
+    for codes in index.exam_groups.values():
+        positions = [index.exam_positions[code] for code in codes]
+
+        for position in positions[1:]:
+            if position[:2] != positions[0][:2]:
+                return [positions[0], position]
+
+
+def block_swap_indices(schedule: Schedule) -> List[Tuple[SlotId, int]]:
+    """Return the indices of two blocks of the same assessor, as swapped
+    by the block neighborhood.
+    """
+    for blocks in schedule.index.assessor_blocks.values():
+        indices = [
+            (slot, i)
+            for slot, positions in blocks.items()
+            for i in positions
+        ]
+
+        if len(indices) > 1:
+            return indices[:2]
+
+
+def benchmark_input_data(schedule: Schedule) -> InputData:
+    """Return input data that merely lists the schedule's assessors,
+    which suffices to set up a search on the schedule.
+    """
+    blocks_by_assessor = Counter(
+        block.assessor
+        for blocks in schedule.values()
+        for block in blocks
+    )
+
+    workload = AssessorWorkload()
+    for assessor, count in blocks_by_assessor.items():
+        workload[assessor] = {EXAM_LENGTH: count}
+
+    return InputData(
+        window=None,
+        exams=[],
+        modules=[],
+        assessors=list(workload),
+        assessor_workload=workload,
+        helpers=[],
+        staff_avails={},
+        block_slots=[],
+        block_templates=[],
+        total_num_blocks=schedule.total_blocks_scheduled,
+        slots_by_id={},
+        templates_by_length={},
+        exams_by_assessor_and_length={},
+        availability=None,
+    )
@@ -0,0 +1,122 @@
+"""
+Bounded caching of evaluation results.
+"""
+from collections import OrderedDict
+import sys
+from typing import Any, Dict, Hashable, Optional
+
+
+def _size_of(obj: Any) -> int:
+    """Return the approximate memory size of the object in bytes,
+    including the items of flat containers.
+    """
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(
+            sys.getsizeof(key) + sys.getsizeof(value)
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in obj)
+
+    return size
+
+
+class EvaluationCache:
+    """A least-recently-used cache of evaluation results, keyed by
+    schedule fingerprints rather than by the schedules themselves.
+
+    The cache is bounded by its number of entries as well as by the
+    approximate memory its keys and values take up. Whenever either
+    bound is exceeded, the least recently used entries are evicted.
+
+    Hits and misses are counted, so that the benefit of caching can be
+    checked for real runs.
+    """
+
+    def __init__(
+            self,
+            max_entries: Optional[int] = 1024,
+            max_bytes: Optional[int] = None
+    ):
+        """
+        :param max_entries: the maximum number of entries, or None for
+            no limit
+        :param max_bytes: the maximum approximate memory in bytes, or
+            None for no limit
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value cached for the key, or None if there is none."""
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        value, _ = entry
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache the value for the key and evict entries as needed."""
+        if key in self._entries:
+            _, size = self._entries.pop(key)
+            self.bytes -= size
+
+        size = _size_of(key) + _size_of(value)
+        self._entries[key] = (value, size)
+        self.bytes += size
+
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove all entries, but keep the counters."""
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters and its current size."""
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else None,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+        }
+
+    def _evict(self) -> None:
+        """Evict the least recently used entries until the cache is
+        within its bounds again.
+        """
+        while self._entries and self._exceeded():
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def _exceeded(self) -> bool:
+        if self.max_entries is not None \
+                and len(self._entries) > self.max_entries:
+            return True
+
+        return self.max_bytes is not None and self.bytes > self.max_bytes
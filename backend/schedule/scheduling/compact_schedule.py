@@ -0,0 +1,268 @@
+"""
+Integer-indexed schedule specification backed by NumPy arrays.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, tzinfo
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from exam.models import Student, Module
+from staff.models import Assessor, Helper
+
+from .schedule import Schedule, BlockSchedule, ExamSchedule, TimeFrame
+
+
+EPOCH = datetime(1970, 1, 1)
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(time: datetime) -> int:
+    """Return the number of minutes between the epoch and the given
+    time's wall-clock representation.
+
+    The time zone is ignored, so that integer division by the minutes
+    per day yields the same dates as the datetime object itself.
+    """
+    return int((time.replace(tzinfo=None) - EPOCH).total_seconds() // 60)
+
+
+def from_minutes(minutes: int, tz: Optional[tzinfo] = None) -> datetime:
+    """Inverse of to_minutes."""
+    return (EPOCH + timedelta(minutes=int(minutes))).replace(tzinfo=tz)
+
+
+@dataclass
+class CompactLookup:
+    """Static information about the exams and blocks of a compact
+    schedule that does not change during the search.
+
+    All copies of a compact schedule share the same lookup.
+    """
+    exam_codes: List[str]
+    modules: List[Module]
+    assessors: List[Assessor]
+    students: Dict[int, Student]
+    block_assessors: List[Assessor]
+    block_exam_start_times: List[List[int]]
+    block_helpers: List[Optional[Helper]]
+    tz: Optional[tzinfo]
+
+
+class CompactSchedule:
+    """Represents a complete window schedule as a set of integer arrays.
+
+    Exams and blocks are identified by their index. The arrays map
+
+    *  exam_students: exam -> student id
+    *  exam_starts: exam -> start time in minutes (see to_minutes)
+    *  exam_blocks: exam -> block
+    *  exam_positions: exam -> position within its block
+    *  block_slots: block -> slot id
+    *  block_starts: block -> start time in minutes
+    *  block_lengths: block -> exam length in minutes
+
+    Copying, hashing and comparing compact schedules only touches
+    these arrays instead of traversing Python objects.
+    """
+
+    def __init__(
+            self,
+            exam_students: np.ndarray,
+            exam_starts: np.ndarray,
+            exam_blocks: np.ndarray,
+            exam_positions: np.ndarray,
+            block_slots: np.ndarray,
+            block_starts: np.ndarray,
+            block_lengths: np.ndarray,
+            lookup: CompactLookup,
+    ):
+        self.exam_students = exam_students
+        self.exam_starts = exam_starts
+        self.exam_blocks = exam_blocks
+        self.exam_positions = exam_positions
+        self.block_slots = block_slots
+        self.block_starts = block_starts
+        self.block_lengths = block_lengths
+        self.lookup = lookup
+
+    def __hash__(self):
+        return hash(self._arrays_as_bytes())
+
+    def __eq__(self, other):
+        return self._arrays_as_bytes() == other._arrays_as_bytes()
+
+    def __len__(self):
+        return len(self.exam_students)
+
+    @classmethod
+    def from_schedule(cls, schedule: Schedule) -> CompactSchedule:
+        """Return the compact representation of a complete schedule.
+
+        All blocks need to have a start time and exam length, i.e.,
+        the schedule needs to be the output of a planning algorithm.
+        """
+        exam_codes, modules, assessors, students = [], [], [], {}
+        exam_students, exam_starts, exam_blocks, exam_positions = \
+            [], [], [], []
+        block_slots, block_starts, block_lengths = [], [], []
+        block_assessors, block_exam_start_times, block_helpers = [], [], []
+        tz = None
+
+        for slot, blocks in schedule.items():
+            for block in blocks:
+                if block.start_time is None or block.exam_length is None:
+                    raise ValueError(
+                        'Only blocks with start time and exam length '
+                        'can be represented in a compact schedule'
+                    )
+
+                block_index = len(block_slots)
+                tz = block.start_time.tzinfo
+
+                block_slots.append(slot)
+                block_starts.append(to_minutes(block.start_time))
+                block_lengths.append(block.exam_length)
+                block_assessors.append(block.assessor)
+                block_exam_start_times.append(list(block.exam_start_times))
+                block_helpers.append(block.helper)
+
+                for exam in block.exams:
+                    exam_codes.append(exam.exam_code)
+                    modules.append(exam.module)
+                    assessors.append(exam.assessor)
+                    students[exam.student.id] = exam.student
+
+                    exam_students.append(exam.student.id)
+                    exam_starts.append(to_minutes(exam.time_frame.start_time))
+                    exam_blocks.append(block_index)
+                    exam_positions.append(exam.position)
+
+        lookup = CompactLookup(
+            exam_codes=exam_codes,
+            modules=modules,
+            assessors=assessors,
+            students=students,
+            block_assessors=block_assessors,
+            block_exam_start_times=block_exam_start_times,
+            block_helpers=block_helpers,
+            tz=tz,
+        )
+
+        return cls(
+            exam_students=np.array(exam_students, dtype=np.int64),
+            exam_starts=np.array(exam_starts, dtype=np.int64),
+            exam_blocks=np.array(exam_blocks, dtype=np.int64),
+            exam_positions=np.array(exam_positions, dtype=np.int64),
+            block_slots=np.array(block_slots, dtype=np.int64),
+            block_starts=np.array(block_starts, dtype=np.int64),
+            block_lengths=np.array(block_lengths, dtype=np.int64),
+            lookup=lookup,
+        )
+
+    def to_schedule(self) -> Schedule:
+        """Return the equivalent Schedule instance."""
+        schedule = Schedule()
+        exams_by_block = [[] for _ in range(len(self.block_slots))]
+
+        for exam in range(len(self)):
+            start_time = from_minutes(self.exam_starts[exam], self.lookup.tz)
+            end_time = start_time + timedelta(
+                minutes=int(self.block_lengths[self.exam_blocks[exam]])
+            )
+            exams_by_block[self.exam_blocks[exam]].append(
+                ExamSchedule(
+                    exam_code=self.lookup.exam_codes[exam],
+                    module=self.lookup.modules[exam],
+                    assessor=self.lookup.assessors[exam],
+                    position=int(self.exam_positions[exam]),
+                    student=self.lookup.students[self.exam_students[exam]],
+                    time_frame=TimeFrame(start_time, end_time),
+                )
+            )
+
+        for block, exams in enumerate(exams_by_block):
+            exams.sort(key=lambda _exam: _exam.position)
+            schedule[int(self.block_slots[block])] += [
+                BlockSchedule(
+                    assessor=self.lookup.block_assessors[block],
+                    start_time=from_minutes(
+                        self.block_starts[block],
+                        self.lookup.tz
+                    ),
+                    exam_start_times=list(
+                        self.lookup.block_exam_start_times[block]
+                    ),
+                    exam_length=int(self.block_lengths[block]),
+                    exams=exams,
+                    helper=self.lookup.block_helpers[block],
+                )
+            ]
+
+        return schedule
+
+    def copy(self) -> CompactSchedule:
+        """Return a copy with its own arrays and a shared lookup."""
+        return CompactSchedule(
+            exam_students=self.exam_students.copy(),
+            exam_starts=self.exam_starts.copy(),
+            exam_blocks=self.exam_blocks.copy(),
+            exam_positions=self.exam_positions.copy(),
+            block_slots=self.block_slots.copy(),
+            block_starts=self.block_starts.copy(),
+            block_lengths=self.block_lengths.copy(),
+            lookup=self.lookup,
+        )
+
+    @property
+    def exam_ends(self) -> np.ndarray:
+        """Return the end times of all exams in minutes."""
+        return self.exam_starts + self.block_lengths[self.exam_blocks]
+
+    def swap_exams(self, first: int, second: int) -> None:
+        """Swap the time frames, blocks and positions of the two exams
+        in place.
+        """
+        for array in [self.exam_starts, self.exam_blocks, self.exam_positions]:
+            array[[first, second]] = array[[second, first]]
+
+    def swap_blocks(self, first: int, second: int) -> None:
+        """Swap the slots and start times of the two blocks in place and
+        move their exams accordingly.
+        """
+        delta = self.block_starts[second] - self.block_starts[first]
+
+        first_exams = self.exam_blocks == first
+        second_exams = self.exam_blocks == second
+        self.exam_starts[first_exams] += delta
+        self.exam_starts[second_exams] -= delta
+
+        for array in [self.block_slots, self.block_starts]:
+            array[[first, second]] = array[[second, first]]
+
+    def timelines(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the (student ids, start times, end times) of all exams,
+        sorted by student and start time.
+        """
+        order = np.lexsort((self.exam_starts, self.exam_students))
+        return (
+            self.exam_students[order],
+            self.exam_starts[order],
+            self.exam_ends[order],
+        )
+
+    def _arrays_as_bytes(self) -> bytes:
+        return b''.join(
+            array.tobytes()
+            for array in [
+                self.exam_students,
+                self.exam_starts,
+                self.exam_blocks,
+                self.exam_positions,
+                self.block_slots,
+                self.block_starts,
+                self.block_lengths,
+            ]
+        )
@@ -1,21 +1,34 @@
 """
 Feasibility and quality evaluation of schedules.
 """
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from functools import lru_cache
+from datetime import timedelta
+from heapq import heapify, heappop, heappush
 from pprint import pprint
-from typing import List, Optional, Dict, Tuple
+from typing import Hashable, Iterable, List, Optional, Dict, Tuple
 
+from django.conf import settings
 from django.db.models import QuerySet
+import numpy as np
 
 from exam.models import Exam, Student
 from schedule.models import BlockSlot
 from staff.models import Assessor, Helper
 
-from .schedule import Schedule, ExamSchedule, BlockSchedule
+from .caches import EvaluationCache
+from .compact_schedule import CompactSchedule, to_minutes, MINUTES_PER_DAY
+from .schedule import (
+    Schedule,
+    ExamSchedule,
+    BlockSchedule,
+    TimeFrame,
+    MINIMAL_DESIRABLE_BREAK,
+)
 from .input_collectors import InputData
-from .types import ExamId
+from .types import ExamId, SlotId
 
 
 class ConflictDegree:
@@ -48,6 +61,27 @@ class Conflict:
         return f"<{first} vs. {second}>"
 
 
+def conflict_category(first: TimeFrame, second: TimeFrame) -> Optional[int]:
+    """If the time frames conflict, return the category of the conflict.
+    Else, return None.
+
+    The first time frame must not start after the second one.
+    """
+    if first.overlaps_with(second):
+        return ConflictDegree.FIRST_ORDER
+
+    if first.shortly_followed_by(second):
+        return ConflictDegree.SHORTLY_FOLLOWED
+
+    if first.same_day_as(second):
+        return ConflictDegree.SAME_DAY
+
+    if first.on_consecutive_days(second):
+        return ConflictDegree.CONSECUTIVE_DAYS
+
+    return None
+
+
 class ConflictSearch(ABC):
     """Defines an interface for conflict search algorithms."""
 
@@ -106,20 +140,316 @@ class BruteForce(ConflictSearch):
         """If a conflict is found between the exam schedules, return the
         category of the conflict. Else, return None.
         """
-        if first.time_frame.overlaps_with(second.time_frame):
-            return ConflictDegree.FIRST_ORDER
+        return conflict_category(first.time_frame, second.time_frame)
+
+
+class VectorizedSearch(ConflictSearch):
+    """NumPy-based algorithm to find conflicting time frames.
+
+    All exams are arranged in arrays of start and end minutes, sorted by
+    student and start time, so that every pair of a student's exams is
+    categorized in batch rather than one by one.
+
+    The conflicts found are the same as with the BruteForce search,
+    in the same order.
+    """
+
+    def run(
+            self,
+            by_student: Dict[Student, List[ExamSchedule]],
+    ) -> Dict[Student, Dict[int, List[Conflict]]]:
+        conflicts = defaultdict(lambda: defaultdict(list))
+
+        students = list(by_student.keys())
+        exams = [exam for student in students for exam in by_student[student]]
+
+        if not exams:
+            return conflicts
+
+        owners = np.repeat(
+            np.arange(len(students)),
+            [len(by_student[student]) for student in students]
+        )
+        starts = np.array(
+            [to_minutes(exam.time_frame.start_time) for exam in exams]
+        )
+        ends = np.array(
+            [to_minutes(exam.time_frame.end_time) for exam in exams]
+        )
+
+        # Sorting by original index last keeps the sort stable, just like
+        # the list sort of the BruteForce search
+        order = np.lexsort((np.arange(len(exams)), starts, owners))
+
+        firsts, seconds, categories = self.conflicting_pairs(
+            owners[order],
+            starts[order],
+            ends[order]
+        )
+
+        for first, second, category in zip(
+                order[firsts],
+                order[seconds],
+                categories
+        ):
+            conflicts[students[owners[first]]][int(category)].append(
+                Conflict(
+                    exams=[exams[first], exams[second]],
+                )
+            )
+
+        return conflicts
+
+    @staticmethod
+    def conflicting_pairs(
+            owners: np.ndarray,
+            starts: np.ndarray,
+            ends: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the (first, second, category) arrays of all conflicting
+        pairs of exams.
+
+        The given arrays of student ids and start and end minutes must be
+        sorted by student and start time. The returned pairs are indices
+        into these arrays, ordered by first and then by second index.
+        """
+        firsts, seconds = [], []
+
+        # Since each student's exams are contiguous, there are no pairs
+        # of the same student for any offset once there are none for
+        # a smaller offset.
+        for offset in range(1, len(owners)):
+            same_student = owners[:-offset] == owners[offset:]
+            if not same_student.any():
+                break
+
+            indices = np.flatnonzero(same_student)
+            firsts.append(indices)
+            seconds.append(indices + offset)
+
+        if not firsts:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, empty
+
+        first = np.concatenate(firsts)
+        second = np.concatenate(seconds)
+
+        minimal_break = MINIMAL_DESIRABLE_BREAK.total_seconds() // 60
+        first_day = starts[first] // MINUTES_PER_DAY
+        second_day = starts[second] // MINUTES_PER_DAY
+
+        categories = np.select(
+            [
+                (starts[first] < ends[second]) & (starts[second] < ends[first]),
+                (ends[first] <= starts[second])
+                & (starts[second] - ends[first] < minimal_break),
+                first_day == second_day,
+                np.abs(first_day - second_day) == 1,
+            ],
+            ConflictDegree.choices,
+            default=-1
+        )
+
+        is_conflict = categories >= 0
+        first, second = first[is_conflict], second[is_conflict]
+        categories = categories[is_conflict]
+
+        order = np.lexsort((second, first))
+        return first[order], second[order], categories[order]
+
+
+TimelineEntry = Tuple[TimeFrame, str]
+BlockPosition = Tuple[SlotId, int]
+
+
+class PenaltyHeap:
+    """Max-heap of positive penalties by key, whose penalties can be
+    changed at any time.
+
+    Outdated heap entries are not removed when a penalty changes, but
+    skipped once they reach the top. The heap is rebuilt as soon as
+    outdated entries make up the majority.
+    """
+
+    def __init__(self):
+        self.penalties = {}
+        self._entries = []
+        self._latest = {}
+        self._counter = 0
 
-        if first.time_frame.shortly_followed_by(second.time_frame):
-            return ConflictDegree.SHORTLY_FOLLOWED
+    def __getitem__(self, key: Hashable) -> int:
+        return self.penalties.get(key, 0)
 
-        if first.time_frame.same_day_as(second.time_frame):
-            return ConflictDegree.SAME_DAY
+    def __setitem__(self, key: Hashable, penalty: int) -> None:
+        if penalty <= 0:
+            self.penalties.pop(key, None)
+            self._latest.pop(key, None)
+            return
 
-        if first.time_frame.on_consecutive_days(second.time_frame):
-            return ConflictDegree.CONSECUTIVE_DAYS
+        self._counter += 1
+        self.penalties[key] = penalty
+        self._latest[key] = self._counter
+        heappush(self._entries, (-penalty, self._counter, key))
+
+        if len(self._entries) > 2 * len(self.penalties) + 64:
+            self._rebuild()
+
+    def top(self) -> Optional[Hashable]:
+        """Return the key with the highest penalty, or None if there is
+        no positive penalty.
+
+        Among equal penalties, the one that was set first wins.
+        """
+        while self._entries:
+            _, counter, key = self._entries[0]
+
+            if self._latest.get(key) == counter:
+                return key
+
+            heappop(self._entries)
 
         return None
 
+    def copy(self) -> PenaltyHeap:
+        heap = PenaltyHeap()
+        heap.penalties = dict(self.penalties)
+        heap._entries = list(self._entries)
+        heap._latest = dict(self._latest)
+        heap._counter = self._counter
+        return heap
+
+    def _rebuild(self) -> None:
+        self._entries = [
+            (-penalty, self._latest[key], key)
+            for key, penalty in self.penalties.items()
+        ]
+        heapify(self._entries)
+
+
+class ConflictIndex:
+    """Per-student conflict penalties of a schedule, which are kept up to
+    date while the search algorithm moves exams and blocks around:
+
+    *  timelines: student -> (time frame, exam code) entries sorted by time
+    *  exam_penalties: exam code -> penalty of the conflicts it is part of
+    *  student_penalties: heap of the students' total penalties
+    *  block_penalties: heap of the blocks' penalties, keyed by
+       (slot id, block position)
+
+    Each conflict punishes both exams involved, so a block's penalty is
+    the sum of its exams' penalties. Time frames are copied, since
+    block swaps change the schedule's time frames in place.
+    """
+
+    def __init__(
+            self,
+            penalties: List[int],
+            student_exams: Dict[Student, List[str]]
+    ):
+        self.penalties = penalties
+        self.student_exams = student_exams
+        self.timelines: Dict[Student, List[TimelineEntry]] = {}
+        self.exam_penalties: Dict[str, int] = {}
+        self.exam_blocks: Dict[str, BlockPosition] = {}
+        self.student_penalties = PenaltyHeap()
+        self.block_penalties = PenaltyHeap()
+        self.total_penalty = 0
+
+        self._degree_penalties = dict(zip(ConflictDegree.choices, penalties))
+
+    @classmethod
+    def of(cls, schedule: Schedule, penalties: List[int]) -> ConflictIndex:
+        """Return the conflict index of the given schedule."""
+        student_exams = {
+            student: [exam.exam_code for exam in exams]
+            for student, exams in schedule.group_by_student().items()
+        }
+        index = cls(penalties, student_exams)
+        index.update(schedule, student_exams)
+        return index
+
+    def copy(self) -> ConflictIndex:
+        """Return a copy that can be updated independently.
+
+        Timelines are replaced rather than modified on updates, so they
+        are shared with the copy, just like the students' exam codes.
+        """
+        index = ConflictIndex(self.penalties, self.student_exams)
+        index.timelines = dict(self.timelines)
+        index.exam_penalties = dict(self.exam_penalties)
+        index.exam_blocks = dict(self.exam_blocks)
+        index.student_penalties = self.student_penalties.copy()
+        index.block_penalties = self.block_penalties.copy()
+        index.total_penalty = self.total_penalty
+        return index
+
+    def update(self, schedule: Schedule, students: Iterable[Student]) -> None:
+        """Evaluate the timelines of the given students again after their
+        exams have been moved.
+
+        All students with exams whose block positions have changed must
+        be included.
+        """
+        positions = schedule.index.exam_positions
+        block_deltas = defaultdict(int)
+
+        for student in students:
+            timeline = []
+            for exam_code in self.student_exams[student]:
+                slot, i, j = positions[exam_code]
+                time_frame = schedule[slot][i].exams[j].time_frame
+                timeline.append(
+                    (
+                        TimeFrame(time_frame.start_time, time_frame.end_time),
+                        exam_code
+                    )
+                )
+
+            timeline.sort(key=lambda entry: entry[0].start_time)
+            self.timelines[student] = timeline
+
+            penalty, exam_penalties = self.penalties_of(timeline)
+            self.total_penalty += penalty - self.student_penalties[student]
+            self.student_penalties[student] = penalty
+
+            for exam_code, exam_penalty in exam_penalties.items():
+                if exam_code in self.exam_blocks:
+                    block_deltas[self.exam_blocks[exam_code]] \
+                        -= self.exam_penalties[exam_code]
+
+                block = positions[exam_code][:2]
+                block_deltas[block] += exam_penalty
+                self.exam_blocks[exam_code] = block
+                self.exam_penalties[exam_code] = exam_penalty
+
+        for block, delta in block_deltas.items():
+            if delta:
+                self.block_penalties[block] += delta
+
+    def penalties_of(
+            self,
+            timeline: List[TimelineEntry]
+    ) -> Tuple[int, Dict[str, int]]:
+        """Return the total penalty of a sorted timeline and the penalty
+        of each of its exams.
+        """
+        total = 0
+        exam_penalties = {exam_code: 0 for _, exam_code in timeline}
+
+        for i, (first, first_code) in enumerate(timeline[:-1]):
+            for second, second_code in timeline[i + 1:]:
+                category = conflict_category(first, second)
+
+                if category is None:
+                    continue
+
+                penalty = self._degree_penalties[category]
+                total += penalty
+                exam_penalties[first_code] += penalty
+                exam_penalties[second_code] += penalty
+
+        return total, exam_penalties
+
 
 class ValidationError(BaseException):
     """Raised if given input data does not allow for a feasible schedule."""
@@ -145,8 +475,16 @@ class Evaluator:
 
     penalties = [penalty_0, penalty_1, penalty_2, penalty_3]
 
-    def __init__(self, conflict_search: Optional[ConflictSearch] = None):
+    def __init__(
+            self,
+            conflict_search: Optional[ConflictSearch] = None,
+            cache: Optional[EvaluationCache] = None
+    ):
         self.conflict_search = conflict_search or BruteForce()
+        self.cache = cache if cache is not None else EvaluationCache(
+            max_entries=settings.SCHEDULING_EVALUATION_CACHE_SIZE,
+            max_bytes=settings.SCHEDULING_EVALUATION_CACHE_BYTES
+        )
 
     def conflicts(
             self,
@@ -161,19 +499,168 @@ class Evaluator:
     def penalty(self, schedule: Schedule) -> int:
         """Return the penalty value (the value of the objective function)
         for a given schedule.
+
+        Penalties are cached by the schedule's fingerprint, so that the
+        cache does not keep any schedules alive.
         """
-        penalties = self._penalties_by_student(schedule)
-        return sum([penalty for _, penalty in penalties])
+        penalty = self.cache.get(schedule.fingerprint)
+
+        if penalty is None:
+            penalty = self._full_penalty(schedule)
+            self.cache.put(schedule.fingerprint, penalty)
+
+        return penalty
+
+    def _full_penalty(self, schedule: Schedule) -> int:
+        """Evaluate all exams of a schedule at once on its compact
+        representation.
+
+        Schedules with blocks that are not planned yet cannot be
+        represented compactly, so their conflicts are counted instead.
+        """
+        try:
+            compact = CompactSchedule.from_schedule(schedule)
+        except ValueError:
+            return sum([
+                self._total_penalty(conf)
+                for conf in self.conflicts(schedule).values()
+            ])
+
+        _, _, categories = VectorizedSearch.conflicting_pairs(
+            *compact.timelines()
+        )
+        counts = np.bincount(categories, minlength=len(self.penalties))
+
+        return int(np.dot(counts, self.penalties))
+
+    def penalty_after_exam_swap(
+            self,
+            schedule: Schedule,
+            penalty: int,
+            first: ExamSchedule,
+            second: ExamSchedule
+    ) -> int:
+        """Return the penalty of the schedule that results from swapping
+        the two given exams of a schedule with the given penalty.
+
+        A swap only changes the timelines of the two students involved,
+        so only those students are evaluated again instead of the
+        entire schedule.
+        """
+        if first.student == second.student:
+            return penalty
+
+        index = self.conflict_index(schedule)
+
+        for exam, other in [(first, second), (second, first)]:
+            swapped_timeline = sorted(
+                [
+                    (other.time_frame, exam_code)
+                    if exam_code == exam.exam_code else (time_frame, exam_code)
+                    for time_frame, exam_code in index.timelines[exam.student]
+                ],
+                key=lambda entry: entry[0].start_time
+            )
+            swapped_penalty, _ = index.penalties_of(swapped_timeline)
+
+            penalty -= index.student_penalties[exam.student]
+            penalty += swapped_penalty
+
+        return penalty
+
+    def penalty_after_block_swap(
+            self,
+            schedule: Schedule,
+            penalty: int,
+            first: BlockSchedule,
+            second: BlockSchedule
+    ) -> int:
+        """Return the penalty of the schedule that results from swapping
+        the start times of the two given blocks of a schedule with the
+        given penalty.
+
+        A swap only changes the time frames of the two blocks' exams,
+        so only the students of these exams are evaluated again.
+        """
+        index = self.conflict_index(schedule)
+        time_frames = {}
+
+        for block, start_time in [
+            (first, second.start_time),
+            (second, first.start_time),
+        ]:
+            for exam, offset in zip(block.exams, block.exam_start_times):
+                exam_start = start_time + timedelta(minutes=offset)
+                time_frames[exam.exam_code] = TimeFrame(
+                    exam_start,
+                    exam_start + block.delta
+                )
+
+        students = {exam.student for exam in first.exams + second.exams}
+
+        for student in students:
+            swapped_timeline = sorted(
+                [
+                    (time_frames.get(exam_code, time_frame), exam_code)
+                    for time_frame, exam_code in index.timelines[student]
+                ],
+                key=lambda entry: entry[0].start_time
+            )
+            swapped_penalty, _ = index.penalties_of(swapped_timeline)
+
+            penalty -= index.student_penalties[student]
+            penalty += swapped_penalty
+
+        return penalty
+
+    def conflict_index(self, schedule: Schedule) -> ConflictIndex:
+        """Return the schedule's conflict index, building it if the
+        schedule has none that uses the evaluator's penalties.
+
+        Once built, the index is only kept up to date by moves of the
+        search algorithm.
+        """
+        index = schedule.conflict_index
+
+        if index is None or index.penalties != self.penalties:
+            index = ConflictIndex.of(schedule, self.penalties)
+            schedule.conflict_index = index
+
+        return index
+
+    def conflicts_of(
+            self,
+            schedule: Schedule,
+            student: Student
+    ) -> Dict[int, List[Conflict]]:
+        """Return the student's conflicts, split by conflict category."""
+        positions = schedule.index.exam_positions
+        exams = []
+
+        for exam_code in self.conflict_index(schedule).student_exams[student]:
+            slot, i, j = positions[exam_code]
+            exams.append(schedule[slot][i].exams[j])
+
+        return self.conflict_search.run({student: exams})[student]
 
     def most_conflicted_student(self, schedule: Schedule) -> Student:
         """Return the student who scores the highest penalty."""
-        penalties = self._penalties_by_student(schedule)
-        return max(penalties, key=lambda x: x[1])[0]
+        return self.conflict_index(schedule).student_penalties.top()
 
-    def most_conflicted_block(self, schedule: Schedule) -> BlockSchedule:
-        """Return the block that scores the highest penalty."""
-        penalties = self._penalties_by_block(schedule)
-        return max(penalties, key=lambda x: x[1])[0]
+    def most_conflicted_block(
+            self,
+            schedule: Schedule
+    ) -> Optional[BlockSchedule]:
+        """Return the block that scores the highest penalty, or None if
+        no block is punished at all.
+        """
+        top = self.conflict_index(schedule).block_penalties.top()
+
+        if top is None:
+            return None
+
+        slot, i = top
+        return schedule[slot][i]
 
     def validate_availabilities(self, data: InputData) -> None:
         """Raise a validation error if the given staff availabilities
@@ -202,11 +689,12 @@ class Evaluator:
         is smaller than the number of blocks that need to be scheduled.
         Return False otherwise.
         """
-        num_blocks_w_potential_helper = sum(
-            [
-                max(slot.assessor.count(), slot.helper.count())
-                for slot in data.block_slots
-            ]
+        availability = data.availability
+        num_blocks_w_potential_helper = int(
+            np.maximum(
+                availability.assessor_avails.sum(axis=1),
+                availability.helper_avails.sum(axis=1)
+            ).sum()
         )
         return num_blocks_w_potential_helper < data.total_num_blocks
 
@@ -218,9 +706,7 @@ class Evaluator:
         insufficient_avails = {}
 
         for assessor, workload in data.assessor_workload.items():
-            available_slots = assessor.available_blocks.filter(
-                window=data.window
-            ).count()
+            available_slots = len(data.availability.slots_of(assessor))
             blocks_to_schedule = sum(workload.values())
 
             if blocks_to_schedule > available_slots:
@@ -231,35 +717,9 @@ class Evaluator:
 
         return insufficient_avails
 
-    @lru_cache
-    def _penalties_by_student(
-            self,
-            schedule: Schedule
-    ) -> List[Tuple[Student, int]]:
-        def total_penalty(student_conf: Dict[int, List[Conflict]]) -> int:
-            """Return a given student's total penalty."""
-            return sum([
-                len(student_conf[degree]) * penalty
-                for degree, penalty in zip(ConflictDegree.choices, self.penalties)
-            ])
-
-        return [
-            (student, total_penalty(conf))
-            for student, conf in self.conflicts(schedule).items()
-        ]
-
-    @lru_cache
-    def _penalties_by_block(
-            self,
-            schedule: Schedule
-    ) -> List[Tuple[BlockSchedule, int]]:
-        """Return the total penalties for each block."""
-        by_block = defaultdict(int)
-        for confs in self.conflicts(schedule).values():
-            for degree, penalty in zip(ConflictDegree.choices, self.penalties):
-                for conf in confs[degree]:
-                    exam_1, exam_2 = conf.exams
-                    by_block[exam_1.block] += penalty
-                    by_block[exam_2.block] += penalty
-
-        return by_block.items()
+    def _total_penalty(self, student_conf: Dict[int, List[Conflict]]) -> int:
+        """Return a given student's total penalty."""
+        return sum([
+            len(student_conf[degree]) * penalty
+            for degree, penalty in zip(ConflictDegree.choices, self.penalties)
+        ])
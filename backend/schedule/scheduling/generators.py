@@ -0,0 +1,358 @@
+"""
+Generation of synthetic windows for load testing and benchmarks.
+"""
+import csv
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import random
+from typing import List, Optional
+from uuid import uuid4
+
+from django.db import transaction
+from django.utils.timezone import make_aware, now
+
+from core.utils.bulk import add_to_window, timestamps
+from core.utils.datetime import current_year
+from exam.models import Exam, ExamStyle, Module, Student
+from staff.models import Assessor, Helper
+from user.models import Organization, code_university_id
+from schedule.models import (
+    AssessmentPhase,
+    BlockSlot,
+    BlockTemplate,
+    PhaseCategory,
+    Semester,
+    Window,
+)
+
+
+PLANNING_SHEET_COLUMNS = [
+    '',
+    'assessmentId',
+    'student',
+    'semester',
+    'shortCode',
+    'module',
+    'assessor',
+    'assistant',
+    'startTime',
+    'endTime',
+    'assessmentStyle',
+    'assessmentType',
+    'proposalStatus',
+    'location',
+]
+
+EMAIL_DOMAIN = 'code.berlin'
+FIRST_SLOT_HOUR = 9
+
+
+@dataclass
+class WindowSpec:
+    """The size and shape of a synthetic window.
+
+    The availability is the share of block slots each assessor and
+    helper is available in, and the alternative share is the share of
+    exams taken in the alternative style.
+    """
+    num_students: int = 200
+    num_modules: int = 20
+    num_assessors: int = 20
+    num_helpers: int = 10
+    num_slots: int = 20
+    slots_per_day: int = 2
+    exams_per_student: int = 3
+    availability: float = 0.75
+    alternative_share: float = 0.1
+    block_length: int = 180
+    start_date: Optional[date] = None
+    year: Optional[int] = None
+    semester: str = Semester.SPRING
+    category: str = PhaseCategory.MAIN
+
+    def validate(self) -> None:
+        """Raise a ValueError if the spec describes no valid window."""
+        for name in [
+            'num_students',
+            'num_modules',
+            'num_assessors',
+            'num_slots',
+            'slots_per_day',
+            'exams_per_student',
+        ]:
+            if getattr(self, name) < 1:
+                raise ValueError(f'{name} must be at least 1')
+
+        if self.num_helpers < 0:
+            raise ValueError('num_helpers must not be negative')
+
+        if self.exams_per_student > self.num_modules:
+            raise ValueError(
+                'Students cannot take more exams than there are modules'
+            )
+
+        if self.slots_per_day * self.block_length \
+                > (24 - FIRST_SLOT_HOUR) * 60:
+            raise ValueError('The slots of a day must end by midnight')
+
+        for name in ['availability', 'alternative_share']:
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f'{name} must be between 0 and 1')
+
+
+class WindowGenerator:
+    """Creates a window with random students, modules, staff, block slots
+    and exams according to a WindowSpec.
+
+    Each module is assessed by a single assessor, and every student takes
+    exams in a random selection of modules. Staff members are available
+    in a random selection of block slots. Slots are placed on weekdays,
+    back to back from 9 am.
+
+    Emails and codes carry a random tag, so that several windows can be
+    generated in the same database. All entities are written in bulk.
+    """
+
+    batch_size = 1000
+
+    def __init__(
+            self,
+            spec: WindowSpec,
+            organization: Optional[Organization] = None,
+            seed: Optional[int] = None
+    ):
+        spec.validate()
+
+        if not BlockTemplate.objects.filter(
+                block_length=spec.block_length
+        ).exists():
+            raise ValueError(
+                f'There are no block templates of length {spec.block_length}'
+            )
+
+        self.spec = spec
+        self.organization = organization \
+            or Organization.objects.get(id=code_university_id())
+        self.rng = random.Random(seed)
+        self.tag = uuid4().hex[:6]
+
+        self.window = None
+        self.exams: List[Exam] = []
+
+    def generate(self, with_exams: bool = True) -> Window:
+        """Create the window with its block slots and staff and return it.
+
+        If with_exams is False, students, modules and exams are generated,
+        but not saved. They can still be written to a planning sheet,
+        so that they can be uploaded like a real one.
+        """
+        with transaction.atomic():
+            self.window = self._create_window()
+            slots = self._create_slots()
+            assessors = self._create_staff(Assessor, 'assessor', slots)
+            self._create_staff(Helper, 'helper', slots)
+
+            students = self._new_students()
+            modules = self._new_modules()
+            self.exams = self._new_exams(students, modules, assessors)
+
+            if with_exams:
+                self._bulk_create(Student, students)
+                self._bulk_create(Module, modules)
+                add_to_window(Module, modules, self.window, self.batch_size)
+                self._bulk_create(Exam, self.exams)
+
+        return self.window
+
+    def write_planning_sheet(self, path: str) -> None:
+        """Write the generated exams as a CSV planning sheet."""
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(PLANNING_SHEET_COLUMNS)
+
+            for i, exam in enumerate(self.exams):
+                writer.writerow([
+                    i,
+                    exam.code,
+                    exam.student.email,
+                    '',
+                    exam.module.code,
+                    exam.module.name,
+                    exam.assessor.email,
+                    '',
+                    '',
+                    '',
+                    exam.style.upper(),
+                    'NORMAL',
+                    'REGISTERED',
+                    '',
+                ])
+
+    def _create_window(self) -> Window:
+        """Create the window in the specified phase, which is created as
+        well if it does not exist yet.
+
+        The window is linked to the block templates of its block length.
+        """
+        phase, _ = AssessmentPhase.objects.get_or_create(
+            organization=self.organization,
+            year=self.spec.year or current_year(),
+            semester=self.spec.semester,
+            category=self.spec.category,
+        )
+        start_date = self.spec.start_date or self._next_monday()
+
+        window = Window.objects.create(
+            assessment_phase=phase,
+            start_date=start_date,
+            end_date=self._slot_dates(start_date)[-1],
+            block_length=self.spec.block_length,
+        )
+        window.block_templates.add(
+            *BlockTemplate.objects.filter(
+                block_length=self.spec.block_length
+            )
+        )
+        return window
+
+    def _create_slots(self) -> List[BlockSlot]:
+        slots = [
+            BlockSlot(
+                window=self.window,
+                start_time=make_aware(
+                    datetime.combine(day, datetime.min.time())
+                    + timedelta(
+                        hours=FIRST_SLOT_HOUR,
+                        minutes=i * self.spec.block_length
+                    )
+                ),
+                **timestamps()
+            )
+            for day in self._slot_dates(self.window.start_date)
+            for i in range(self.spec.slots_per_day)
+        ]
+        return self._bulk_create(BlockSlot, slots[:self.spec.num_slots])
+
+    def _create_staff(
+            self,
+            model,
+            role: str,
+            slots: List[BlockSlot]
+    ) -> list:
+        """Create the assessors or helpers, link them to the window and
+        make each of them available in a random selection of slots.
+        """
+        count = self.spec.num_assessors if model is Assessor \
+            else self.spec.num_helpers
+        staff = self._bulk_create(
+            model,
+            [
+                model(
+                    organization=self.organization,
+                    email=self._email(role, i),
+                    **timestamps()
+                )
+                for i in range(count)
+            ]
+        )
+        add_to_window(model, staff, self.window, self.batch_size)
+
+        num_available = round(self.spec.availability * len(slots))
+        through = model.available_blocks.through
+        instance_field = f'{model._meta.model_name}_id'
+
+        through.objects.bulk_create(
+            [
+                through(**{instance_field: member.id}, blockslot_id=slot.id)
+                for member in staff
+                for slot in self.rng.sample(slots, num_available)
+            ],
+            batch_size=self.batch_size
+        )
+
+        return staff
+
+    def _new_students(self) -> List[Student]:
+        return [
+            Student(
+                organization=self.organization,
+                email=self._email('student', i),
+                **timestamps()
+            )
+            for i in range(self.spec.num_students)
+        ]
+
+    def _new_modules(self) -> List[Module]:
+        return [
+            Module(
+                organization=self.organization,
+                code=f'GEN_{self.tag}_{i + 1:03d}',
+                name=f'Generated Module {i + 1}',
+                standard_length=20,
+                alternative_length=30,
+                **timestamps()
+            )
+            for i in range(self.spec.num_modules)
+        ]
+
+    def _new_exams(
+            self,
+            students: List[Student],
+            modules: List[Module],
+            assessors: List[Assessor]
+    ) -> List[Exam]:
+        """Return the exams of a random selection of modules for each
+        student. The modules are assigned to the assessors in turn.
+        """
+        exams = []
+
+        for student in students:
+            for i in sorted(
+                self.rng.sample(
+                    range(len(modules)),
+                    self.spec.exams_per_student
+                )
+            ):
+                alternative = self.rng.random() < self.spec.alternative_share
+
+                exams.append(
+                    Exam(
+                        code=f'{self.tag}-{len(exams) + 1:06d}',
+                        window=self.window,
+                        module=modules[i],
+                        style=ExamStyle.ALTERNATIVE if alternative
+                        else ExamStyle.STANDARD,
+                        student=student,
+                        assessor=assessors[i % len(assessors)],
+                        **timestamps()
+                    )
+                )
+
+        return exams
+
+    def _slot_dates(self, start_date: date) -> List[date]:
+        """Return the weekdays from the start date that hold all slots."""
+        num_days = -(-self.spec.num_slots // self.spec.slots_per_day)
+        dates = []
+        day = start_date
+
+        while len(dates) < num_days:
+            if day.weekday() < 5:
+                dates.append(day)
+            day += timedelta(days=1)
+
+        return dates
+
+    def _email(self, role: str, i: int) -> str:
+        return f'{role}{i + 1:05d}.{self.tag}@{EMAIL_DOMAIN}'
+
+    def _bulk_create(self, model, instances: list) -> list:
+        return model.objects.bulk_create(
+            instances,
+            batch_size=self.batch_size
+        )
+
+    @staticmethod
+    def _next_monday() -> date:
+        today = now().date()
+        return today + timedelta(days=7 - today.weekday())
@@ -2,17 +2,25 @@
 Assignment of helpers to complete schedules.
 """
 from copy import deepcopy
-from random import randint
+import random
+from typing import Optional
 
 from .input_collectors import InputData
 from .schedule import Schedule
 
 
 class HelperAssigner:
-    """Randomly assigns available helpers to scheduled exams."""
+    """Randomly assigns available helpers to scheduled exams.
 
-    @staticmethod
-    def assign_helpers(schedule: Schedule, data: InputData) -> Schedule:
+    The assigner draws from its own random generator rather than the
+    global one, since it may be called in the middle of a search, whose
+    course would otherwise depend on when the assigner is called.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    def assign_helpers(self, schedule: Schedule, data: InputData) -> Schedule:
         """Randomly assign helpers to all exams of the given schedule
         and return the enhanced schedule.
         """
@@ -21,7 +29,7 @@ class HelperAssigner:
         for slot, blocks in schedule.items():
             for block in blocks:
                 helpers = staff_avails[slot].helpers
-                rand_index = randint(0, len(helpers) - 1)
+                rand_index = self.rng.randrange(len(helpers))
                 block.helper = helpers.pop(rand_index)
 
         return schedule
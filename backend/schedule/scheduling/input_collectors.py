@@ -1,19 +1,24 @@
 """
 Input collection to working memory for scheduling purposes
 """
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-from collections import UserDict
-from dataclasses import dataclass
+from collections import UserDict, defaultdict
+from copy import deepcopy
+from dataclasses import dataclass, replace
 import math
-from typing import Dict, TypedDict, List
+from typing import Dict, TypedDict, List, Iterable, Tuple
+
+import numpy as np
 
-from django.db.models import QuerySet
+from django.db.models import Case, Count, F, QuerySet, When
 
 from schedule.models import Window, BlockSlot, BlockTemplate
 from exam.models import Exam, Module, Student, ExamStyle
 from staff.models import Assessor, Helper
 
-from .types import SlotId
+from .types import AssessorId, ExamLength, SlotId
 
 
 @dataclass
@@ -99,22 +104,117 @@ class AssessorWorkload(UserDict):
         return sum(self.data[assessor].values())
 
 
-@dataclass
+class AvailabilityMatrix:
+    """Boolean slot x staff availability matrices for assessors and
+    helpers, built from block slots with prefetched staff relations.
+
+    Rows correspond to slots and columns to staff members, so that the
+    availabilities can be looked up both per slot and per staff member
+    without accessing the database.
+    """
+
+    def __init__(self, block_slots: Iterable[BlockSlot]):
+        block_slots = list(block_slots)
+        self.slot_ids = [slot.id for slot in block_slots]
+        self._slot_index = {
+            slot_id: i for i, slot_id in enumerate(self.slot_ids)
+        }
+
+        self.assessors, self._assessor_index, self.assessor_avails = \
+            self._build(block_slots, lambda slot: slot.assessor.all())
+        self.helpers, self._helper_index, self.helper_avails = \
+            self._build(block_slots, lambda slot: slot.helper.all())
+
+    def assessors_in(self, slot_id: SlotId) -> List[Assessor]:
+        """Return the assessors available in the slot."""
+        return self._staff_in(slot_id, self.assessors, self.assessor_avails)
+
+    def helpers_in(self, slot_id: SlotId) -> List[Helper]:
+        """Return the helpers available in the slot."""
+        return self._staff_in(slot_id, self.helpers, self.helper_avails)
+
+    def assessor_count_in(self, slot_id: SlotId) -> int:
+        """Return the number of assessors available in the slot."""
+        return int(self.assessor_avails[self._slot_index[slot_id]].sum())
+
+    def helper_count_in(self, slot_id: SlotId) -> int:
+        """Return the number of helpers available in the slot."""
+        return int(self.helper_avails[self._slot_index[slot_id]].sum())
+
+    def slots_of(self, assessor: Assessor) -> List[SlotId]:
+        """Return the ids of the slots the assessor is available in."""
+        if assessor.id not in self._assessor_index:
+            return []
+
+        column = self.assessor_avails[:, self._assessor_index[assessor.id]]
+        return [self.slot_ids[i] for i in np.flatnonzero(column)]
+
+    def _staff_in(
+            self,
+            slot_id: SlotId,
+            staff: list,
+            avails: np.ndarray
+    ) -> list:
+        row = avails[self._slot_index[slot_id]]
+        return [staff[i] for i in np.flatnonzero(row)]
+
+    @staticmethod
+    def _build(block_slots: List[BlockSlot], staff_of) -> Tuple:
+        """Return the list of staff members available in any slot, their
+        column index by id, and the boolean availability matrix.
+        """
+        staff, index = [], {}
+        for slot in block_slots:
+            for member in staff_of(slot):
+                if member.id not in index:
+                    index[member.id] = len(staff)
+                    staff.append(member)
+
+        avails = np.zeros((len(block_slots), len(staff)), dtype=bool)
+        for row, slot in enumerate(block_slots):
+            for member in staff_of(slot):
+                avails[row, index[member.id]] = True
+
+        return staff, index, avails
+
+
+@dataclass(frozen=True)
 class InputData:
     """Defines the input data requirements for
     any scheduling algorithm.
+
+    The input data is an in-memory snapshot of the window: all
+    collections are plain lists and dicts, so that algorithms do not
+    need to access the database. For the same reason, the snapshot can
+    be pickled and sent to other processes.
     """
 
     window: Window
-    exams: QuerySet
-    modules: QuerySet
-    assessors: QuerySet
+    exams: List[Exam]
+    modules: List[Module]
+    assessors: List[Assessor]
     assessor_workload: AssessorWorkload
-    helpers: QuerySet
+    helpers: List[Helper]
     staff_avails: Dict[SlotId, AvailInfo]
-    block_slots: QuerySet
-    block_templates: QuerySet
+    block_slots: List[BlockSlot]
+    block_templates: List[BlockTemplate]
     total_num_blocks: int
+    slots_by_id: Dict[SlotId, BlockSlot]
+    templates_by_length: Dict[ExamLength, BlockTemplate]
+    exams_by_assessor_and_length: Dict[Tuple[AssessorId, ExamLength], List[Exam]]
+    availability: AvailabilityMatrix
+
+    def copy(self) -> InputData:
+        """Return a copy with its own assessor workload and staff
+        availabilities, which algorithms may modify.
+
+        All other attributes are shared with the original.
+        """
+        return replace(
+            self,
+            assessor_workload=deepcopy(self.assessor_workload),
+            staff_avails=deepcopy(self.staff_avails),
+        )
 
 
 class WorkloadCalculator:
@@ -132,61 +232,49 @@ class WorkloadCalculator:
         """Return the number of blocks each assessor has to execute
         if exams are assigned as efficiently as possible, as a function
         of exam length.
-        """
-        workload = AssessorWorkload()
-        workload.update({
-            assessor: self._get_block_counts_for(assessor)
-            for assessor in self.assessors
-        })
-        return workload
 
-    def _get_block_counts_for(self, assessor: Assessor) -> Dict[int, int]:
-        """Calculate the number of blocks the assessor has to execute
-        as a function of exam length and return the result as a dictionary.
+        Even if a block is not entirely filled with exams, it counts as a
+        complete block to be scheduled.
         """
-        def block_count_for(exam_length) -> int:
-            """Return an assessor's total count of blocks filled by exams
-            of the given exam_length.
-
-            Even if a block is not entirely filled with exams, it counts as a
-            complete block to be scheduled.
-            """
-            standard_count = exams.filter(
-                style=ExamStyle.STANDARD,
-                module__standard_length=exam_length,
-            ).count()
-            alt_count = exams.filter(
-                style=ExamStyle.ALTERNATIVE,
-                module__alternative_length=exam_length
-            ).count()
-
-            total_count = standard_count + alt_count
-            return math.ceil(total_count / exams_per_block[exam_length])
-
-        exams = self.exams.filter(assessor=assessor)
         exams_per_block = {
-            length: self._exams_per_block_of(length)
-            for length in self._exam_lengths
+            template.exam_length: len(template.exam_start_times)
+            for template in self.block_templates
         }
 
-        return {
-            length: count
-            for length in self._exam_lengths
-            if (count := block_count_for(length))
-        }
+        block_counts = defaultdict(dict)
+        for assessor_id, exam_length, exam_count in self._exam_counts():
+            if exam_length in exams_per_block:
+                block_counts[assessor_id][exam_length] = math.ceil(
+                    exam_count / exams_per_block[exam_length]
+                )
 
-    def _exams_per_block_of(self, length) -> int:
-        """Return the number of exams per block of the given exam length."""
-        template = self.block_templates.get(exam_length=length)
-        exams_per_block = len(template.exam_start_times)
-        return exams_per_block
+        workload = AssessorWorkload()
+        workload.update({
+            assessor: block_counts[assessor.id]
+            for assessor in self.assessors
+        })
+        return workload
 
-    @property
-    def _exam_lengths(self) -> set:
-        """Return the set of exam lengths that are considered for
-        this scheduling window.
+    def _exam_counts(self) -> QuerySet:
+        """Return (assessor id, exam length, exam count) tuples for all
+        exams, using a single aggregation query.
         """
-        return {template.exam_length for template in self.block_templates}
+        return self.exams \
+            .annotate(
+                exam_length=Case(
+                    When(
+                        style=ExamStyle.STANDARD,
+                        then=F('module__standard_length')
+                    ),
+                    When(
+                        style=ExamStyle.ALTERNATIVE,
+                        then=F('module__alternative_length')
+                    ),
+                )
+            ) \
+            .values_list('assessor', 'exam_length') \
+            .annotate(exam_count=Count('id')) \
+            .order_by()
 
 
 class BaseInputCollector(ABC):
@@ -208,7 +296,9 @@ class DBInputCollector(BaseInputCollector):
         self.modules = Module.objects.filter(windows=window)
         self.assessors = Assessor.objects.filter(windows=window)
         self.helpers = Helper.objects.filter(windows=window)
-        self.block_slots = BlockSlot.objects.filter(window=window)
+        self.block_slots = BlockSlot.objects \
+            .filter(window=window) \
+            .prefetch_related('assessor', 'helper')
         self.block_templates = BlockTemplate.objects.filter(windows=window)
 
         self.workload_calc = workload_calculator or WorkloadCalculator(
@@ -219,33 +309,66 @@ class DBInputCollector(BaseInputCollector):
         self.assessor_workload = self.workload_calc.assessor_block_counts
 
     def collect(self) -> InputData:
+        """Load all input data of the window into memory and return it
+        as an InputData snapshot.
+        """
+        exams = list(
+            self.exams.select_related('module', 'student', 'assessor')
+        )
+        block_slots = list(self.block_slots)
+        block_templates = list(self.block_templates)
+        availability = AvailabilityMatrix(block_slots)
+
         return InputData(
             window=self.window,
-            exams=self.exams,
-            modules=self.modules,
-            assessors=self.assessors,
+            exams=exams,
+            modules=list(self.modules),
+            assessors=list(self.assessors),
             assessor_workload=self.assessor_workload,
-            helpers=self.helpers,
-            staff_avails=self._staff_avails,
-            block_slots=self.block_slots,
-            block_templates=self.block_templates,
-            total_num_blocks=self._total_num_blocks
+            helpers=list(self.helpers),
+            staff_avails=self._staff_avails(availability),
+            block_slots=block_slots,
+            block_templates=block_templates,
+            total_num_blocks=self._total_num_blocks,
+            slots_by_id={slot.id: slot for slot in block_slots},
+            templates_by_length={
+                template.exam_length: template
+                for template in block_templates
+            },
+            exams_by_assessor_and_length=self._group_by_assessor_and_length(
+                exams
+            ),
+            availability=availability,
         )
 
-    @property
-    def _staff_avails(self) -> Dict[SlotId, AvailInfo]:
+    @staticmethod
+    def _group_by_assessor_and_length(
+            exams: List[Exam]
+    ) -> Dict[Tuple[AssessorId, ExamLength], List[Exam]]:
+        """Return the exams grouped by assessor id and exam length."""
+        groups = defaultdict(list)
+
+        for exam in exams:
+            groups[(exam.assessor_id, exam.length)].append(exam)
+
+        return dict(groups)
+
+    @staticmethod
+    def _staff_avails(
+            availability: AvailabilityMatrix
+    ) -> Dict[SlotId, AvailInfo]:
         """Return the number and email ids of available helpers
         and assessors per block slot.
         """
         return {
-            slot.id: AvailInfo(
-                helper_count=slot.helper.count(),
-                helpers=list(slot.helper.all()),
-                assessor_count=slot.assessor.count(),
-                assessors=list(slot.assessor.all()),
+            slot_id: AvailInfo(
+                helper_count=availability.helper_count_in(slot_id),
+                helpers=availability.helpers_in(slot_id),
+                assessor_count=availability.assessor_count_in(slot_id),
+                assessors=availability.assessors_in(slot_id),
             )
-            for slot in self.block_slots
-            if slot.assessor.exists()
+            for slot_id in availability.slot_ids
+            if availability.assessor_count_in(slot_id)
         }
 
     @property
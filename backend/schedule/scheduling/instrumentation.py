@@ -0,0 +1,106 @@
+"""
+Instrumentation of the phases of a scheduling run.
+"""
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import sys
+from timeit import default_timer
+from typing import List, Optional
+
+from django.db import connection
+
+try:
+    import resource
+except ImportError:
+    # The resource module is not available on Windows
+    resource = None
+
+
+def peak_memory() -> Optional[int]:
+    """Return the peak resident memory of the process so far in bytes,
+    or None if the platform does not report it.
+    """
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS bytes
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+class QueryCounter:
+    """Database execute wrapper that counts the executed queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@dataclass
+class PhaseStats:
+    """The duration in seconds, the number of database queries and the
+    growth of the process's peak memory in bytes of a single phase.
+    """
+    name: str
+    seconds: float
+    queries: int
+    memory_growth: Optional[int]
+
+
+@dataclass
+class SchedulingRunStats:
+    """The stats of all phases of a scheduling run, in order, and the
+    peak memory of the process at the end of the last phase.
+
+    The peak memory is that of the whole process, so each phase records
+    by how much it raised the peak, which is 0 if it stayed below the
+    peak of an earlier phase. Since memory is not traced, recording the
+    stats does not slow down the run. Work done in other processes, such
+    as parallel searches, is not included in the peak memory.
+    """
+    phases: List[PhaseStats] = field(default_factory=list)
+    peak_memory: Optional[int] = None
+
+    @property
+    def seconds(self) -> float:
+        return sum(phase.seconds for phase in self.phases)
+
+    @property
+    def queries(self) -> int:
+        return sum(phase.queries for phase in self.phases)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Record the stats of the code executed within the context."""
+        counter = QueryCounter()
+        peak_before = peak_memory()
+        start = default_timer()
+
+        with connection.execute_wrapper(counter):
+            yield
+
+        seconds = default_timer() - start
+        self.peak_memory = peak_memory()
+
+        self.phases.append(
+            PhaseStats(
+                name=name,
+                seconds=seconds,
+                queries=counter.count,
+                memory_growth=None if self.peak_memory is None
+                else self.peak_memory - peak_before,
+            )
+        )
+
+    def as_dict(self) -> dict:
+        """Return the stats in a JSON-serializable form."""
+        return {
+            'seconds': self.seconds,
+            'queries': self.queries,
+            'peak_memory': self.peak_memory,
+            'phases': [asdict(phase) for phase in self.phases],
+        }
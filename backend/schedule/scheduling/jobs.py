@@ -0,0 +1,244 @@
+"""
+Asynchronous execution of scheduling jobs by a worker process
+"""
+from datetime import timedelta
+import logging
+from typing import Optional, Type
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils.timezone import now
+
+from schedule.models import SchedulingJob, SchedulingJobStatus, Window
+from .algorithms import SearchBudgetExhaustedError, UnfeasibleInputError
+from .algorithms.tabu_search import SearchProgress
+from .evaluators import ValidationError
+from .schedulers import Scheduler
+
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(window: Window, profile: bool = False) -> SchedulingJob:
+    """Queue a scheduling job for the window and return it.
+
+    If the window already has a pending job, no new job is queued and
+    the pending one is returned instead, unless it is running but its
+    worker has died. If profile is True, the job's scheduling run is
+    profiled.
+    """
+    with transaction.atomic():
+        Window.objects.select_for_update().get(id=window.id)
+        fail_stale_jobs(window.scheduling_jobs.all())
+
+        pending_job = window.scheduling_jobs.filter(
+            status__in=[SchedulingJobStatus.QUEUED, SchedulingJobStatus.RUNNING]
+        ).first()
+
+        if pending_job is not None:
+            return pending_job
+
+        Window.objects.filter(id=window.id).update(scheduling_ongoing=True)
+        return SchedulingJob.objects.create(window=window, profile=profile)
+
+
+def fail_stale_jobs(jobs=None) -> int:
+    """Fail the running jobs that have not reported progress within the
+    job timeout, since their worker has died, and return their number.
+
+    The given queryset of jobs is searched, or all jobs if it is None.
+    """
+    if jobs is None:
+        jobs = SchedulingJob.objects.all()
+
+    with transaction.atomic():
+        stale_jobs = list(
+            jobs.select_for_update(skip_locked=True).filter(
+                status=SchedulingJobStatus.RUNNING,
+                modified__lt=now() - timedelta(
+                    seconds=settings.SCHEDULING_JOB_TIMEOUT
+                )
+            )
+        )
+
+        for job in stale_jobs:
+            logger.warning(f'Scheduling job {job.id} timed out')
+            JobRunner._finish(
+                job,
+                SchedulingJobStatus.FAILED,
+                errors={'internal': 'the job timed out'}
+            )
+
+    return len(stale_jobs)
+
+
+class JobRunner:
+    """Takes queued scheduling jobs from the database and executes them.
+
+    Jobs are claimed with row-level locks, so that any number of workers
+    can share the same queue. Before claiming a job, running jobs whose
+    worker has died are failed, so that their windows are released.
+    """
+
+    def __init__(self, scheduler_class: Optional[Type[Scheduler]] = None):
+        self.scheduler_class = scheduler_class or Scheduler
+
+    def run_next(self) -> Optional[SchedulingJob]:
+        """Execute the oldest queued job and return it, or return None
+        if the queue is empty.
+        """
+        job = self._claim_next()
+
+        if job is not None:
+            self.execute(job)
+
+        return job
+
+    def execute(self, job: SchedulingJob) -> None:
+        """Run the scheduling process for the job's window and record
+        the outcome in the job.
+        """
+        try:
+            self.scheduler_class(
+                job.window,
+                on_progress=lambda progress: self._record_progress(
+                    job,
+                    progress
+                ),
+                on_heartbeat=lambda: self._record_heartbeat(job),
+                profile=job.profile,
+                on_profile=lambda profile: self._record_profile(job, profile)
+            ).run()
+        except ValidationError as e:
+            self._finish(
+                job,
+                SchedulingJobStatus.FAILED,
+                errors={
+                    'insufficient_avails': [
+                        assessor.email
+                        for assessor in e.insufficient_avails
+                    ],
+                    'helpers_needed': e.helpers_needed
+                }
+            )
+        except UnfeasibleInputError as e:
+            errors = {'unfeasible_input': 'not enough availabilities'}
+
+            if e.cut is not None:
+                errors['unfeasible_assessors'] = [
+                    assessor.email for assessor in e.cut.assessors
+                ]
+                errors['blocks_needed'] = e.cut.blocks_needed
+                errors['blocks_possible'] = e.cut.blocks_possible
+
+            self._finish(job, SchedulingJobStatus.FAILED, errors=errors)
+        except SearchBudgetExhaustedError as e:
+            self._finish(
+                job,
+                SchedulingJobStatus.FAILED,
+                errors={'search_budget_exhausted': str(e)}
+            )
+        except Exception as e:
+            logger.exception(f'Scheduling job {job.id} failed')
+            self._finish(
+                job,
+                SchedulingJobStatus.FAILED,
+                errors={
+                    'internal': str(e),
+                }
+            )
+        else:
+            self._finish(job, SchedulingJobStatus.DONE)
+
+    @staticmethod
+    def _claim_next() -> Optional[SchedulingJob]:
+        """Mark the oldest queued job as running and return it."""
+        fail_stale_jobs()
+
+        with transaction.atomic():
+            job = SchedulingJob.objects \
+                .select_for_update(skip_locked=True) \
+                .filter(status=SchedulingJobStatus.QUEUED) \
+                .order_by('created') \
+                .first()
+
+            if job is None:
+                return None
+
+            job.status = SchedulingJobStatus.RUNNING
+            job.started = now()
+            job.save()
+
+        return job
+
+    @staticmethod
+    def _record_progress(job: SchedulingJob, progress: SearchProgress) -> None:
+        """Save the progress of the job's search with a single update.
+        Updating the modification time serves as the job's heartbeat.
+        """
+        job.progress = progress.as_dict()
+        SchedulingJob.objects.filter(id=job.id).update(
+            progress=job.progress,
+            modified=now()
+        )
+
+    @staticmethod
+    def _record_heartbeat(job: SchedulingJob) -> None:
+        """Update the modification time of the job, so that it is not
+        failed as stale.
+        """
+        SchedulingJob.objects.filter(id=job.id).update(modified=now())
+
+    @staticmethod
+    def _record_profile(job: SchedulingJob, profile: bytes) -> None:
+        """Save the profile of a run that saved no schedule with the job.
+
+        Only the file field is updated, so that the job's status is not
+        overwritten.
+        """
+        job.profile_file.save(
+            f'profile_window_{job.window_id}_job_{job.id}.prof',
+            ContentFile(profile),
+            save=False
+        )
+        SchedulingJob.objects.filter(id=job.id).update(
+            profile_file=job.profile_file.name
+        )
+
+    @staticmethod
+    def _finish(
+            job: SchedulingJob,
+            status: SchedulingJobStatus,
+            errors: Optional[dict] = None
+    ) -> bool:
+        """Record the outcome of the job and release its window, and
+        return True if the job was still running.
+
+        A job that has been failed as stale in the meantime is left
+        as it is, so that it is not resurrected by its late worker.
+        """
+        finished = now()
+        updated = SchedulingJob.objects.filter(
+            id=job.id,
+            status=SchedulingJobStatus.RUNNING
+        ).update(
+            status=status,
+            errors=errors,
+            finished=finished,
+            modified=finished
+        )
+
+        if not updated:
+            logger.warning(f'Scheduling job {job.id} was finished before')
+            job.refresh_from_db()
+            return False
+
+        job.status = status
+        job.errors = errors
+        job.finished = finished
+
+        Window.objects.filter(id=job.window_id).update(
+            scheduling_ongoing=False
+        )
+        return True
@@ -4,19 +4,19 @@ Conversion of in-memory schedule to useful output formats
 import pandas as pd
 
 from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils.timezone import now
 
 from exam.models import Exam
 from input.models import PlanningSheet
 from schedule.models import (
     Window,
     Block,
-    BlockSlot,
-    BlockTemplate,
     ExamSlot,
     Schedule as DBSchedule,
 )
 
-from .schedule import Schedule, BlockSchedule, ExamSchedule
+from .schedule import Schedule
 
 
 class DBOutputWriter:
@@ -27,51 +27,73 @@ class DBOutputWriter:
         self.penalty = penalty
 
     def write_to_db(self) -> DBSchedule:
-        db_schedule = DBSchedule.objects.create(
-            window=self.window,
-            penalty=self.penalty
-        )
-
-        for slot_id, block_schedules in self.schedule.items():
-            slot = BlockSlot.objects.get(id=slot_id)
-
-            for block_schedule in block_schedules:
-                block = Block.objects.create(
-                    schedule=db_schedule,
-                    block_slot=slot,
-                    template=self._get_template_from(block_schedule)
-                )
-                for exam_schedule in block_schedule.exams:
-                    self._create_and_link_exam_slot(
-                        block,
-                        block_schedule,
-                        exam_schedule,
+        """Write the schedule to the database in a single transaction.
+
+        Slots, templates and exams are loaded up front and all blocks,
+        exam slots and exams are written in bulk, such that the number
+        of queries does not depend on the size of the schedule.
+        """
+        slots = self.window.block_slots.in_bulk()
+        templates = {
+            template.exam_length: template
+            for template in self.window.block_templates.all()
+        }
+        exams = {
+            exam.code: exam
+            for exam in Exam.objects.filter(window=self.window)
+        }
+
+        with transaction.atomic():
+            db_schedule = DBSchedule.objects.create(
+                window=self.window,
+                penalty=self.penalty
+            )
+
+            blocks, exam_slots, scheduled_exams = [], [], []
+
+            for slot_id, block_schedules in self.schedule.items():
+                for block_schedule in block_schedules:
+                    block = Block(
+                        schedule=db_schedule,
+                        block_slot=slots[slot_id],
+                        template=templates[block_schedule.exam_length],
+                        **self._timestamps()
                     )
+                    blocks.append(block)
+
+                    for exam_schedule in block_schedule.exams:
+                        exam_slots.append(
+                            ExamSlot(
+                                block=block,
+                                start_time=exam_schedule.time_frame.start_time,
+                                **self._timestamps()
+                            )
+                        )
+                        exam = exams[exam_schedule.exam_code]
+                        exam.helper = block_schedule.helper
+                        scheduled_exams.append(exam)
+
+            Block.objects.bulk_create(blocks)
+            ExamSlot.objects.bulk_create(exam_slots)
+
+            for exam, exam_slot in zip(scheduled_exams, exam_slots):
+                exam.time_slot = exam_slot
+                exam.modified = exam_slot.modified
+
+            Exam.objects.bulk_update(
+                scheduled_exams,
+                ['time_slot', 'helper', 'modified']
+            )
 
         return db_schedule
 
-    def _get_template_from(self, block_schedule) -> BlockTemplate:
-        return self.window.block_templates.get(
-            exam_length=block_schedule.exam_length
-        )
-
-    def _create_and_link_exam_slot(
-            self,
-            block: Block,
-            block_schedule: BlockSchedule,
-            exam_schedule: ExamSchedule,
-    ) -> None:
-        exam_slot = ExamSlot.objects.create(
-            block=block,
-            start_time=exam_schedule.time_frame.start_time
-        )
-        exam = Exam.objects.get(
-            code=exam_schedule.exam_code,
-            window=self.window
-        )
-        exam.time_slot = exam_slot
-        exam.helper = block_schedule.helper
-        exam.save()
+    @staticmethod
+    def _timestamps() -> dict:
+        """Return the timestamps that BaseModel.save would otherwise
+        set, since bulk operations bypass it.
+        """
+        timestamp = now()
+        return {'created': timestamp, 'modified': timestamp}
 
 
 class CSVOutputWriter:
@@ -86,8 +108,12 @@ class CSVOutputWriter:
         )
 
         data = pd.read_csv(input_planning_sheet.get_file_path(), sep=',')
+        decisions = data[['assessmentId']] \
+            .astype(str) \
+            .merge(self._schedule_decisions(), on='assessmentId', how='left')
+
         data[['startTime', 'endTime', 'assistant']] \
-            = data.apply(self._schedule_decisions, axis=1)
+            = decisions[['startTime', 'endTime', 'assistant']].values
 
         content = data.to_csv(index=False)
         temp_file = ContentFile(content.encode('utf-8'))
@@ -107,14 +133,30 @@ class CSVOutputWriter:
         return f'schedule_{phase.semester}_{phase.year}' \
                f'_window_{window_pos}.csv'
 
-    def _schedule_decisions(self, row) -> pd.Series:
-        exam = Exam.objects.get(
-            window=self.schedule.window,
-            code=row['assessmentId']
+    def _schedule_decisions(self) -> pd.DataFrame:
+        """Return the start time, end time and helper of all scheduled
+        exams of the window, fetched in a single query.
+        """
+        exams = Exam.objects \
+            .filter(window=self.schedule.window, time_slot__isnull=False) \
+            .values_list(
+                'code',
+                'time_slot__start_time',
+                'time_slot__block__template__exam_length',
+                'helper__email',
+            )
+
+        exams = pd.DataFrame.from_records(
+            list(exams),
+            columns=['assessmentId', 'start', 'length', 'assistant']
         )
 
-        start_time = exam.time_slot.start_time.strftime('%Y-%m-%d %H:%M')
-        end_time = exam.time_slot.end_time.strftime('%Y-%m-%d %H:%M')
-        helper = exam.helper.email if exam.helper else 'n.d.'
+        start = pd.to_datetime(exams['start'], utc=True)
+        end = start + pd.to_timedelta(exams['length'], unit='min')
 
-        return pd.Series([start_time, end_time, helper])
+        return pd.DataFrame({
+            'assessmentId': exams['assessmentId'].astype(str),
+            'startTime': start.dt.strftime('%Y-%m-%d %H:%M'),
+            'endTime': end.dt.strftime('%Y-%m-%d %H:%M'),
+            'assistant': exams['assistant'].fillna('n.d.'),
+        })
@@ -4,11 +4,13 @@ Schedule specification.
 from __future__ import annotations
 
 from collections import UserDict, defaultdict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
+from functools import lru_cache
+from hashlib import blake2b
 import itertools
 import pprint
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from uuid import uuid4
 
 from exam.models import Student, Module
@@ -108,6 +110,21 @@ class ExamSchedule:
             and self.time_frame == other.time_frame
         )
 
+    def copy(self) -> ExamSchedule:
+        """Return a copy of the exam schedule with its own time frame.
+
+        The model instances are shared with the original, and the block
+        is left to be set by the block the copy is added to.
+        """
+        return replace(
+            self,
+            time_frame=TimeFrame(
+                self.time_frame.start_time,
+                self.time_frame.end_time
+            ),
+            block=None
+        )
+
 
 class BlockSchedule:
     """Represents the schedule of a block of exams."""
@@ -139,6 +156,19 @@ class BlockSchedule:
             }
         )
 
+    def copy(self) -> BlockSchedule:
+        """Return a copy of the block schedule, including copies of
+        its exam schedules.
+        """
+        return BlockSchedule(
+            assessor=self.assessor,
+            start_time=self.start_time,
+            exam_start_times=list(self.exam_start_times),
+            exam_length=self.exam_length,
+            exams=[exam.copy() for exam in self.exams],
+            helper=self.helper,
+        )
+
     @property
     def exams(self):
         return self._exams
@@ -172,14 +202,190 @@ class BlockSchedule:
         return timedelta(minutes=self.exam_length)
 
 
+ExamPosition = Tuple[SlotId, int, int]
+ExamGroupKey = Tuple[int, int, int]
+
+
+@lru_cache(maxsize=2 ** 16)
+def zobrist_key(exam_code: str, slot: SlotId, position: int) -> int:
+    """Return the pseudo-random 64-bit key of an exam that is scheduled
+    at the given position of a block in the given slot.
+
+    Keys are derived from a hash digest rather than drawn at random, so
+    that they are the same for all schedules and processes.
+    """
+    digest = blake2b(
+        f'{exam_code}|{slot}|{position}'.encode(),
+        digest_size=8
+    ).digest()
+    return int.from_bytes(digest, 'big')
+
+
+class ScheduleIndex:
+    """Lookups into a schedule that would otherwise require walking the
+    entire schedule:
+
+    *  exam_positions: exam code -> (slot id, block position, exam position)
+    *  exam_groups: (assessor id, module id, exam length) -> exam codes
+    *  assessor_blocks: assessor id -> {slot id: block positions}
+
+    The index refers to positions rather than objects, so that copies of
+    a schedule can use copies of its index. Exam groups never change
+    when exams or blocks are swapped and are shared between copies.
+
+    In addition, the index keeps a Zobrist hash of the schedule: the XOR
+    of the keys of all (exam code, slot id, exam position) assignments.
+    Identical schedules thus have identical hashes, no matter how they
+    were reached, and a swap only changes a few keys of the hash.
+    """
+
+    def __init__(
+            self,
+            exam_positions: Dict[str, ExamPosition],
+            exam_groups: Dict[ExamGroupKey, List[str]],
+            assessor_blocks: Dict[int, Dict[SlotId, List[int]]],
+            slot_assessors: Dict[SlotId, Set[int]],
+            slot_hashes: Dict[SlotId, int],
+            zobrist_hash: int,
+    ):
+        self.exam_positions = exam_positions
+        self.exam_groups = exam_groups
+        self.assessor_blocks = assessor_blocks
+        self.slot_assessors = slot_assessors
+        self.slot_hashes = slot_hashes
+        self.zobrist_hash = zobrist_hash
+
+    @classmethod
+    def of(cls, schedule: Schedule) -> ScheduleIndex:
+        """Return the index of the given schedule."""
+        index = cls(
+            exam_positions={},
+            exam_groups=defaultdict(list),
+            assessor_blocks=defaultdict(dict),
+            slot_assessors=defaultdict(set),
+            slot_hashes={},
+            zobrist_hash=0,
+        )
+        index.update_slots(schedule, schedule.keys())
+
+        for slot, blocks in schedule.items():
+            for block in blocks:
+                for exam in block.exams:
+                    index.exam_groups[cls.group_key(exam)].append(
+                        exam.exam_code
+                    )
+
+        return index
+
+    @staticmethod
+    def group_key(exam: ExamSchedule) -> ExamGroupKey:
+        """Return the key of the group of exams the exam can be
+        swapped with.
+        """
+        return (
+            exam.assessor.id,
+            exam.module.id,
+            exam.time_frame.length(as_int=True)
+        )
+
+    def copy(self) -> ScheduleIndex:
+        """Return a copy that can be updated independently."""
+        return ScheduleIndex(
+            exam_positions=dict(self.exam_positions),
+            exam_groups=self.exam_groups,
+            assessor_blocks=defaultdict(
+                dict,
+                {
+                    assessor: {
+                        slot: list(positions)
+                        for slot, positions in blocks.items()
+                    }
+                    for assessor, blocks in self.assessor_blocks.items()
+                }
+            ),
+            slot_assessors=defaultdict(
+                set,
+                {
+                    slot: set(assessors)
+                    for slot, assessors in self.slot_assessors.items()
+                }
+            ),
+            slot_hashes=dict(self.slot_hashes),
+            zobrist_hash=self.zobrist_hash,
+        )
+
+    def swap_exam_positions(self, first_code: str, second_code: str) -> None:
+        """Record that the two exams have swapped their positions."""
+        positions = self.exam_positions
+        first, second = positions[first_code], positions[second_code]
+        positions[first_code], positions[second_code] = second, first
+
+        for exam_code, old, new in [
+            (first_code, first, second),
+            (second_code, second, first),
+        ]:
+            old_key = zobrist_key(exam_code, old[0], old[2])
+            new_key = zobrist_key(exam_code, new[0], new[2])
+
+            self.slot_hashes[old[0]] ^= old_key
+            self.slot_hashes[new[0]] ^= new_key
+            self.zobrist_hash ^= old_key ^ new_key
+
+    def hash_after_exam_swap(self, first_code: str, second_code: str) -> int:
+        """Return the Zobrist hash the schedule would have after swapping
+        the two exams.
+        """
+        (slot_1, _, j_1) = self.exam_positions[first_code]
+        (slot_2, _, j_2) = self.exam_positions[second_code]
+
+        return (
+            self.zobrist_hash
+            ^ zobrist_key(first_code, slot_1, j_1)
+            ^ zobrist_key(second_code, slot_2, j_2)
+            ^ zobrist_key(first_code, slot_2, j_2)
+            ^ zobrist_key(second_code, slot_1, j_1)
+        )
+
+    def update_slots(
+            self,
+            schedule: Schedule,
+            slots: Iterable[SlotId]
+    ) -> None:
+        """Record the current positions of all blocks and exams in the
+        given slots.
+        """
+        for slot in slots:
+            for assessor in self.slot_assessors[slot]:
+                self.assessor_blocks[assessor][slot] = []
+
+            slot_hash = 0
+
+            for i, block in enumerate(schedule[slot]):
+                assessor = block.assessor.id
+                self.slot_assessors[slot].add(assessor)
+                self.assessor_blocks[assessor].setdefault(slot, []).append(i)
+
+                for j, exam in enumerate(block.exams):
+                    self.exam_positions[exam.exam_code] = (slot, i, j)
+                    slot_hash ^= zobrist_key(exam.exam_code, slot, j)
+
+            self.zobrist_hash ^= self.slot_hashes.get(slot, 0) ^ slot_hash
+            self.slot_hashes[slot] = slot_hash
+
+
 class Schedule(UserDict):
     """Represents a complete window schedule.
 
     Each key is a slot id and its value is a list of BlockSchedules.
+
+    The conflict index is set by the evaluator and kept up to date by
+    the moves of the search algorithm, just like the schedule index.
     """
     def __init__(self):
         super().__init__(self)
         self._key = uuid4()
+        self._index = None
+        self.conflict_index = None
 
     def __setitem__(self, key, value):
         if not isinstance(key, SlotId):
@@ -207,9 +413,10 @@ class Schedule(UserDict):
         return self.data[key]
 
     def __hash__(self):
-        """Make Schedule objects hashable for function call caching.
+        """Hash the schedule by its identity key, which stays the same
+        while the schedule is modified in place.
 
-        This is a little 'hack' to improve performance.
+        Use the fingerprint to compare the contents of schedules.
         """
         return hash(self._key)
 
@@ -220,6 +427,48 @@ class Schedule(UserDict):
         pp = pprint.PrettyPrinter()
         return pp.pformat(self.data)
 
+    def copy(self) -> Schedule:
+        """Return a copy of the schedule that can be modified
+        independently of the original.
+
+        In contrast to a deep copy, the Django model instances referenced
+        by the schedule are shared rather than copied.
+        """
+        schedule = Schedule()
+        for slot, blocks in self.data.items():
+            schedule[slot] = [block.copy() for block in blocks]
+
+        if self._index is not None:
+            schedule._index = self._index.copy()
+
+        if self.conflict_index is not None:
+            schedule.conflict_index = self.conflict_index.copy()
+
+        return schedule
+
+    @property
+    def fingerprint(self) -> int:
+        """Return the Zobrist hash of the schedule's current state.
+
+        Schedules with the same exams at the same positions of the same
+        slots have the same fingerprint. This assumes that the exams'
+        time frames follow from their slots and positions.
+        """
+        return self.index.zobrist_hash
+
+    @property
+    def index(self) -> ScheduleIndex:
+        """Return the schedule's index, building it on first access.
+
+        Once built, the index is only kept up to date by moves of the
+        search algorithm. Do not modify the schedule in other ways
+        afterwards.
+        """
+        if self._index is None:
+            self._index = ScheduleIndex.of(self)
+
+        return self._index
+
     def group_by_student(self) -> Dict[Student, List[ExamSchedule]]:
         """Return the schedule transformed in such a way that each
         key represents a student. Its value is a list of (start_time, end_time)
@@ -1,15 +1,33 @@
 """
 Management and orchestration of the scheduling process
 """
-from typing import Optional, Type
+import cProfile
+from contextlib import contextmanager
+import logging
+import marshal
+from typing import Callable, Optional, Type
 from pprint import pprint
 
-from schedule.models import Window
-from .algorithms import BaseAlgorithm, TabuSearch, UnfeasibleInputError
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from schedule.models import Window, Schedule as DBSchedule
+from .algorithms import (
+    BaseAlgorithm,
+    TabuSearch,
+    ParallelTabuSearch,
+    UnfeasibleInputError,
+)
+from .algorithms.tabu_search import SearchProgress
 from .evaluators import Evaluator, ValidationError
-from .input_collectors import BaseInputCollector, DBInputCollector
+from .input_collectors import BaseInputCollector, DBInputCollector, InputData
+from .instrumentation import SchedulingRunStats
 from .helpers import HelperAssigner
 from .output_writers import DBOutputWriter, CSVOutputWriter
+from .schedule import Schedule
+
+
+logger = logging.getLogger(__name__)
 
 
 class Scheduler:
@@ -20,6 +38,18 @@ class Scheduler:
         2. Algorithm execution
         3. Solution evaluation
         4. Saving of the solution
+
+    Each step of a run is timed, and its number of database queries and
+    the peak memory are recorded. The stats are saved with the schedule.
+
+    The on_heartbeat callback is called whenever a step begins and while
+    parallel searches run, so that a long run can show it is alive.
+
+    If profile is True, the whole run is profiled with cProfile, and the
+    profile is saved with the schedule as well. If the run fails before
+    a schedule is saved, the profile is passed to the on_profile callback
+    instead. Profiling slows down the run, and searches in other
+    processes are not profiled.
     """
     def __init__(
             self,
@@ -28,28 +58,158 @@ class Scheduler:
             algorithm_class: Optional[Type[BaseAlgorithm]] = None,
             evaluator: Optional[Evaluator] = None,
             helper_assigner: Optional[HelperAssigner] = None,
+            on_progress: Optional[Callable[[SearchProgress], None]] = None,
+            on_heartbeat: Optional[Callable[[], None]] = None,
+            profile: bool = False,
+            on_profile: Optional[Callable[[bytes], None]] = None,
     ):
         self.window = window
         self.input_collector = input_collector or DBInputCollector(window)
-        self.algorithm_class = algorithm_class or TabuSearch
+        self.algorithm_class = algorithm_class or self._default_algorithm()
         self.evaluator = evaluator or Evaluator()
         self.helper_assigner = helper_assigner or HelperAssigner()
+        self.on_progress = on_progress
+        self.on_heartbeat = on_heartbeat
+        self.profile = profile
+        self.on_profile = on_profile
+        self.stats = None
+        self._incumbent = None
+
+    @staticmethod
+    def _default_algorithm() -> Type[BaseAlgorithm]:
+        """Return the parallel tabu search if more than one search per
+        scheduling run is configured, and the plain tabu search otherwise.
+        """
+        if settings.SCHEDULING_PARALLEL_SEARCHES > 1:
+            return ParallelTabuSearch
+
+        return TabuSearch
 
     def run(self) -> None:
-        """Execute all the steps given above."""
-        data = self.input_collector.collect()
-        self.evaluator.validate_availabilities(data)
+        """Execute all the steps given above, profiled if requested."""
+        if not self.profile:
+            self._run()
+            return
 
-        algorithm = self.algorithm_class(data, self.evaluator)
-        schedule, penalty = algorithm.run()
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(self._run)
+        finally:
+            self._save_profile(profiler)
 
-        schedule = self.helper_assigner.assign_helpers(schedule, data)
+    def _run(self) -> None:
+        self.stats = SchedulingRunStats()
+
+        with self._phase('input_collection'):
+            data = self.input_collector.collect()
+
+        with self._phase('validation'):
+            self.evaluator.validate_availabilities(data)
+
+        with self._phase('search'):
+            algorithm = self._algorithm(data)
+            schedule, penalty = algorithm.run()
+
+        with self._phase('helper_assignment'):
+            schedule = self.helper_assigner.assign_helpers(schedule, data)
+
+        with self._phase('db_output'):
+            db_schedule = self._write(schedule, penalty)
+
+        with self._phase('csv_output'):
+            CSVOutputWriter(db_schedule).write_to_csv()
 
-        db_writer = DBOutputWriter(self.window, schedule, penalty)
-        db_schedule = db_writer.write_to_db()
+        db_schedule.run_stats = self.stats.as_dict()
+        db_schedule.save(update_fields=['run_stats', 'modified'])
+
+        logger.info(
+            f'Schedule {db_schedule.id} of window {self.window.id} was '
+            f'saved after {self.stats.seconds:.1f} seconds and '
+            f'{self.stats.queries} queries'
+        )
+
+    @contextmanager
+    def _phase(self, name: str):
+        """Record the stats of a step after sending a heartbeat."""
+        if self.on_heartbeat is not None:
+            self.on_heartbeat()
+
+        with self.stats.phase(name):
+            yield
+
+    def _save_profile(self, profiler: cProfile.Profile) -> None:
+        """Save the profile with the schedule of the run, in the format
+        of pstats.Stats.dump_stats, as read by pstats and snakeviz.
+
+        Without a schedule, the profile is passed to the on_profile
+        callback, or dropped if there is none.
+        """
+        profiler.create_stats()
+        profile = marshal.dumps(profiler.stats)
+        db_schedule = self._incumbent
+
+        if db_schedule is not None:
+            db_schedule.profile.save(
+                f'profile_window_{self.window.id}_'
+                f'schedule_{db_schedule.id}.prof',
+                ContentFile(profile)
+            )
+        elif self.on_profile is not None:
+            self.on_profile(profile)
+        else:
+            logger.warning(
+                f'The profile of window {self.window.id} was dropped, '
+                f'since the run saved no schedule'
+            )
+
+    def _algorithm(self, data: InputData) -> BaseAlgorithm:
+        """Return the algorithm instance for the given input.
+
+        Tabu searches save their best schedule so far along the way,
+        so that a run that is interrupted still leaves a schedule, and
+        report their progress. Parallel searches send heartbeats as well.
+        """
+        def on_incumbent(schedule: Schedule, penalty: int) -> None:
+            self._save(schedule, penalty, data)
+
+        if issubclass(self.algorithm_class, ParallelTabuSearch):
+            return self.algorithm_class(
+                data,
+                self.evaluator,
+                on_incumbent=on_incumbent,
+                on_progress=self.on_progress,
+                on_heartbeat=self.on_heartbeat
+            )
+
+        if issubclass(self.algorithm_class, TabuSearch):
+            return self.algorithm_class(
+                data,
+                self.evaluator,
+                on_incumbent=on_incumbent,
+                on_progress=self.on_progress
+            )
+
+        return self.algorithm_class(data, self.evaluator)
+
+    def _save(
+            self,
+            schedule: Schedule,
+            penalty: int,
+            data: InputData
+    ) -> DBSchedule:
+        """Assign helpers to the schedule and write it to the database."""
+        schedule = self.helper_assigner.assign_helpers(schedule, data)
+        return self._write(schedule, penalty)
 
-        print("Schedule was written to database!")
+    def _write(self, schedule: Schedule, penalty: int) -> DBSchedule:
+        """Write the schedule to the database and remove the schedule
+        saved before by the same run, if any.
+        """
+        db_schedule = DBOutputWriter(self.window, schedule, penalty) \
+            .write_to_db()
 
-        CSVOutputWriter(db_schedule).write_to_csv()
+        if self._incumbent is not None:
+            self._incumbent.delete()
 
-        print("CSV saved in window instance")
+        self._incumbent = db_schedule
+        return db_schedule
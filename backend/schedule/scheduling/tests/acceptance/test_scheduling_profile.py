@@ -0,0 +1,94 @@
+import pytest
+
+from django.core.files.base import ContentFile
+from django.urls import reverse
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_202_ACCEPTED,
+    HTTP_404_NOT_FOUND,
+)
+
+from schedule.models import Schedule
+
+
+pytestmark = pytest.mark.acceptance
+
+
+@pytest.mark.django_db
+class TestSchedulingProfile:
+    def test_profiled_scheduling_can_be_triggered(
+            self,
+            authenticated_client,
+            create_window
+    ):
+        # GIVEN a window
+        window = create_window()
+
+        # WHEN profiled scheduling is triggered
+        response = authenticated_client.get(
+            reverse('window-trigger-scheduling', args=[window.id]),
+            {'profile': 'true'}
+        )
+
+        # THEN a profiled scheduling job is queued
+        assert response.status_code == HTTP_202_ACCEPTED
+        assert response.json()['profile'] is True
+        assert window.scheduling_jobs.get().profile
+
+    @pytest.mark.parametrize('flag', ['false', '0', 'no', ''])
+    def test_scheduling_is_not_profiled_if_flag_is_false(
+            self,
+            authenticated_client,
+            create_window,
+            flag
+    ):
+        # GIVEN a window
+        window = create_window()
+
+        # WHEN scheduling is triggered with a false profile flag
+        response = authenticated_client.get(
+            reverse('window-trigger-scheduling', args=[window.id]),
+            {'profile': flag}
+        )
+
+        # THEN a scheduling job without profiling is queued
+        assert response.status_code == HTTP_202_ACCEPTED
+        assert response.json()['profile'] is False
+        assert not window.scheduling_jobs.get().profile
+
+    def test_profile_of_latest_schedule_can_be_downloaded(
+            self,
+            authenticated_client,
+            create_window
+    ):
+        # GIVEN a window with a schedule of a profiled run
+        window = create_window()
+        schedule = Schedule.objects.create(window=window)
+        schedule.profile.save('profile.prof', ContentFile(b'profile'))
+
+        # WHEN the profile is requested
+        response = authenticated_client.get(
+            reverse('window-scheduling-profile', args=[window.id])
+        )
+
+        # THEN the profile is returned as an attachment
+        assert response.status_code == HTTP_200_OK
+        assert response.content == b'profile'
+        assert 'attachment' in response['Content-Disposition']
+
+    def test_profile_is_not_found_for_unprofiled_run(
+            self,
+            authenticated_client,
+            create_window
+    ):
+        # GIVEN a window with a schedule of a run that was not profiled
+        window = create_window()
+        Schedule.objects.create(window=window)
+
+        # WHEN the profile is requested
+        response = authenticated_client.get(
+            reverse('window-scheduling-profile', args=[window.id])
+        )
+
+        # THEN it is not found
+        assert response.status_code == HTTP_404_NOT_FOUND
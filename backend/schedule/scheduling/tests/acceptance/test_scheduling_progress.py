@@ -0,0 +1,115 @@
+import pytest
+
+import json
+
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK
+
+from schedule.models import SchedulingJob, SchedulingJobStatus
+from schedule.views import WindowViewSet
+
+
+pytestmark = pytest.mark.acceptance
+
+PROGRESS = {
+    'iterations': 10,
+    'current_penalty': 120,
+    'best_penalty': 100,
+    'elapsed': 1.5,
+}
+
+
+@pytest.mark.django_db
+class TestSchedulingProgress:
+    def test_progress_of_latest_job_can_be_polled(
+            self,
+            authenticated_client,
+            create_window
+    ):
+        # GIVEN a window with a running scheduling job that has
+        # reported its progress
+        window = create_window()
+        SchedulingJob.objects.create(
+            window=window,
+            status=SchedulingJobStatus.RUNNING,
+            progress=PROGRESS
+        )
+
+        # WHEN the progress is requested
+        response = authenticated_client.get(
+            reverse('window-scheduling-progress', args=[window.id])
+        )
+
+        # THEN the job's status and progress are returned
+        assert response.status_code == HTTP_200_OK
+        assert response.json() == {
+            'status': SchedulingJobStatus.RUNNING,
+            'progress': PROGRESS,
+        }
+
+    def test_progress_is_streamed_until_job_is_finished(
+            self,
+            authenticated_client,
+            create_window
+    ):
+        # GIVEN a window with a finished scheduling job
+        window = create_window()
+        SchedulingJob.objects.create(
+            window=window,
+            status=SchedulingJobStatus.DONE,
+            progress=PROGRESS
+        )
+
+        # WHEN the progress is requested as a stream
+        response = authenticated_client.get(
+            reverse('window-scheduling-progress', args=[window.id]),
+            {'stream': 'true'}
+        )
+
+        # THEN a single server-sent event is sent before the stream ends
+        assert response['Content-Type'] == 'text/event-stream'
+
+        content = b''.join(response.streaming_content).decode()
+        retry, event, end = content.split('\n\n')
+
+        assert retry.startswith('retry: ')
+        assert end == ''
+        assert event.startswith('data: ')
+        assert json.loads(event[len('data: '):]) == {
+            'status': SchedulingJobStatus.DONE,
+            'progress': PROGRESS,
+        }
+
+    def test_stream_of_pending_job_times_out(
+            self,
+            authenticated_client,
+            create_window,
+            monkeypatch
+    ):
+        # GIVEN a window with a running scheduling job and a stream
+        # that times out right away
+        window = create_window()
+        SchedulingJob.objects.create(
+            window=window,
+            status=SchedulingJobStatus.RUNNING,
+            progress=PROGRESS
+        )
+        monkeypatch.setattr(WindowViewSet, 'progress_stream_timeout', 0)
+
+        # WHEN the progress is requested as a stream
+        response = authenticated_client.get(
+            reverse('window-scheduling-progress', args=[window.id]),
+            {'stream': 'true'}
+        )
+
+        # THEN the current progress is sent before the stream ends,
+        # so that the client reconnects
+        content = b''.join(response.streaming_content).decode()
+        retry, event, end = content.split('\n\n')
+
+        assert retry == 'retry: 1000'
+        assert json.loads(event[len('data: '):]) == {
+            'status': SchedulingJobStatus.RUNNING,
+            'progress': PROGRESS,
+        }
+        assert end == ''
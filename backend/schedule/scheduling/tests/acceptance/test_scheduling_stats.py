@@ -0,0 +1,61 @@
+import pytest
+
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK
+
+from schedule.models import Schedule
+
+
+pytestmark = pytest.mark.acceptance
+
+RUN_STATS = {
+    'seconds': 2.5,
+    'queries': 40,
+    'peak_memory': 104857600,
+    'phases': [
+        {
+            'name': 'search',
+            'seconds': 2.5,
+            'queries': 40,
+            'memory_growth': 52428800,
+        },
+    ],
+}
+
+
+@pytest.mark.django_db
+class TestSchedulingStats:
+    def test_stats_of_latest_schedule_are_returned(
+            self,
+            authenticated_client,
+            create_window
+    ):
+        # GIVEN a window with a schedule and the stats of its run
+        window = create_window()
+        Schedule.objects.create(window=window, run_stats=RUN_STATS)
+
+        # WHEN the scheduling stats are requested
+        response = authenticated_client.get(
+            reverse('window-scheduling-stats', args=[window.id])
+        )
+
+        # THEN the stats are returned
+        assert response.status_code == HTTP_200_OK
+        assert response.json() == {'run_stats': RUN_STATS}
+
+    def test_stats_are_empty_without_schedule(
+            self,
+            authenticated_client,
+            create_window
+    ):
+        # GIVEN a window that has not been scheduled yet
+        window = create_window()
+
+        # WHEN the scheduling stats are requested
+        response = authenticated_client.get(
+            reverse('window-scheduling-stats', args=[window.id])
+        )
+
+        # THEN no stats are returned
+        assert response.status_code == HTTP_200_OK
+        assert response.json() == {'run_stats': None}
@@ -1,12 +1,19 @@
 import pytest
+from collections import Counter
 from datetime import datetime, timedelta
+import random
 from uuid import uuid4
 
-from django.utils.timezone import now
+from django.utils.timezone import make_aware, now
 
 from exam.models import Exam, Module, Student, ExamStyle
-from staff.models import Assessor
+from staff.models import Assessor, Helper
 from user.models import Organization
+from schedule.scheduling.input_collectors import (
+    AssessorWorkload,
+    AvailInfo,
+    InputData,
+)
 from schedule.models import (
     AssessmentPhase,
     Window,
@@ -138,9 +145,168 @@ def create_exams(create_window, create_student, create_assessor, create_modules)
     return make_exams
 
 
+@pytest.fixture
+def create_schedulable_window(
+        create_window,
+        create_assessor,
+        create_student,
+        create_modules
+):
+    """Return a factory for windows with block slots, available staff
+    and exams, which can be passed to the scheduling algorithms.
+    """
+    def make_window(
+            num_students: int = 12,
+            num_modules: int = 4,
+            exams_per_student: int = 3,
+            num_days: int = 5,
+            seed: int = 0,
+    ):
+        rng = random.Random(seed)
+        window = create_window()
+        organization = Organization.objects.all().first()
+
+        slots = [
+            BlockSlot.objects.create(
+                window=window,
+                start_time=make_aware(datetime(2022, 1, 3 + day, hour))
+            )
+            for day in range(num_days)
+            for hour in (9, 14)
+        ]
+
+        for i in range(num_modules + 1):
+            helper = Helper.objects.create(
+                email=f'helper{str(uuid4())[:6]}@code.berlin',
+                organization=organization
+            )
+            helper.windows.add(window)
+            helper.available_blocks.add(*slots)
+
+        assessors = [
+            create_assessor(window=window) for _ in range(num_modules)
+        ]
+        for assessor in assessors:
+            assessor.available_blocks.add(
+                *rng.sample(slots, len(slots) * 3 // 4)
+            )
+
+        modules = [create_modules(window=window) for _ in range(num_modules)]
+
+        exams = [
+            Exam(
+                code=f'{str(uuid4())[:8]}',
+                window=window,
+                module=modules[i],
+                style=ExamStyle.STANDARD,
+                student=student,
+                assessor=assessors[i],
+                created=now(),
+                modified=now(),
+            )
+            for student in [create_student() for _ in range(num_students)]
+            for i in rng.sample(range(num_modules), exams_per_student)
+        ]
+        Exam.objects.bulk_create(exams)
+
+        return window
+
+    return make_window
+
+
 @pytest.fixture
 def workload_calc_mock():
     class CalcMock:
         assessor_block_counts = {}
 
     return CalcMock()
+
+
+@pytest.fixture
+def input_data():
+    """Return a factory for in-memory input data that only consists of
+    staff availabilities and assessor workloads.
+    """
+    def make_input_data(staff_avails, assessor_workload):
+        return InputData(
+            window=None,
+            exams=[],
+            modules=[],
+            assessors=list(assessor_workload),
+            assessor_workload=assessor_workload,
+            helpers=[],
+            staff_avails=staff_avails,
+            block_slots=[],
+            block_templates=[],
+            total_num_blocks=sum(
+                sum(workload.values())
+                for workload in assessor_workload.values()
+            ),
+            slots_by_id={},
+            templates_by_length={},
+            exams_by_assessor_and_length={},
+            availability=None,
+        )
+
+    return make_input_data
+
+
+@pytest.fixture
+def planted_input(input_data):
+    """Return a factory for input data that allows for at least one
+    feasible assessor-slot assignment, with additional availabilities
+    on top.
+    """
+    def make_input(num_slots, num_assessors, helpers_per_slot, seed):
+        rng = random.Random(seed)
+        assessors = [Assessor(id=i + 1) for i in range(num_assessors)]
+        avails = {slot: set() for slot in range(1, num_slots + 1)}
+        block_counts = Counter()
+
+        for slot in avails:
+            for assessor in rng.sample(assessors, helpers_per_slot):
+                avails[slot].add(assessor)
+                block_counts[assessor] += 1
+
+            avails[slot].update(rng.sample(assessors, 2))
+
+        staff_avails = {
+            slot: AvailInfo(
+                helper_count=helpers_per_slot,
+                helpers=[object()] * helpers_per_slot,
+                assessor_count=len(assessors_in_slot),
+                assessors=list(assessors_in_slot),
+            )
+            for slot, assessors_in_slot in avails.items()
+        }
+
+        workload = AssessorWorkload()
+        for assessor in assessors:
+            workload[assessor] = {20: block_counts[assessor]}
+
+        return input_data(staff_avails, workload)
+
+    return make_input
+
+
+@pytest.fixture
+def assert_is_feasible():
+    """Return a function asserting that an assessor-slot assignment
+    respects the availabilities and covers all workloads.
+    """
+    def check(schedule, data):
+        blocks = Counter()
+
+        for slot, slot_blocks in schedule.items():
+            assessors = [block.assessor for block in slot_blocks]
+
+            assert len(assessors) == len(set(assessors))
+            assert len(assessors) <= data.staff_avails[slot].helper_count
+            assert set(assessors) <= set(data.staff_avails[slot].assessors)
+
+            blocks.update(assessors)
+
+        for assessor, workload in data.assessor_workload.items():
+            assert blocks[assessor] == sum(workload.values())
+
+    return check
@@ -0,0 +1,319 @@
+import pytest
+
+from exam.models import Exam
+from schedule.scheduling.algorithms import (
+    ParallelTabuSearch,
+    SearchBudget,
+    TabuSearch,
+)
+from schedule.scheduling.algorithms.back_tracking import BackTracking
+from schedule.scheduling.algorithms.flow import FlowSlotAssigner
+from schedule.scheduling.algorithms.random import RandomAssignment
+from schedule.scheduling.evaluators import Evaluator
+from schedule.scheduling.input_collectors import DBInputCollector
+
+
+pytestmark = pytest.mark.integration
+
+
+def _exam_codes_of(schedule):
+    return sorted(
+        exam.exam_code
+        for blocks in schedule.values()
+        for block in blocks
+        for exam in block.exams
+    )
+
+
+@pytest.mark.django_db
+class TestParallelTabuSearch:
+    def test_best_schedule_of_all_searches_is_returned(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        window = create_schedulable_window()
+        data = DBInputCollector(window).collect()
+        evaluator = Evaluator()
+
+        # ACT
+        schedule, penalty = ParallelTabuSearch(
+            data,
+            evaluator,
+            num_searches=2,
+            seed=0
+        ).run()
+
+        # ASSERT
+        assert penalty == evaluator.penalty(schedule)
+        assert _exam_codes_of(schedule) == sorted(
+            Exam.objects.filter(window=window).values_list('code', flat=True)
+        )
+
+    def test_heartbeats_are_sent_while_searches_run(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        data = DBInputCollector(create_schedulable_window()).collect()
+        heartbeats = []
+
+        # ACT
+        ParallelTabuSearch(
+            data,
+            Evaluator(),
+            num_searches=2,
+            seed=0,
+            on_heartbeat=lambda: heartbeats.append(True),
+            heartbeat_interval=0
+        ).run()
+
+        # ASSERT
+        assert heartbeats
+
+    def test_improved_schedules_of_all_searches_are_published(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        data = DBInputCollector(create_schedulable_window(seed=1)).collect()
+        published = []
+
+        # ACT
+        schedule, penalty = ParallelTabuSearch(
+            data,
+            Evaluator(),
+            num_searches=2,
+            seed=0,
+            on_incumbent=lambda *incumbent: published.append(incumbent),
+            publish_interval=0,
+            heartbeat_interval=0
+        ).run()
+
+        # ASSERT
+        penalties = [_penalty for _, _penalty in published]
+        assert penalties
+        assert penalties == sorted(set(penalties), reverse=True)
+        assert penalties[-1] >= penalty
+        assert all(
+            _penalty == Evaluator().penalty(_schedule)
+            for _schedule, _penalty in published
+        )
+
+    def test_progress_of_all_searches_is_reported(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        data = DBInputCollector(create_schedulable_window()).collect()
+        reports = []
+
+        # ACT
+        _, penalty = ParallelTabuSearch(
+            data,
+            Evaluator(),
+            num_searches=2,
+            seed=0,
+            on_progress=reports.append,
+            progress_interval=0,
+            heartbeat_interval=0
+        ).run()
+
+        # ASSERT
+        assert reports
+        assert all(
+            report.best_penalty <= report.current_penalty
+            for report in reports
+        )
+        assert all(
+            later.iterations >= earlier.iterations
+            and later.best_penalty <= earlier.best_penalty
+            for earlier, later in zip(reports, reports[1:])
+        )
+        assert reports[-1].best_penalty >= penalty
+
+
+@pytest.mark.django_db
+class TestTabuSearch:
+    def test_every_exam_is_scheduled_once(self, create_schedulable_window):
+        # ARRANGE
+        window = create_schedulable_window(num_students=25, seed=2)
+        data = DBInputCollector(window).collect()
+
+        # ACT
+        schedule, penalty = TabuSearch(data, Evaluator()).run(verbose=False)
+
+        # ASSERT
+        assert penalty == Evaluator().penalty(schedule)
+        assert _exam_codes_of(schedule) == sorted(
+            Exam.objects.filter(window=window).values_list('code', flat=True)
+        )
+
+    def test_search_stops_when_iteration_budget_is_exhausted(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        data = DBInputCollector(create_schedulable_window()).collect()
+        budget = SearchBudget(max_iterations=3)
+
+        # ACT
+        schedule, penalty = TabuSearch(data, Evaluator(), budget=budget).run()
+
+        # ASSERT
+        assert budget.iterations <= 3
+        assert penalty == Evaluator().penalty(schedule)
+
+    def test_initial_solution_is_returned_without_time_budget(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        data = DBInputCollector(create_schedulable_window()).collect()
+        budget = SearchBudget(max_seconds=0)
+
+        # ACT
+        schedule, penalty = TabuSearch(data, Evaluator(), budget=budget).run()
+
+        # ASSERT
+        assert budget.iterations == 0
+        assert penalty == Evaluator().penalty(schedule)
+
+    def test_improved_schedules_are_published(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        data = DBInputCollector(create_schedulable_window(seed=1)).collect()
+        published = []
+
+        # ACT
+        schedule, penalty = TabuSearch(
+            data,
+            Evaluator(),
+            on_incumbent=lambda *incumbent: published.append(incumbent),
+            publish_interval=0
+        ).run()
+
+        # ASSERT
+        penalties = [_penalty for _, _penalty in published]
+        assert penalties
+        assert penalties == sorted(penalties, reverse=True)
+        assert all(
+            _penalty == Evaluator().penalty(_schedule)
+            for _schedule, _penalty in published
+        )
+        assert all(_schedule is not schedule for _schedule, _ in published)
+
+    def test_progress_is_reported(self, create_schedulable_window):
+        # ARRANGE
+        data = DBInputCollector(create_schedulable_window()).collect()
+        reports = []
+
+        # ACT
+        _, penalty = TabuSearch(
+            data,
+            Evaluator(),
+            on_progress=reports.append,
+            progress_interval=0
+        ).run()
+
+        # ASSERT
+        assert [report.iterations for report in reports] \
+            == list(range(1, len(reports) + 1))
+        assert all(
+            report.best_penalty <= report.current_penalty
+            for report in reports
+        )
+        assert all(
+            later.best_penalty <= earlier.best_penalty
+            for earlier, later in zip(reports, reports[1:])
+        )
+        assert reports[-1].best_penalty >= penalty
+
+    def test_telemetry_is_returned_next_to_best_schedule(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        data = DBInputCollector(create_schedulable_window()).collect()
+        search = TabuSearch(
+            data,
+            Evaluator(),
+            budget=SearchBudget(max_iterations=50)
+        )
+
+        # ACT
+        schedule, penalty, telemetry = search.run_with_telemetry()
+
+        # ASSERT
+        assert penalty == Evaluator().penalty(schedule)
+        assert telemetry.iterations == search.budget.iterations
+        assert telemetry.neighbors_evaluated > 0
+        assert telemetry.cache_hits + telemetry.cache_misses > 0
+        assert telemetry.seconds_in_evaluator > 0
+
+        trace = [best for _, best in telemetry.best_penalty_trace]
+        assert trace == sorted(trace, reverse=True)
+        assert trace[-1] == penalty
+
+    def test_telemetry_is_not_timed_by_default(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        data = DBInputCollector(create_schedulable_window()).collect()
+        search = TabuSearch(
+            data,
+            Evaluator(),
+            budget=SearchBudget(max_iterations=50)
+        )
+
+        # ACT
+        search.run()
+
+        # ASSERT
+        assert search.telemetry.iterations == search.budget.iterations
+        assert search.telemetry.seconds_in_actions == 0
+        assert search.telemetry.seconds_in_neighborhoods == 0
+        assert search.telemetry.seconds_in_evaluator == 0
+
+
+@pytest.mark.django_db
+class TestRandomAssignment:
+    def test_flow_is_used_if_back_tracking_budget_is_exhausted(
+            self,
+            create_schedulable_window,
+            monkeypatch
+    ):
+        # ARRANGE
+        window = create_schedulable_window()
+        data = DBInputCollector(window).collect()
+        monkeypatch.setattr(BackTracking, 'MAX_STEPS', 1)
+
+        # ACT
+        schedule, _ = RandomAssignment(data).run()
+
+        # ASSERT
+        assert _exam_codes_of(schedule) == sorted(
+            Exam.objects.filter(window=window).values_list('code', flat=True)
+        )
+
+    def test_flow_slot_assigner_can_be_plugged_in(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        window = create_schedulable_window()
+        data = DBInputCollector(window).collect()
+
+        # ACT
+        schedule, _ = RandomAssignment(
+            data,
+            slot_assigner=FlowSlotAssigner(data)
+        ).run()
+
+        # ASSERT
+        assert _exam_codes_of(schedule) == sorted(
+            Exam.objects.filter(window=window).values_list('code', flat=True)
+        )
@@ -1,11 +1,29 @@
 import pytest
 
-from datetime import datetime
+from datetime import datetime, timedelta
+import gc
+import itertools
+import random
+import weakref
 
 from exam.models import Student, Module
 from staff.models import Assessor
 
-from schedule.scheduling.evaluators import Evaluator, Conflict, ConflictDegree
+from schedule.scheduling.algorithms.tabu_search import (
+    Actions,
+    BlockNeighborhood,
+    BlockSwapMove,
+    ExamSwapMove,
+)
+from schedule.scheduling.caches import EvaluationCache
+from schedule.scheduling.evaluators import (
+    Evaluator,
+    ConflictIndex,
+    Conflict,
+    ConflictDegree,
+    ValidationError,
+)
+from schedule.scheduling.input_collectors import DBInputCollector
 from schedule.scheduling.schedule import (
     ExamSchedule,
     BlockSchedule,
@@ -17,6 +35,49 @@ from schedule.scheduling.schedule import (
 pytestmark = pytest.mark.integration
 
 
+def _random_schedule() -> Schedule:
+    """Return a schedule with four blocks on two consecutive days, each
+    with three 20-minute exams of randomly chosen students.
+    """
+    schedule = Schedule()
+
+    students = [Student(id=i) for i in range(6)]
+    module = Module()
+    assessor = Assessor()
+
+    for slot, start_time in enumerate([
+        datetime(2022, 1, 1, 10, 0),
+        datetime(2022, 1, 1, 11, 0),
+        datetime(2022, 1, 1, 14, 0),
+        datetime(2022, 1, 2, 10, 0),
+    ]):
+        exams = [
+            ExamSchedule(
+                student=random.choice(students),
+                position=j,
+                module=module,
+                assessor=assessor,
+                exam_code=f'exam_{slot}_{j}',
+                time_frame=TimeFrame(
+                    start_time + timedelta(minutes=20 * j),
+                    start_time + timedelta(minutes=20 * (j + 1)),
+                )
+            )
+            for j in range(3)
+        ]
+        schedule[slot] = [
+            BlockSchedule(
+                assessor=assessor,
+                exams=exams,
+                exam_length=20,
+                start_time=start_time,
+                exam_start_times=[0, 20, 40]
+            )
+        ]
+
+    return schedule
+
+
 class TestEvaluator:
     def test_first_order_conflicts_are_found(self):
         # ARRANGE
@@ -136,3 +197,223 @@ class TestEvaluator:
             == [block_1_exams[0], block_2_exams[0]]
         assert conflicts[student_2][ConflictDegree.FIRST_ORDER][0].exams \
             == [block_1_exams[1], block_2_exams[2]]
+
+    def test_compact_evaluation_equals_conflict_count(self):
+        for seed in range(10):
+            # ARRANGE
+            random.seed(seed)
+            schedule = _random_schedule()
+            evaluator = Evaluator(cache=EvaluationCache(max_entries=0))
+
+            # ACT
+            penalty = evaluator.penalty(schedule)
+
+            # ASSERT
+            assert penalty == sum([
+                evaluator._total_penalty(conf)
+                for conf in evaluator.conflicts(schedule).values()
+            ])
+
+    def test_unplanned_blocks_are_evaluated_by_their_conflicts(self):
+        # ARRANGE
+        random.seed(42)
+        schedule = _random_schedule()
+        expected = Evaluator().penalty(schedule)
+
+        for slot in schedule.values():
+            for block in slot:
+                block.start_time = None
+
+        # ACT
+        penalty = Evaluator().penalty(schedule)
+
+        # ASSERT
+        assert penalty == expected
+
+    def test_penalty_after_exam_swap_equals_full_evaluation(self):
+        # ARRANGE
+        random.seed(42)
+        schedule = _random_schedule()
+
+        evaluator = Evaluator()
+        penalty = evaluator.penalty(schedule)
+
+        exam_indices = [
+            (slot, 0, position)
+            for slot, position in itertools.product(range(4), range(3))
+        ]
+
+        for first_index, second_index in itertools.combinations(exam_indices, 2):
+            (slot_1, _, pos_1), (slot_2, _, pos_2) = first_index, second_index
+            first = schedule[slot_1][0].exams[pos_1]
+            second = schedule[slot_2][0].exams[pos_2]
+
+            # ACT
+            delta_penalty = evaluator.penalty_after_exam_swap(
+                schedule,
+                penalty,
+                first,
+                second
+            )
+
+            # ASSERT
+            neighbor = Actions().swap_exams(
+                schedule,
+                [first_index, second_index]
+            )
+            assert delta_penalty == Evaluator().penalty(neighbor)
+
+    def test_penalty_after_block_swap_equals_full_evaluation(self):
+        # ARRANGE
+        random.seed(42)
+        schedule = _random_schedule()
+
+        evaluator = Evaluator()
+        penalty = evaluator.penalty(schedule)
+
+        for first_slot, second_slot in itertools.combinations(range(4), 2):
+            block_indices = [(first_slot, 0), (second_slot, 0)]
+
+            # ACT
+            delta_penalty = BlockSwapMove(block_indices).penalty(
+                schedule,
+                penalty,
+                evaluator
+            )
+
+            # ASSERT
+            neighbor = Actions().swap_blocks(schedule, block_indices)
+            assert delta_penalty == Evaluator().penalty(neighbor)
+            assert evaluator.penalty(schedule) == penalty
+
+    def test_schedule_without_conflicts_has_no_block_neighbors(self):
+        # ARRANGE
+        schedule = _random_schedule()
+
+        exams = [
+            exam
+            for slot in schedule.values()
+            for block in slot
+            for exam in block.exams
+        ]
+        for i, exam in enumerate(exams):
+            exam.student = Student(id=i)
+
+        evaluator = Evaluator()
+
+        # ACT
+        block = evaluator.most_conflicted_block(schedule)
+        neighborhood = BlockNeighborhood(schedule, evaluator=evaluator)
+
+        # ASSERT
+        assert evaluator.penalty(schedule) == 0
+        assert block is None
+        assert len(neighborhood) == 0
+
+    def test_conflict_index_is_kept_up_to_date_by_moves(self):
+        # ARRANGE
+        random.seed(7)
+        schedule = _random_schedule()
+
+        evaluator = Evaluator()
+        index = evaluator.conflict_index(schedule)
+
+        # ACT / ASSERT
+        for i in range(30):
+            if i % 3:
+                move = ExamSwapMove([
+                    (random.randrange(4), 0, random.randrange(3))
+                    for _ in range(2)
+                ])
+            else:
+                move = BlockSwapMove([
+                    (slot, 0) for slot in random.sample(range(4), 2)
+                ])
+
+            move.apply(schedule)
+
+            expected = ConflictIndex.of(schedule, evaluator.penalties)
+            assert index.total_penalty == Evaluator().penalty(schedule)
+            assert index.student_penalties.penalties \
+                == expected.student_penalties.penalties
+            assert index.block_penalties.penalties \
+                == expected.block_penalties.penalties
+
+            if index.total_penalty:
+                slot, _ = index.block_penalties.top()
+                assert evaluator.most_conflicted_block(schedule) \
+                    is schedule[slot][0]
+                assert index.block_penalties[(slot, 0)] \
+                    == max(index.block_penalties.penalties.values())
+
+        assert schedule.conflict_index is index
+
+    def test_penalty_cache_does_not_keep_schedules_alive(self):
+        # ARRANGE
+        random.seed(42)
+        schedule = _random_schedule()
+        evaluator = Evaluator()
+
+        # ACT
+        penalty = evaluator.penalty(schedule)
+        cached_penalty = evaluator.penalty(schedule)
+
+        reference = weakref.ref(schedule)
+        del schedule
+        gc.collect()
+
+        # ASSERT
+        assert cached_penalty == penalty
+        assert evaluator.cache.stats()['hits'] == 1
+        assert evaluator.cache.stats()['misses'] == 1
+        assert reference() is None
+
+    def test_empty_cache_is_used(self):
+        # ARRANGE
+        cache = EvaluationCache(max_entries=0)
+        evaluator = Evaluator(cache=cache)
+
+        # ACT
+        evaluator.penalty(_random_schedule())
+
+        # ASSERT
+        assert evaluator.cache is cache
+        assert cache.stats()['misses'] == 1
+        assert len(cache) == 0
+
+
+@pytest.mark.django_db
+class TestAvailabilityValidation:
+    def test_sufficient_availabilities_pass_validation(
+            self,
+            create_schedulable_window,
+            django_assert_num_queries
+    ):
+        # ARRANGE
+        data = DBInputCollector(create_schedulable_window()).collect()
+
+        # ACT & ASSERT
+        with django_assert_num_queries(0):
+            Evaluator().validate_availabilities(data)
+
+    def test_assessor_without_availabilities_fails_validation(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        window = create_schedulable_window()
+        assessor = Assessor.objects.filter(windows=window).first()
+        assessor.available_blocks.clear()
+
+        data = DBInputCollector(window).collect()
+
+        # ACT
+        with pytest.raises(ValidationError) as error:
+            Evaluator().validate_availabilities(data)
+
+        # ASSERT
+        assert error.value.insufficient_avails[assessor] == {
+            'available_slots': 0,
+            'blocks_to_schedule': sum(data.assessor_workload[assessor].values())
+        }
+        assert not error.value.helpers_needed
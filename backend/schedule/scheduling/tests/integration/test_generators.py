@@ -0,0 +1,88 @@
+import pytest
+
+from django.core.management import CommandError, call_command
+
+from exam.models import Exam, ExamStyle
+from input.processing import SheetProcessor
+from input.validation import SheetValidator
+from staff.models import Assessor, Helper
+from schedule.models import BlockSlot
+from schedule.scheduling.generators import WindowGenerator, WindowSpec
+from schedule.scheduling.input_collectors import DBInputCollector
+
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.mark.django_db
+class TestWindowGenerator:
+    def test_window_is_generated_as_specified(self):
+        # ARRANGE
+        spec = WindowSpec(
+            num_students=30,
+            num_modules=6,
+            num_assessors=4,
+            num_helpers=3,
+            num_slots=7,
+            slots_per_day=2,
+            exams_per_student=2,
+            availability=0.5,
+            alternative_share=1,
+        )
+
+        # ACT
+        window = WindowGenerator(spec, seed=0).generate()
+
+        # ASSERT
+        exams = Exam.objects.filter(window=window)
+        assert exams.count() == 60
+        assert not exams.exclude(style=ExamStyle.ALTERNATIVE).exists()
+        assert exams.values('module').distinct().count() == 6
+
+        slots = BlockSlot.objects.filter(window=window)
+        assert slots.count() == 7
+        assert all(slot.start_time.weekday() < 5 for slot in slots)
+
+        for model, count in [(Assessor, 4), (Helper, 3)]:
+            staff = model.objects.filter(windows=window)
+            assert staff.count() == count
+            assert all(
+                member.available_blocks.count() == 4 for member in staff
+            )
+
+        assert window.block_templates.exists()
+        assert DBInputCollector(window).collect().total_num_blocks > 0
+
+    def test_planning_sheet_can_be_uploaded(self, tmp_path):
+        # ARRANGE
+        path = tmp_path / 'sheet.csv'
+        generator = WindowGenerator(
+            WindowSpec(num_students=20, num_modules=5),
+            seed=0
+        )
+        window = generator.generate(with_exams=False)
+
+        # ACT
+        generator.write_planning_sheet(path)
+
+        # ASSERT
+        assert not Exam.objects.filter(window=window).exists()
+
+        with open(path, 'rb') as file:
+            SheetValidator(file).validate()
+
+        SheetProcessor(window, path).populate_db()
+        assert Exam.objects.filter(window=window).count() == 60
+        assert Exam.objects.filter(
+            window=window,
+            assessor__windows=window
+        ).count() == 60
+
+    def test_command_reports_invalid_spec(self):
+        # ACT & ASSERT
+        with pytest.raises(CommandError, match='more exams than'):
+            call_command(
+                'generate_window',
+                '--modules=2',
+                '--exams-per-student=3'
+            )
@@ -5,6 +5,7 @@ from exam.models import ExamStyle, Exam, Module
 from schedule.models import BlockTemplate
 from staff.models import Assessor
 
+from schedule.scheduling.algorithms.random import RandomAssignment
 from schedule.scheduling.input_collectors import DBInputCollector
 
 
@@ -67,3 +68,72 @@ class TestDBInputCollector:
                == {exam.id for exam in related_exams}
         assert {temp.id for temp in data.block_templates} \
                == {temp.id for temp in BlockTemplate.objects.all()}
+
+    def test_input_is_indexed_in_memory(self, create_schedulable_window):
+        # ARRANGE
+        window = create_schedulable_window()
+
+        # ACT
+        data = DBInputCollector(window).collect()
+
+        # ASSERT
+        assert isinstance(data.exams, list)
+        assert set(data.slots_by_id) \
+               == set(window.block_slots.values_list('id', flat=True))
+        assert set(data.templates_by_length) == {20, 30}
+
+        for (assessor_id, length), exams in \
+                data.exams_by_assessor_and_length.items():
+            assert all(exam.assessor_id == assessor_id for exam in exams)
+            assert all(exam.length == length for exam in exams)
+
+        assert sum(
+            len(exams) for exams in data.exams_by_assessor_and_length.values()
+        ) == Exam.objects.filter(window=window).count()
+
+    def test_initial_solution_is_built_without_queries(
+            self,
+            create_schedulable_window,
+            django_assert_num_queries
+    ):
+        # ARRANGE
+        window = create_schedulable_window()
+        data = DBInputCollector(window).collect()
+
+        # ACT
+        with django_assert_num_queries(0):
+            schedule, _ = RandomAssignment(data).run()
+
+        # ASSERT
+        assert sum(
+            len(block.exams)
+            for blocks in schedule.values()
+            for block in blocks
+        ) == len(data.exams)
+
+    def test_staff_availabilities_are_read_from_prefetched_matrix(
+            self,
+            create_schedulable_window,
+            django_assert_max_num_queries
+    ):
+        # ARRANGE
+        window = create_schedulable_window()
+        collector = DBInputCollector(window)
+
+        # ACT
+        with django_assert_max_num_queries(8):
+            data = collector.collect()
+
+        # ASSERT
+        for slot in window.block_slots.all():
+            assert set(data.availability.assessors_in(slot.id)) \
+                   == set(slot.assessor.all())
+            assert set(data.availability.helpers_in(slot.id)) \
+                   == set(slot.helper.all())
+            assert data.staff_avails[slot.id].assessor_count \
+                   == slot.assessor.count()
+
+        for assessor in Assessor.objects.filter(windows=window):
+            assert set(data.availability.slots_of(assessor)) == set(
+                assessor.available_blocks.values_list('id', flat=True)
+            )
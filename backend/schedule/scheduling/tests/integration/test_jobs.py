@@ -0,0 +1,317 @@
+from datetime import timedelta
+
+import pytest
+
+from django.utils.timezone import now
+
+from schedule.models import SchedulingJob, SchedulingJobStatus
+from schedule.scheduling.algorithms import (
+    SearchBudgetExhaustedError,
+    UnfeasibleInputError,
+)
+from schedule.scheduling.algorithms.base import InfeasibilityCut
+from schedule.scheduling.algorithms.tabu_search import SearchProgress
+from schedule.scheduling.jobs import JobRunner, enqueue, fail_stale_jobs
+
+
+def make_stale(job, settings):
+    """Mark the job as running without a heartbeat since the timeout."""
+    SchedulingJob.objects.filter(id=job.id).update(
+        status=SchedulingJobStatus.RUNNING,
+        modified=now() - timedelta(
+            seconds=settings.SCHEDULING_JOB_TIMEOUT + 1
+        )
+    )
+
+
+pytestmark = pytest.mark.integration
+
+
+PROGRESS = SearchProgress(
+    iterations=10,
+    current_penalty=120,
+    best_penalty=100,
+    elapsed=1.5
+)
+
+
+def scheduler_raising(exception, during_run=None):
+    class SchedulerMock:
+        instances = []
+
+        def __init__(
+                self,
+                window,
+                on_progress=None,
+                on_heartbeat=None,
+                profile=False,
+                on_profile=None
+        ):
+            self.window = window
+            self.on_progress = on_progress
+            self.on_heartbeat = on_heartbeat
+            self.profile = profile
+            self.on_profile = on_profile
+            self.instances.append(self)
+
+        def run(self):
+            self.on_progress(PROGRESS)
+
+            if during_run is not None:
+                during_run(self)
+
+            if exception is not None:
+                raise exception
+
+    return SchedulerMock
+
+
+@pytest.mark.django_db
+class TestSchedulingJobs:
+    def test_window_has_at_most_one_pending_job(self, create_window):
+        # ARRANGE
+        window = create_window()
+
+        # ACT
+        first = enqueue(window)
+        second = enqueue(window)
+
+        # ASSERT
+        assert first == second
+        assert first.status == SchedulingJobStatus.QUEUED
+
+        window.refresh_from_db()
+        assert window.scheduling_ongoing
+
+    def test_queued_job_is_executed(self, create_window):
+        # ARRANGE
+        window = create_window()
+        enqueue(window)
+        runner = JobRunner(scheduler_class=scheduler_raising(None))
+
+        # ACT
+        job = runner.run_next()
+
+        # ASSERT
+        job.refresh_from_db()
+        assert job.status == SchedulingJobStatus.DONE
+        assert job.started and job.finished
+        assert job.progress == PROGRESS.as_dict()
+        assert runner.run_next() is None
+
+        window.refresh_from_db()
+        assert not window.scheduling_ongoing
+
+    def test_failed_job_records_errors(self, create_window):
+        # ARRANGE
+        window = create_window()
+        enqueue(window)
+        runner = JobRunner(
+            scheduler_class=scheduler_raising(UnfeasibleInputError())
+        )
+
+        # ACT
+        runner.run_next()
+
+        # ASSERT
+        job = SchedulingJob.objects.get(window=window)
+        assert job.status == SchedulingJobStatus.FAILED
+        assert job.errors == {'unfeasible_input': 'not enough availabilities'}
+
+        # A new job can be queued after the failure
+        assert enqueue(window) != job
+
+    def test_exhausted_search_budget_is_recorded(self, create_window):
+        # ARRANGE
+        window = create_window()
+        enqueue(window)
+        runner = JobRunner(
+            scheduler_class=scheduler_raising(
+                SearchBudgetExhaustedError('out of steps')
+            )
+        )
+
+        # ACT
+        runner.run_next()
+
+        # ASSERT
+        job = SchedulingJob.objects.get(window=window)
+        assert job.status == SchedulingJobStatus.FAILED
+        assert job.errors == {'search_budget_exhausted': 'out of steps'}
+
+    def test_infeasibility_cut_is_recorded(
+            self,
+            create_window,
+            create_assessor
+    ):
+        # ARRANGE
+        window = create_window()
+        assessor = create_assessor(window=window)
+        cut = InfeasibilityCut(
+            assessors=[assessor],
+            slots=[],
+            blocks_needed=3,
+            blocks_possible=1
+        )
+
+        enqueue(window)
+        runner = JobRunner(
+            scheduler_class=scheduler_raising(UnfeasibleInputError(cut))
+        )
+
+        # ACT
+        runner.run_next()
+
+        # ASSERT
+        job = SchedulingJob.objects.get(window=window)
+        assert job.errors == {
+            'unfeasible_input': 'not enough availabilities',
+            'unfeasible_assessors': [assessor.email],
+            'blocks_needed': 3,
+            'blocks_possible': 1,
+        }
+
+    def test_profiling_is_passed_on_to_scheduler(self, create_window):
+        # ARRANGE
+        window = create_window()
+        enqueue(window, profile=True)
+        scheduler_class = scheduler_raising(None)
+
+        # ACT
+        job = JobRunner(scheduler_class=scheduler_class).run_next()
+
+        # ASSERT
+        assert job.profile
+        assert [scheduler.profile for scheduler in scheduler_class.instances] \
+            == [True]
+
+    def test_profile_of_failed_run_is_saved_with_job(self, create_window):
+        # ARRANGE
+        window = create_window()
+        enqueue(window, profile=True)
+        runner = JobRunner(
+            scheduler_class=scheduler_raising(
+                UnfeasibleInputError(),
+                during_run=lambda scheduler: scheduler.on_profile(b'stats')
+            )
+        )
+
+        # ACT
+        job = runner.run_next()
+
+        # ASSERT
+        job.refresh_from_db()
+        assert job.status == SchedulingJobStatus.FAILED
+        assert job.profile_file.name.endswith('.prof')
+        assert job.profile_file.read() == b'stats'
+
+    def test_stale_job_is_failed_on_enqueue(self, create_window, settings):
+        # ARRANGE
+        window = create_window()
+        stale_job = enqueue(window)
+        make_stale(stale_job, settings)
+
+        # ACT
+        job = enqueue(window)
+
+        # ASSERT
+        assert job != stale_job
+        assert job.status == SchedulingJobStatus.QUEUED
+
+        stale_job.refresh_from_db()
+        assert stale_job.status == SchedulingJobStatus.FAILED
+        assert stale_job.errors == {'internal': 'the job timed out'}
+
+        window.refresh_from_db()
+        assert window.scheduling_ongoing
+
+    def test_stale_job_is_failed_by_runner(self, create_window, settings):
+        # ARRANGE
+        window = create_window()
+        stale_job = enqueue(window)
+        make_stale(stale_job, settings)
+        runner = JobRunner(scheduler_class=scheduler_raising(None))
+
+        # ACT
+        job = runner.run_next()
+
+        # ASSERT
+        assert job is None
+
+        stale_job.refresh_from_db()
+        assert stale_job.status == SchedulingJobStatus.FAILED
+
+        window.refresh_from_db()
+        assert not window.scheduling_ongoing
+
+    def test_running_job_with_heartbeat_is_kept(self, create_window):
+        # ARRANGE
+        window = create_window()
+        job = enqueue(window)
+        SchedulingJob.objects.filter(id=job.id).update(
+            status=SchedulingJobStatus.RUNNING
+        )
+
+        # ACT
+        pending_job = enqueue(window)
+
+        # ASSERT
+        assert pending_job == job
+        assert pending_job.status == SchedulingJobStatus.RUNNING
+
+    def test_heartbeat_keeps_running_job_alive(self, create_window, settings):
+        # ARRANGE
+        window = create_window()
+        job = enqueue(window)
+        stale_jobs = []
+
+        def beat_after_stale_time(scheduler):
+            make_stale(job, settings)
+            scheduler.on_heartbeat()
+            stale_jobs.append(fail_stale_jobs())
+
+        runner = JobRunner(
+            scheduler_class=scheduler_raising(
+                None,
+                during_run=beat_after_stale_time
+            )
+        )
+
+        # ACT
+        runner.run_next()
+
+        # ASSERT
+        assert stale_jobs == [0]
+
+        job.refresh_from_db()
+        assert job.status == SchedulingJobStatus.DONE
+
+    def test_stale_job_is_not_resurrected_by_its_worker(
+            self,
+            create_window,
+            settings
+    ):
+        # ARRANGE
+        window = create_window()
+        job = enqueue(window)
+
+        def fail_as_stale(scheduler):
+            make_stale(job, settings)
+            fail_stale_jobs()
+            enqueue(window)
+
+        runner = JobRunner(
+            scheduler_class=scheduler_raising(None, during_run=fail_as_stale)
+        )
+
+        # ACT
+        runner.run_next()
+
+        # ASSERT
+        job.refresh_from_db()
+        assert job.status == SchedulingJobStatus.FAILED
+        assert job.errors == {'internal': 'the job timed out'}
+
+        # The window stays blocked by the job queued in the meantime
+        window.refresh_from_db()
+        assert window.scheduling_ongoing
@@ -0,0 +1,80 @@
+import pytest
+
+from exam.models import Exam
+from schedule.scheduling.algorithms.random import RandomAssignment
+from schedule.scheduling.input_collectors import DBInputCollector
+from schedule.scheduling.output_writers import (
+    DBOutputWriter,
+    CSVOutputWriter,
+)
+
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.mark.django_db
+class TestDBOutputWriter:
+    def test_schedule_is_written_in_constant_number_of_queries(
+            self,
+            create_schedulable_window,
+            django_assert_max_num_queries
+    ):
+        # ARRANGE
+        window = create_schedulable_window(num_students=20)
+        schedule, _ = RandomAssignment(
+            DBInputCollector(window).collect()
+        ).run()
+        writer = DBOutputWriter(window, schedule, penalty=42)
+
+        # ACT
+        with django_assert_max_num_queries(10):
+            db_schedule = writer.write_to_db()
+
+        # ASSERT
+        assert db_schedule.penalty == 42
+
+        exams = Exam.objects.filter(window=window) \
+            .select_related('time_slot__block__block_slot')
+        assert all(exam.time_slot is not None for exam in exams)
+
+        start_times = {
+            exam_schedule.exam_code: (slot, exam_schedule.time_frame.start_time)
+            for slot, blocks in schedule.items()
+            for block in blocks
+            for exam_schedule in block.exams
+        }
+        for exam in exams:
+            assert start_times[exam.code] == (
+                exam.time_slot.block.block_slot_id,
+                exam.time_slot.start_time
+            )
+
+
+@pytest.mark.django_db
+class TestCSVOutputWriter:
+    def test_schedule_decisions_are_fetched_in_one_query(
+            self,
+            create_schedulable_window,
+            django_assert_num_queries
+    ):
+        # ARRANGE
+        window = create_schedulable_window()
+        schedule, _ = RandomAssignment(
+            DBInputCollector(window).collect()
+        ).run()
+        db_schedule = DBOutputWriter(window, schedule, penalty=0).write_to_db()
+        writer = CSVOutputWriter(db_schedule)
+
+        # ACT
+        with django_assert_num_queries(1):
+            decisions = writer._schedule_decisions()
+
+        # ASSERT
+        decisions = decisions.set_index('assessmentId')
+
+        for exam in Exam.objects.filter(window=window):
+            assert decisions.loc[exam.code].to_list() == [
+                exam.time_slot.start_time.strftime('%Y-%m-%d %H:%M'),
+                exam.time_slot.end_time.strftime('%Y-%m-%d %H:%M'),
+                'n.d.',
+            ]
@@ -0,0 +1,181 @@
+import pytest
+
+import marshal
+import pstats
+
+from django.core.files.base import ContentFile
+
+from input.models import PlanningSheet
+from schedule.scheduling.algorithms import ParallelTabuSearch, TabuSearch
+from schedule.scheduling.algorithms.random import RandomAssignment
+from schedule.scheduling.evaluators import Evaluator, ValidationError
+from schedule.scheduling.generators import WindowGenerator, WindowSpec
+from schedule.scheduling.input_collectors import DBInputCollector
+from schedule.scheduling.schedulers import Scheduler
+
+
+pytestmark = pytest.mark.integration
+
+
+def _window_with_planning_sheet(tmp_path):
+    """Return a generated window whose exams have been uploaded with a
+    planning sheet, so that it can be scheduled from start to finish.
+    """
+    generator = WindowGenerator(
+        WindowSpec(num_students=12, num_modules=4, num_assessors=4),
+        seed=0
+    )
+    window = generator.generate(with_exams=False)
+    generator.write_planning_sheet(tmp_path / 'sheet.csv')
+
+    planning_sheet = PlanningSheet(window=window)
+    planning_sheet.csv.save(
+        'sheet.csv',
+        ContentFile((tmp_path / 'sheet.csv').read_bytes())
+    )
+    return window
+
+
+@pytest.mark.django_db
+class TestScheduler:
+    def test_saved_schedule_replaces_previous_incumbent(
+            self,
+            create_schedulable_window
+    ):
+        # ARRANGE
+        window = create_schedulable_window()
+        data = DBInputCollector(window).collect()
+        scheduler = Scheduler(window)
+
+        schedules = [RandomAssignment(data).run()[0] for _ in range(2)]
+
+        # ACT
+        for schedule in schedules:
+            db_schedule = scheduler._save(
+                schedule,
+                Evaluator().penalty(schedule),
+                data
+            )
+
+        # ASSERT
+        assert list(window.schedules.all()) == [db_schedule]
+        assert db_schedule.blocks.count() \
+            == schedules[-1].total_blocks_scheduled
+
+    def test_parallel_search_saves_incumbents(self, create_schedulable_window):
+        # ARRANGE
+        window = create_schedulable_window()
+        data = DBInputCollector(window).collect()
+        scheduler = Scheduler(window, algorithm_class=ParallelTabuSearch)
+        schedule, _ = RandomAssignment(data).run()
+
+        # ACT
+        algorithm = scheduler._algorithm(data)
+        algorithm.on_incumbent(schedule, Evaluator().penalty(schedule))
+
+        # ASSERT
+        assert isinstance(algorithm, ParallelTabuSearch)
+        assert window.schedules.count() == 1
+
+    def test_run_stats_are_saved_with_schedule(self, tmp_path):
+        # ARRANGE
+        window = _window_with_planning_sheet(tmp_path)
+        scheduler = Scheduler(window, algorithm_class=TabuSearch)
+
+        # ACT
+        scheduler.run()
+
+        # ASSERT
+        run_stats = window.schedules.get().run_stats
+        assert run_stats == scheduler.stats.as_dict()
+
+        assert [phase['name'] for phase in run_stats['phases']] == [
+            'input_collection',
+            'validation',
+            'search',
+            'helper_assignment',
+            'db_output',
+            'csv_output',
+        ]
+        queries = {
+            phase['name']: phase['queries'] for phase in run_stats['phases']
+        }
+        assert queries['input_collection'] > 0
+        assert queries['db_output'] > 0
+        assert queries['csv_output'] > 0
+        assert run_stats['queries'] \
+            == sum(phase['queries'] for phase in run_stats['phases'])
+        assert run_stats['peak_memory'] > 0
+        memory_growths = [
+            phase['memory_growth'] for phase in run_stats['phases']
+        ]
+        assert all(growth >= 0 for growth in memory_growths)
+        assert sum(memory_growths) <= run_stats['peak_memory']
+
+    def test_heartbeat_is_sent_at_every_phase(self, tmp_path):
+        # ARRANGE
+        window = _window_with_planning_sheet(tmp_path)
+        phases = []
+        scheduler = Scheduler(
+            window,
+            algorithm_class=TabuSearch,
+            on_heartbeat=lambda: phases.append(len(scheduler.stats.phases))
+        )
+
+        # ACT
+        scheduler.run()
+
+        # ASSERT
+        assert phases == list(range(len(scheduler.stats.phases)))
+
+    def test_profile_is_saved_with_schedule(self, tmp_path):
+        # ARRANGE
+        window = _window_with_planning_sheet(tmp_path)
+        scheduler = Scheduler(
+            window,
+            algorithm_class=TabuSearch,
+            profile=True
+        )
+
+        # ACT
+        scheduler.run()
+
+        # ASSERT
+        db_schedule = window.schedules.get()
+        assert db_schedule.profile.name.endswith('.prof')
+
+        stats = pstats.Stats(db_schedule.profile.path)
+        assert any(
+            function == '_run' and file.endswith('schedulers.py')
+            for file, _, function in stats.stats
+        )
+        assert db_schedule.run_stats is not None
+
+    def test_profile_of_failed_run_is_passed_on(self, tmp_path):
+        # ARRANGE
+        class FailingEvaluator(Evaluator):
+            def validate_availabilities(self, data):
+                raise ValidationError(helpers_needed=True)
+
+        window = _window_with_planning_sheet(tmp_path)
+        profiles = []
+        scheduler = Scheduler(
+            window,
+            evaluator=FailingEvaluator(),
+            profile=True,
+            on_profile=profiles.append
+        )
+
+        # ACT
+        with pytest.raises(ValidationError):
+            scheduler.run()
+
+        # ASSERT
+        assert not window.schedules.exists()
+        assert len(profiles) == 1
+
+        stats = marshal.loads(profiles[0])
+        assert any(
+            function == '_run' and file.endswith('schedulers.py')
+            for file, _, function in stats
+        )
@@ -142,3 +142,27 @@ class TestWorkloadCalculator:
         assert workload[ass] == {
             20: math.ceil(expected_exams_20 / num_exams_per_block_20)
         }
+
+    def test_query_count_does_not_depend_on_assessors(
+            self,
+            create_schedulable_window,
+            django_assert_num_queries
+    ):
+        # ARRANGE
+        window = create_schedulable_window(num_modules=6)
+
+        calc = WorkloadCalculator(
+            assessors=Assessor.objects.filter(windows=window),
+            exams=Exam.objects.filter(window=window),
+            block_templates=BlockTemplate.objects.filter(windows=window),
+        )
+
+        # ACT
+        with django_assert_num_queries(3):
+            workload = calc.assessor_block_counts
+
+        # ASSERT
+        assert len(workload) == 6
+        assert sum(
+            sum(counts.values()) for counts in workload.values()
+        ) >= 6
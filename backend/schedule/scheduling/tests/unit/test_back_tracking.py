@@ -0,0 +1,90 @@
+import pytest
+
+from staff.models import Assessor
+
+from schedule.scheduling.algorithms import (
+    SearchBudgetExhaustedError,
+    UnfeasibleInputError,
+)
+from schedule.scheduling.algorithms.back_tracking import BackTracking
+from schedule.scheduling.input_collectors import AssessorWorkload, AvailInfo
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestBackTracking:
+    def test_feasible_assignment_is_found(
+            self,
+            planted_input,
+            assert_is_feasible
+    ):
+        # ARRANGE
+        data = planted_input(
+            num_slots=40,
+            num_assessors=12,
+            helpers_per_slot=3,
+            seed=0
+        )
+
+        # ACT
+        schedule, _ = BackTracking(data).run()
+
+        # ASSERT
+        assert_is_feasible(schedule, data)
+
+    def test_unfeasible_input_raises_error(self, input_data):
+        # ARRANGE
+        assessor = Assessor(id=1)
+        staff_avails = {
+            1: AvailInfo(
+                helper_count=1,
+                helpers=[object()],
+                assessor_count=1,
+                assessors=[assessor]
+            ),
+        }
+        workload = AssessorWorkload()
+        workload[assessor] = {20: 2}
+
+        # ACT & ASSERT
+        with pytest.raises(UnfeasibleInputError):
+            BackTracking(input_data(staff_avails, workload)).run()
+
+    def test_search_depth_is_not_limited_by_recursion(
+            self,
+            planted_input,
+            assert_is_feasible
+    ):
+        # ARRANGE
+        data = planted_input(
+            num_slots=600,
+            num_assessors=40,
+            helpers_per_slot=3,
+            seed=1
+        )
+
+        # ACT
+        schedule, _ = BackTracking(data).run()
+
+        # ASSERT
+        assert data.total_num_blocks > 1000
+        assert_is_feasible(schedule, data)
+
+    def test_exhausted_step_limit_raises_budget_error(
+            self,
+            planted_input,
+            monkeypatch
+    ):
+        # ARRANGE
+        data = planted_input(
+            num_slots=40,
+            num_assessors=12,
+            helpers_per_slot=3,
+            seed=0
+        )
+        monkeypatch.setattr(BackTracking, 'MAX_STEPS', 1)
+
+        # ACT & ASSERT
+        with pytest.raises(SearchBudgetExhaustedError):
+            BackTracking(data).run()
@@ -0,0 +1,50 @@
+import pytest
+
+from schedule.scheduling.caches import EvaluationCache
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestEvaluationCache:
+    def test_hits_and_misses_are_counted(self):
+        # ARRANGE
+        cache = EvaluationCache()
+        cache.put('a', 1)
+
+        # ACT
+        values = [cache.get('a'), cache.get('b'), cache.get('a')]
+
+        # ASSERT
+        assert values == [1, None, 1]
+        assert cache.stats()['hits'] == 2
+        assert cache.stats()['misses'] == 1
+
+    def test_least_recently_used_entries_are_evicted(self):
+        # ARRANGE
+        cache = EvaluationCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+
+        # ACT
+        cache.put('c', 3)
+
+        # ASSERT
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert cache.evictions == 1
+
+    def test_entries_are_evicted_when_memory_bound_is_exceeded(self):
+        # ARRANGE
+        cache = EvaluationCache(max_entries=None, max_bytes=2000)
+
+        # ACT
+        for i in range(100):
+            cache.put(i, list(range(10)))
+
+        # ASSERT
+        assert 0 < len(cache) < 100
+        assert cache.bytes <= 2000
+        assert 99 in cache
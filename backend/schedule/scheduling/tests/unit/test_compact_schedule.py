@@ -0,0 +1,126 @@
+import pytest
+
+from datetime import datetime, timedelta
+
+from exam.models import Student, Module
+from staff.models import Assessor
+
+from schedule.scheduling.algorithms.tabu_search import Actions
+from schedule.scheduling.compact_schedule import CompactSchedule
+from schedule.scheduling.schedule import (
+    Schedule,
+    BlockSchedule,
+    ExamSchedule,
+    TimeFrame,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def schedule():
+    assessor = Assessor(id=1)
+    module = Module(id=1)
+
+    schedule = Schedule()
+    start_times = [
+        (0, datetime(2022, 1, 1, 10, 0)),
+        (0, datetime(2022, 1, 1, 10, 0)),
+        (1, datetime(2022, 1, 2, 14, 0)),
+    ]
+
+    for block_index, (slot, start_time) in enumerate(start_times):
+        exams = [
+            ExamSchedule(
+                exam_code=f'exam_{block_index}_{position}',
+                module=module,
+                assessor=assessor,
+                position=position,
+                student=Student(id=3 * block_index + position),
+                time_frame=TimeFrame(
+                    start_time + timedelta(minutes=30 * position),
+                    start_time + timedelta(minutes=30 * position + 20),
+                )
+            )
+            for position in range(3)
+        ]
+        schedule[slot] += [
+            BlockSchedule(
+                assessor=assessor,
+                start_time=start_time,
+                exam_start_times=[0, 30, 60],
+                exam_length=20,
+                exams=exams,
+            )
+        ]
+
+    return schedule
+
+
+def _exams_of(schedule):
+    """Return a comparable representation of the schedule's exams."""
+    return sorted(
+        (
+            slot,
+            exam.exam_code,
+            exam.student.id,
+            exam.position,
+            exam.time_frame.start_time,
+            exam.time_frame.end_time,
+        )
+        for slot, blocks in schedule.items()
+        for block in blocks
+        for exam in block.exams
+    )
+
+
+class TestCompactSchedule:
+    def test_conversion_round_trip(self, schedule):
+        # ACT
+        compact = CompactSchedule.from_schedule(schedule)
+        restored = compact.to_schedule()
+
+        # ASSERT
+        assert len(compact) == 9
+        assert list(compact.block_slots) == [0, 0, 1]
+        assert _exams_of(restored) == _exams_of(schedule)
+        assert [block.start_time for block in restored[1]] \
+               == [block.start_time for block in schedule[1]]
+
+    def test_exam_swap_matches_schedule_swap(self, schedule):
+        # ARRANGE
+        compact = CompactSchedule.from_schedule(schedule)
+
+        # ACT
+        compact.swap_exams(1, 7)
+        expected = Actions().swap_exams(schedule, [(0, 0, 1), (1, 0, 1)])
+
+        # ASSERT
+        assert _exams_of(compact.to_schedule()) == _exams_of(expected)
+
+    def test_block_swap_matches_schedule_swap(self, schedule):
+        # ARRANGE
+        compact = CompactSchedule.from_schedule(schedule)
+
+        # ACT
+        compact.swap_blocks(0, 2)
+        expected = Actions().swap_blocks(schedule, [(0, 0), (1, 0)])
+
+        # ASSERT
+        assert _exams_of(compact.to_schedule()) == _exams_of(expected)
+
+    def test_copies_are_equal_and_independent(self, schedule):
+        # ARRANGE
+        compact = CompactSchedule.from_schedule(schedule)
+
+        # ACT
+        copy = compact.copy()
+
+        # ASSERT
+        assert copy == compact
+        assert hash(copy) == hash(compact)
+
+        copy.swap_exams(0, 4)
+        assert copy != compact
+        assert copy.exam_starts[0] == compact.exam_starts[4]
+        assert compact.exam_starts[0] != compact.exam_starts[4]
@@ -1,12 +1,24 @@
 import pytest
 
-from datetime import datetime
+from datetime import datetime, timedelta
+import random
 
 from exam.models import Student, Module
 from staff.models import Assessor
 
-from schedule.scheduling.evaluators import BruteForce, Conflict, ConflictDegree
-from schedule.scheduling.schedule import ExamSchedule, TimeFrame
+from schedule.scheduling.evaluators import (
+    BruteForce,
+    Conflict,
+    ConflictDegree,
+    Evaluator,
+    VectorizedSearch,
+)
+from schedule.scheduling.schedule import (
+    BlockSchedule,
+    ExamSchedule,
+    Schedule,
+    TimeFrame,
+)
 
 pytestmark = pytest.mark.unit
 
@@ -266,3 +278,79 @@ class TestBruteForceAlgorithm:
 
         # ASSERT
         assert not conflicts[student][ConflictDegree.FIRST_ORDER]
+
+
+def _random_schedule(seed: int) -> Schedule:
+    """Return a schedule of 20-minute and 30-minute exams with random
+    students and start times spread over four days.
+    """
+    rng = random.Random(seed)
+    students = [Student(id=i) for i in range(15)]
+
+    schedule = Schedule()
+    for slot in range(12):
+        exam_length = rng.choice([20, 30])
+        start_time = datetime(2022, 1, 1, 8, 0) + timedelta(
+            days=rng.randrange(4),
+            minutes=10 * rng.randrange(60)
+        )
+        exams = [
+            ExamSchedule(
+                student=rng.choice(students),
+                position=position,
+                module=Module(),
+                assessor=Assessor(),
+                exam_code=f'exam_{slot}_{position}',
+                time_frame=TimeFrame(
+                    start_time + timedelta(minutes=exam_length * position),
+                    start_time + timedelta(minutes=exam_length * (position + 1))
+                )
+            )
+            for position in range(rng.randrange(1, 6))
+        ]
+        schedule[slot] = [BlockSchedule(assessor=Assessor(), exams=exams)]
+
+    return schedule
+
+
+class TestVectorizedSearch:
+    @pytest.mark.parametrize('seed', range(10))
+    def test_conflicts_equal_brute_force_conflicts(self, seed):
+        # ARRANGE
+        schedule = _random_schedule(seed)
+
+        # ACT
+        expected = BruteForce().run(schedule.group_by_student())
+        conflicts = VectorizedSearch().run(schedule.group_by_student())
+
+        # ASSERT
+        assert set(conflicts.keys()) == set(expected.keys())
+
+        for student, student_conflicts in expected.items():
+            for degree in ConflictDegree.choices:
+                assert [
+                    conflict.exams
+                    for conflict in conflicts[student][degree]
+                ] == [
+                    conflict.exams
+                    for conflict in student_conflicts[degree]
+                ]
+
+    @pytest.mark.parametrize('seed', range(10))
+    def test_penalty_equals_brute_force_penalty(self, seed):
+        # ARRANGE
+        schedule = _random_schedule(seed)
+
+        # ACT
+        penalty = Evaluator(conflict_search=VectorizedSearch()).penalty(
+            schedule
+        )
+
+        # ASSERT
+        assert penalty == Evaluator(conflict_search=BruteForce()).penalty(
+            schedule
+        )
+
+    def test_empty_schedule_has_no_conflicts(self):
+        # ACT / ASSERT
+        assert not VectorizedSearch().run({})
@@ -0,0 +1,82 @@
+import pytest
+
+from staff.models import Assessor
+
+from schedule.scheduling.algorithms import UnfeasibleInputError
+from schedule.scheduling.algorithms.flow import FlowNetwork, FlowSlotAssigner
+from schedule.scheduling.input_collectors import AssessorWorkload, AvailInfo
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestFlowNetwork:
+    def test_max_flow_is_found(self):
+        # ARRANGE
+        network = FlowNetwork(4)
+        network.add_edge(0, 2, 3)
+        network.add_edge(0, 3, 2)
+        network.add_edge(2, 3, 5)
+        network.add_edge(2, 1, 2)
+        network.add_edge(3, 1, 3)
+
+        # ACT
+        flow = network.max_flow(0, 1)
+
+        # ASSERT
+        assert flow == 5
+        assert network.reachable_from(0) == [True, False, False, False]
+
+
+class TestFlowSlotAssigner:
+    def test_feasible_assignment_is_found(
+            self,
+            planted_input,
+            assert_is_feasible
+    ):
+        # ARRANGE
+        data = planted_input(
+            num_slots=600,
+            num_assessors=40,
+            helpers_per_slot=3,
+            seed=1
+        )
+
+        # ACT
+        schedule, _ = FlowSlotAssigner(data).run()
+
+        # ASSERT
+        assert_is_feasible(schedule, data)
+
+    def test_unfeasible_input_reports_cut(self, input_data):
+        # ARRANGE
+        short, other, unaffected = [Assessor(id=i) for i in range(1, 4)]
+
+        def avails(helper_count, *assessors):
+            return AvailInfo(
+                helper_count=helper_count,
+                helpers=[object()] * helper_count,
+                assessor_count=len(assessors),
+                assessors=list(assessors)
+            )
+
+        staff_avails = {
+            1: avails(1, short, other),
+            2: avails(1, short, other),
+            3: avails(2, unaffected),
+        }
+        workload = AssessorWorkload()
+        workload[short] = {20: 2}
+        workload[other] = {20: 1}
+        workload[unaffected] = {30: 1}
+
+        # ACT
+        with pytest.raises(UnfeasibleInputError) as error:
+            FlowSlotAssigner(input_data(staff_avails, workload)).run()
+
+        # ASSERT
+        cut = error.value.cut
+        assert set(cut.assessors) == {short, other}
+        assert cut.slots == [1, 2]
+        assert cut.blocks_needed == 3
+        assert cut.blocks_possible == 2
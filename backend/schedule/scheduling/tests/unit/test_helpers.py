@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from staff.models import Assessor, Helper
+
+from schedule.scheduling.helpers import HelperAssigner
+from schedule.scheduling.input_collectors import AssessorWorkload, AvailInfo
+from schedule.scheduling.schedule import BlockSchedule, Schedule
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def helper_input(input_data):
+    """Return a schedule with two blocks in a slot with four available
+    helpers, along with its input data.
+    """
+    def make_input():
+        assessors = [Assessor(id=i) for i in (1, 2)]
+        helpers = [Helper(id=i) for i in (1, 2, 3, 4)]
+        staff_avails = {
+            1: AvailInfo(
+                helper_count=len(helpers),
+                helpers=helpers,
+                assessor_count=len(assessors),
+                assessors=assessors
+            ),
+        }
+        workload = AssessorWorkload()
+        for assessor in assessors:
+            workload[assessor] = {20: 1}
+
+        schedule = Schedule()
+        schedule[1] += [BlockSchedule(assessor) for assessor in assessors]
+
+        return schedule, input_data(staff_avails, workload)
+
+    return make_input
+
+
+class TestHelperAssigner:
+    def test_distinct_available_helpers_are_assigned(self, helper_input):
+        # ARRANGE
+        schedule, data = helper_input()
+
+        # ACT
+        schedule = HelperAssigner().assign_helpers(schedule, data)
+
+        # ASSERT
+        helpers = [block.helper for block in schedule[1]]
+        assert len(set(helpers)) == 2
+        assert set(helpers) <= set(data.staff_avails[1].helpers)
+        assert len(data.staff_avails[1].helpers) == 4
+
+    def test_assignment_is_reproducible_with_seed(self, helper_input):
+        # ARRANGE
+        schedules = [helper_input()[0] for _ in range(2)]
+        _, data = helper_input()
+
+        # ACT
+        for schedule in schedules:
+            HelperAssigner(seed=0).assign_helpers(schedule, data)
+
+        # ASSERT
+        first, second = [
+            [block.helper for block in schedule[1]] for schedule in schedules
+        ]
+        assert first == second
+
+    def test_global_random_state_is_not_used(self, helper_input):
+        # ARRANGE
+        schedule, data = helper_input()
+        random.seed(0)
+        state = random.getstate()
+
+        # ACT
+        HelperAssigner().assign_helpers(schedule, data)
+
+        # ASSERT
+        assert random.getstate() == state
@@ -1,30 +1,35 @@
 import pytest
 
-from schedule.scheduling.algorithms.back_tracking import SchedulingHeuristics
+from schedule.scheduling.algorithms.back_tracking import (
+    SchedulingHeuristics,
+    SearchState,
+)
 from schedule.scheduling.input_collectors import AvailInfo
 
 
 pytestmark = pytest.mark.unit
 
 
-class AvailInfoMock:
-    def __init__(self, assessor_count, helper_count):
-        self.assessor_count = assessor_count
-        self.helper_count = helper_count
-
-
 class TestHeuristics:
     """Test collection for the heuristic methods that guide the
     back-tracking search.
     """
 
-    def test_slot_ease_score(self):
+    def test_slot_ease_score(self, assessor_mock):
         # ARRANGE
-        avail_info = AvailInfoMock(assessor_count=1, helper_count=2)
-        slot = ('some_slot_id', avail_info)
+        assessor = assessor_mock()
+        staff_avails = {
+            1: AvailInfo(
+                assessor_count=1,
+                assessors=[assessor],
+                helper_count=2,
+                helpers=[object(), object()]
+            ),
+        }
+        state = SearchState(staff_avails, {assessor: {20: 1}})
 
         # ACT
-        actual = SchedulingHeuristics.slot_ease_score(slot)
+        actual = SchedulingHeuristics.slot_ease_score(state, 0)
 
         # ASSERT
         expected = (1, 2)
@@ -64,11 +69,8 @@ class TestHeuristics:
         }
 
         # ACT
-        actual = SchedulingHeuristics.assessor_ease_score(
-            assessor,
-            staff_avails,
-            assessor_workload
-        )
+        state = SearchState(staff_avails, assessor_workload)
+        actual = SchedulingHeuristics.assessor_ease_score(state, 0)
 
         # ASSERT
         assessor_available_blocks = 2
@@ -102,11 +104,8 @@ class TestHeuristics:
         }
 
         # ACT
-        actual = SchedulingHeuristics.assessor_ease_score(
-            assessor,
-            staff_avails,
-            assessor_workload
-        )
+        state = SearchState(staff_avails, assessor_workload)
+        actual = SchedulingHeuristics.assessor_ease_score(state, 0)
 
         # ASSERT
         assessor_available_blocks = 1
@@ -1,16 +1,21 @@
 import pytest
 
 from copy import deepcopy
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from exam.models import Student, Module
 from staff.models import Assessor
 
-from schedule.scheduling.algorithms.tabu_search import Actions
+from schedule.scheduling.algorithms.tabu_search import (
+    Actions,
+    BlockSwapMove,
+    ExamSwapMove,
+)
 from schedule.scheduling.schedule import (
     Schedule,
     BlockSchedule,
     ExamSchedule,
+    ScheduleIndex,
     TimeFrame,
 )
 
@@ -386,3 +391,205 @@ class TestSearchActions:
         assert new_exam_2.block.start_time == block_1.start_time
         assert new_exam_2.module == module_2
         assert new_exam_2.exam_code == 'exam_2'
+
+
+def _block_of(student_ids, start_time, exam_length=20):
+    """Return a block schedule with one exam per given student."""
+    assessor = Assessor(id=1)
+    exam_start_times = [exam_length * i for i in range(len(student_ids))]
+
+    exams = [
+        ExamSchedule(
+            student=Student(id=student_id),
+            position=i,
+            module=Module(id=1),
+            assessor=assessor,
+            exam_code=f'exam_{start_time.day}_{student_id}',
+            time_frame=TimeFrame(
+                start_time + timedelta(minutes=offset),
+                start_time + timedelta(minutes=offset + exam_length),
+            )
+        )
+        for i, (student_id, offset) in enumerate(
+            zip(student_ids, exam_start_times)
+        )
+    ]
+    return BlockSchedule(
+        assessor=assessor,
+        exams=exams,
+        exam_length=exam_length,
+        start_time=start_time,
+        exam_start_times=exam_start_times
+    )
+
+
+class TestSearchMoves:
+    def test_block_swap_move_is_applied_in_place_and_undone(self):
+        # ARRANGE
+        block_1 = _block_of([1, 2], datetime(2022, 1, 1, 10, 0))
+        block_2 = _block_of([3, 4, 5], datetime(2022, 1, 2, 14, 0))
+        block_3 = _block_of([6], datetime(2022, 1, 1, 10, 0))
+
+        schedule = Schedule()
+        schedule[0] = [block_1, block_3]
+        schedule[1] = [block_2]
+
+        original_fingerprint = schedule.fingerprint
+        original_time_frames = [
+            (exam.time_frame.start_time, exam.time_frame.end_time)
+            for exam in block_1.exams + block_2.exams
+        ]
+
+        move = BlockSwapMove([(0, 0), (1, 0)])
+
+        # ACT / ASSERT
+        move.apply(schedule)
+
+        assert schedule.fingerprint != original_fingerprint
+        assert schedule[0] == [block_3, block_2]
+        assert schedule[1] == [block_1]
+        assert block_1.start_time == datetime(2022, 1, 2, 14, 0)
+        assert block_1.exams[1].time_frame.start_time \
+               == datetime(2022, 1, 2, 14, 20)
+
+        move.undo(schedule)
+
+        assert schedule.fingerprint == original_fingerprint
+        assert schedule[0] == [block_1, block_3]
+        assert schedule[1] == [block_2]
+        assert block_1.start_time == datetime(2022, 1, 1, 10, 0)
+        assert [
+            (exam.time_frame.start_time, exam.time_frame.end_time)
+            for exam in block_1.exams + block_2.exams
+        ] == original_time_frames
+
+    def test_exam_swap_move_is_applied_in_place_and_undone(self):
+        # ARRANGE
+        block_1 = _block_of([1, 2], datetime(2022, 1, 1, 10, 0))
+        block_2 = _block_of([3, 4], datetime(2022, 1, 2, 14, 0))
+
+        schedule = Schedule()
+        schedule[0] = [block_1]
+        schedule[1] = [block_2]
+
+        original_fingerprint = schedule.fingerprint
+        first, second = block_1.exams[1], block_2.exams[0]
+        first_time_frame = first.time_frame
+
+        move = ExamSwapMove([(0, 0, 1), (1, 0, 0)])
+
+        # ACT / ASSERT
+        move.apply(schedule)
+
+        assert schedule.fingerprint != original_fingerprint
+        assert first.student.id == 3
+        assert first.exam_code == 'exam_2_3'
+        assert first.time_frame == first_time_frame
+        assert second.student.id == 2
+
+        move.undo(schedule)
+
+        assert schedule.fingerprint == original_fingerprint
+        assert first.student.id == 2
+        assert first.exam_code == 'exam_1_2'
+        assert second.student.id == 3
+        assert second.exam_code == 'exam_2_3'
+
+    def test_index_is_kept_up_to_date_by_moves(self):
+        # ARRANGE
+        block_1 = _block_of([1, 2], datetime(2022, 1, 1, 10, 0))
+        block_2 = _block_of([3, 4, 5], datetime(2022, 1, 2, 14, 0))
+        block_3 = _block_of([6], datetime(2022, 1, 1, 10, 0))
+
+        schedule = Schedule()
+        schedule[0] = [block_1, block_3]
+        schedule[1] = [block_2]
+
+        index = schedule.index
+        moves = [
+            BlockSwapMove([(0, 0), (1, 0)]),
+            ExamSwapMove([(0, 0, 0), (1, 0, 1)]),
+        ]
+
+        def assert_index_is_consistent():
+            expected = ScheduleIndex.of(schedule)
+            assert index.exam_positions == expected.exam_positions
+            assert {
+                assessor: {
+                    slot: positions
+                    for slot, positions in blocks.items()
+                    if positions
+                }
+                for assessor, blocks in index.assessor_blocks.items()
+            } == expected.assessor_blocks
+
+        # ACT / ASSERT
+        for move in moves:
+            move.apply(schedule)
+            assert_index_is_consistent()
+
+        for move in reversed(moves):
+            move.undo(schedule)
+            assert_index_is_consistent()
+
+        assert schedule.index is index
+
+    def test_fingerprint_identifies_states_reached_through_different_paths(
+            self
+    ):
+        # ARRANGE
+        schedule = Schedule()
+        schedule[0] = [_block_of([1, 2], datetime(2022, 1, 1, 10, 0))]
+        schedule[1] = [_block_of([3, 4], datetime(2022, 1, 2, 14, 0))]
+
+        first, second = schedule.copy(), schedule.copy()
+        first_path = [
+            ExamSwapMove([(0, 0, 0), (0, 0, 1)]),
+            ExamSwapMove([(0, 0, 1), (1, 0, 0)]),
+        ]
+        second_path = [
+            ExamSwapMove([(0, 0, 0), (1, 0, 0)]),
+            ExamSwapMove([(0, 0, 0), (0, 0, 1)]),
+        ]
+
+        # ACT
+        for move in first_path:
+            predicted = move.fingerprint(first)
+            move.apply(first)
+            assert first.fingerprint == predicted
+
+        for move in second_path:
+            move.apply(second)
+
+        # ASSERT
+        rebuilt = first.copy()
+        rebuilt._index = None
+
+        assert first.fingerprint == second.fingerprint
+        assert first.fingerprint == rebuilt.fingerprint
+        assert first.fingerprint != schedule.fingerprint
+
+    def test_fingerprint_is_restored_when_moves_are_undone(self):
+        # ARRANGE
+        schedule = Schedule()
+        schedule[0] = [_block_of([1, 2], datetime(2022, 1, 1, 10, 0))]
+        schedule[1] = [_block_of([3, 4], datetime(2022, 1, 2, 14, 0))]
+
+        original = schedule.fingerprint
+        moves = [
+            BlockSwapMove([(0, 0), (1, 0)]),
+            ExamSwapMove([(0, 0, 1), (1, 0, 0)]),
+        ]
+
+        # ACT
+        for move in moves:
+            move.apply(schedule)
+
+        changed = schedule.fingerprint
+
+        for move in reversed(moves):
+            move.undo(schedule)
+
+        # ASSERT
+        assert changed != original
+        assert schedule.fingerprint == original
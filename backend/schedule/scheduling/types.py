@@ -9,6 +9,7 @@ from staff.models import Helper, Assessor
 
 
 SlotId = int
+AssessorId = int
 Email = int
 ExamId = str
 ExamLength = int
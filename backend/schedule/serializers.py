@@ -6,7 +6,8 @@ from .models import (
     AssessmentPhase,
     Window,
     BlockSlot,
-    BlockTemplate
+    BlockTemplate,
+    SchedulingJob,
 )
 from .utils.datetime import combine
 
@@ -69,6 +70,22 @@ class BlockSlotSerializer(serializers.ModelSerializer):
                 )
 
 
+class SchedulingJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SchedulingJob
+        fields = [
+            'id',
+            'window',
+            'status',
+            'errors',
+            'progress',
+            'profile',
+            'created',
+            'started',
+            'finished',
+        ]
+
+
 class WindowSerializer(serializers.ModelSerializer):
     block_slots = BlockSlotSerializer(many=True, required=False)
     csv_uploaded = serializers.SerializerMethodField(
@@ -1,31 +1,49 @@
-from typing import Type, Union
+import json
+import time
+from typing import Iterator, Optional, Type, Union
 
 from django.db import transaction
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 
 from rest_framework.decorators import action
 from rest_framework.mixins import CreateModelMixin
 from rest_framework.response import Response
 from rest_framework.status import (
     HTTP_200_OK,
+    HTTP_202_ACCEPTED,
     HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
 )
 from rest_framework.viewsets import ModelViewSet
 
-from .models import AssessmentPhase, Window, BlockSlot, Schedule
-from .scheduling import Scheduler, ValidationError, UnfeasibleInputError
+from .models import (
+    AssessmentPhase,
+    Window,
+    BlockSlot,
+    Schedule,
+    SchedulingJobStatus,
+)
+from .scheduling.jobs import enqueue
 from .serializers import (
     AssessmentPhaseDetailSerializer,
     AssessmentPhaseListSerializer,
     WindowSerializer,
-    BlockSlotSerializer
+    BlockSlotSerializer,
+    SchedulingJobSerializer,
 )
 from .utils.datetime import combine
 from input.models import PlanningSheet
 from staff.models import Assessor, Helper, Staff
 
 
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+def _query_flag(request, name: str) -> bool:
+    """Return whether the query parameter is set to a true value."""
+    return request.query_params.get(name, '').lower() in TRUE_VALUES
+
+
 class AssessmentPhaseViewSet(ModelViewSet):
     def get_serializer_class(self):
         """Select the serializer class based on the HTTP action."""
@@ -75,6 +93,13 @@ class AssessmentPhaseViewSet(ModelViewSet):
 class WindowViewSet(ModelViewSet):
     serializer_class = WindowSerializer
 
+    # Seconds between two checks for progress when streaming it
+    progress_poll_interval = 1
+
+    # Seconds after which a progress stream is closed, so that it does not
+    # hold a worker for the whole job. Clients reconnect to continue it.
+    progress_stream_timeout = 60
+
     def get_queryset(self):
         return Window.objects.filter(
             assessment_phase__organization=self.request.user.organization
@@ -185,44 +210,25 @@ class WindowViewSet(ModelViewSet):
         url_path='trigger-scheduling'
     )
     def trigger_scheduling(self, request, pk=None):
-        """Trigger the scheduling process."""
-        window = self.get_object()
-        window.scheduling_ongoing = True
-        window.save()
+        """Queue a scheduling job for the window.
 
-        try:
-            Scheduler(window).run()
-        except ValidationError as e:
-            window.scheduling_ongoing = False
-            window.save()
-            data = {
-                'errors': {
-                    'insufficient_avails': [
-                        assessor.email
-                        for assessor in e.insufficient_avails
-                    ],
-                    'helpers_needed': e.helpers_needed
-                }
-            }
-            return Response(data, status=HTTP_400_BAD_REQUEST)
-        except UnfeasibleInputError:
-            window.scheduling_ongoing = False
-            window.save()
-            data = {
-                'errors': {
-                    'unfeasible_input': 'not enough availabilities',
-                }
-            }
-            return Response(data, status=HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            window.scheduling_ongoing = False
-            window.save()
-            raise e
+        The job is executed by a worker process, so that the request
+        returns right away. Its progress can be followed via the
+        scheduling status.
 
-        window.scheduling_ongoing = False
-        window.save()
+        If the 'profile' query parameter is true, the scheduling run is
+        profiled, and the profile can be downloaded afterwards.
+        """
+        window = self.get_object()
+        job = enqueue(
+            window,
+            profile=_query_flag(request, 'profile')
+        )
 
-        return Response(HTTP_200_OK)
+        return Response(
+            SchedulingJobSerializer(job).data,
+            status=HTTP_202_ACCEPTED
+        )
 
     @action(
         methods=['get'],
@@ -231,21 +237,60 @@ class WindowViewSet(ModelViewSet):
         url_path='scheduling-status'
     )
     def scheduling_status(self, request, pk=None):
-        """Determine a window's scheduling status."""
+        """Determine a window's scheduling status from its latest
+        scheduling job.
+
+        If the latest job failed, its errors are included in the response.
+        """
         window = self.get_object()
+        job = window.scheduling_jobs.first()
 
-        if window.scheduling_ongoing:
+        if job is None:
+            scheduling_status = 'idle'
+        elif job.is_pending:
             scheduling_status = 'ongoing'
+        elif job.status == SchedulingJobStatus.FAILED:
+            scheduling_status = 'failed'
         elif window.planning_sheets.filter(is_filled_out=True).exists():
             scheduling_status = 'done'
         else:
             scheduling_status = 'idle'
 
         return Response(
-            {'scheduling_status': scheduling_status},
+            {
+                'scheduling_status': scheduling_status,
+                'job': SchedulingJobSerializer(job).data if job else None,
+            },
             status=HTTP_200_OK
         )
 
+    @action(
+        methods=['get'],
+        detail=True,
+        url_name='scheduling-progress',
+        url_path='scheduling-progress'
+    )
+    def scheduling_progress(self, request, pk=None):
+        """Get the progress of the window's latest scheduling job, i.e.,
+        its iterations, current and best penalty and elapsed seconds.
+
+        If the 'stream' query parameter is true, the progress is sent as
+        server-sent events instead, whenever it changes and until the
+        job is finished or the stream times out. After a timeout, the
+        client is expected to reconnect.
+        """
+        window = self.get_object()
+
+        if _query_flag(request, 'stream'):
+            response = StreamingHttpResponse(
+                self._progress_events(window),
+                content_type='text/event-stream'
+            )
+            response['Cache-Control'] = 'no-cache'
+            return response
+
+        return Response(self._progress_of(window), status=HTTP_200_OK)
+
     @action(
         methods=['get'],
         detail=True,
@@ -254,20 +299,55 @@ class WindowViewSet(ModelViewSet):
     )
     def schedule_evaluation(self, request, pk=None):
         """Get the window's latest schedule's evaluation stats."""
-        window = self.get_object()
+        schedule = self._latest_schedule(self.get_object())
 
-        try:
-            schedule = window.schedules.latest('created')
-        except Schedule.DoesNotExist:
-            penalty = None
-        else:
-            penalty = schedule.penalty
+        return Response(
+            {'penalty': schedule.penalty if schedule else None},
+            status=HTTP_200_OK
+        )
+
+    @action(
+        methods=['get'],
+        detail=True,
+        url_name='scheduling-stats',
+        url_path='scheduling-stats'
+    )
+    def scheduling_stats(self, request, pk=None):
+        """Get the stats of the scheduling run that produced the window's
+        latest schedule, i.e., the duration, number of database queries
+        and memory growth of each of its phases, and its peak memory.
+        """
+        schedule = self._latest_schedule(self.get_object())
 
         return Response(
-            {'penalty': penalty},
+            {'run_stats': schedule.run_stats if schedule else None},
             status=HTTP_200_OK
         )
 
+    @action(
+        methods=['get'],
+        detail=True,
+        url_name='scheduling-profile',
+        url_path='scheduling-profile'
+    )
+    def scheduling_profile(self, request, pk=None):
+        """Download the profile of the scheduling run that produced the
+        window's latest schedule, if that run was profiled.
+        """
+        schedule = self._latest_schedule(self.get_object())
+
+        if schedule is None or not schedule.profile:
+            return Response(status=HTTP_404_NOT_FOUND)
+
+        response = HttpResponse(
+            schedule.profile,
+            content_type='application/octet-stream',
+            status=HTTP_200_OK
+        )
+        response['Content-Disposition'] = \
+            f'attachment; filename={schedule.profile.name}'
+        return response
+
     @action(
         methods=['get'],
         detail=True,
@@ -293,6 +373,50 @@ class WindowViewSet(ModelViewSet):
         response['Content-Disposition'] = f'attachment; filename={planning_sheet.csv.name}'
         return response
 
+    @staticmethod
+    def _latest_schedule(window: Window) -> Optional[Schedule]:
+        """Return the window's latest schedule, or None if it has none."""
+        return window.schedules.order_by('created').last()
+
+    @staticmethod
+    def _progress_of(window: Window) -> dict:
+        job = window.scheduling_jobs.first()
+
+        return {
+            'status': job.status if job else None,
+            'progress': job.progress if job else None,
+        }
+
+    def _progress_events(self, window: Window) -> Iterator[str]:
+        """Yield a server-sent event whenever the progress changes, until
+        the latest job is not pending anymore or the stream times out.
+
+        The first event tells the client to reconnect after one poll
+        interval if the stream is closed before the job is finished.
+        """
+        deadline = time.monotonic() + self.progress_stream_timeout
+        previous = None
+
+        yield f'retry: {int(self.progress_poll_interval * 1000)}\n\n'
+
+        while True:
+            progress = self._progress_of(window)
+
+            if progress != previous:
+                yield f'data: {json.dumps(progress)}\n\n'
+                previous = progress
+
+            if progress['status'] not in (
+                    SchedulingJobStatus.QUEUED,
+                    SchedulingJobStatus.RUNNING
+            ):
+                return
+
+            if time.monotonic() >= deadline:
+                return
+
+            time.sleep(self.progress_poll_interval)
+
     @staticmethod
     def _delete_obsolete_slots(window, window_ids):
         window.block_slots.exclude(id__in=window_ids).delete()
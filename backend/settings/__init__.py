@@ -164,6 +164,47 @@ BASE_URL = os.environ.get('BASE_URL', 'http://127.0.0.1:8080')
 BASE_DOMAIN = os.environ.get('BASE_DOMAIN', '127.0.0.1:8080')
 FRONT_URL = os.environ.get('BASE_URL', 'http://127.0.0.1:8080')
 
+# Number of independent tabu searches that are run in parallel processes
+# for each scheduling job
+SCHEDULING_PARALLEL_SEARCHES = int(
+    os.environ.get('SCHEDULING_PARALLEL_SEARCHES', 1)
+)
+
+# Bounds of the cache of schedule penalties that each evaluator keeps
+SCHEDULING_EVALUATION_CACHE_SIZE = int(
+    os.environ.get('SCHEDULING_EVALUATION_CACHE_SIZE', 1024)
+)
+SCHEDULING_EVALUATION_CACHE_BYTES = int(
+    os.environ.get('SCHEDULING_EVALUATION_CACHE_BYTES', 1024 * 1024)
+)
+
+# Budget of each tabu search in seconds and iterations, unlimited if unset
+SCHEDULING_TIME_LIMIT = os.environ.get('SCHEDULING_TIME_LIMIT')
+SCHEDULING_TIME_LIMIT = SCHEDULING_TIME_LIMIT and float(SCHEDULING_TIME_LIMIT)
+
+SCHEDULING_MAX_ITERATIONS = os.environ.get('SCHEDULING_MAX_ITERATIONS')
+SCHEDULING_MAX_ITERATIONS = SCHEDULING_MAX_ITERATIONS \
+    and int(SCHEDULING_MAX_ITERATIONS)
+
+# Minimal number of seconds between two saves of the best schedule found
+# so far while a tabu search is running
+SCHEDULING_PUBLISH_INTERVAL = float(
+    os.environ.get('SCHEDULING_PUBLISH_INTERVAL', 60)
+)
+
+# Minimal number of seconds between two progress reports of a running
+# tabu search
+SCHEDULING_PROGRESS_INTERVAL = float(
+    os.environ.get('SCHEDULING_PROGRESS_INTERVAL', 2)
+)
+
+# Number of seconds after which a running scheduling job that has not
+# reported progress is considered dead and failed. Progress reports are the
+# job's heartbeat, so the timeout must exceed the longest phase of a run.
+SCHEDULING_JOB_TIMEOUT = float(
+    os.environ.get('SCHEDULING_JOB_TIMEOUT', 30 * 60)
+)
+
 if APPLICATION_STAGE == 'development':
     from .development import *
 
@@ -101,17 +101,27 @@ const ScheduleDashboard = ({phase, window: schedWindow}) => {
         const Status = {
             IDLE: 'idle',
             ONGOING: 'ongoing',
-            DONE: 'done'
+            DONE: 'done',
+            FAILED: 'failed'
         };
 
         const [schedulingStatus, setSchedulingStatus] = useState(Status.IDLE);
         const [penalty, setPenalty] = useState(null);
         const [errors, setErrors] = useState(null);
 
+        const showStatus = (payload) => {
+            if (payload.scheduling_status === Status.FAILED) {
+                setSchedulingStatus(Status.IDLE);
+                setErrors(payload.job.errors);
+            } else {
+                setSchedulingStatus(payload.scheduling_status);
+            }
+        };
+
         useEffect(async () => {
             const response = await httpGetSchedulingStatus(schedWindow.id)();
             const payload = await response.json();
-            setSchedulingStatus(payload.scheduling_status);
+            showStatus(payload);
         }, []);
 
         useEffect(async () => {
@@ -128,7 +138,7 @@ const ScheduleDashboard = ({phase, window: schedWindow}) => {
                 const payload = await response.json();
 
                 if (payload.scheduling_status !== Status.ONGOING) {
-                    setSchedulingStatus(payload.scheduling_status);
+                    showStatus(payload);
                 } else {
                     await getScheduleStatus();
                 }